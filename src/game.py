@@ -4,10 +4,23 @@ William Ellison <waellison@gmail.com>
 https://github.com/tnwae/nuventure
 """
 
+import argparse
+
 from nuventure import dbg_print
 from nuventure.game import NVGame
+from nuventure.profiling import TOP_COUNT, NVProfiler
+
+ARGP = argparse.ArgumentParser(prog="game", description="Play Nuventure.")
+ARGP.add_argument("--data", default="../data", help="the game data directory")
+ARGP.add_argument(
+    "--profile", metavar="FILE", help="profile each turn, writing collapsed stacks to FILE"
+)
+ARGP.add_argument(
+    "--profile-top", type=int, default=TOP_COUNT, help="the number of hot functions to report"
+)
+ARGS = ARGP.parse_args()
 
 dbg_print("main", "this is Nuventure v0.1")
 
-GAME = NVGame("../data")
-GAME.run()
+GAME = NVGame(ARGS.data)
+GAME.run(NVProfiler(ARGS.profile, ARGS.profile_top) if ARGS.profile else None)
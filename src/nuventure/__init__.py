@@ -11,6 +11,7 @@ in the LICENSE file at the root directory of this distribution.
 
 import sys
 import textwrap
+from contextvars import ContextVar
 
 """The permissible directions of travel within the Nuventure engine."""
 DIRECTIONS = {"east", "down", "up", "north", "west", "south"}
@@ -21,10 +22,28 @@ ERROR_STR = "Huh?"
 """Whether debug output should be enabled."""
 DEBUG_MODE = False
 
+"""The width to which game output is wrapped, unless the output says otherwise."""
+DEFAULT_WIDTH = 72
 
-def nv_print(text, width=72):
-    """Pretty-print long text to a narrow screen (default width: 72 chars)."""
-    print(*textwrap.wrap(text, width), sep="\n")
+
+"""The stream to which game output is written, if not standard output.
+This is a context variable so that each asyncio task, and hence each
+session hosted by nuventure.server, may write somewhere of its own.
+See nuventure.sink for streams that collect a turn's output."""
+OUTPUT = ContextVar("OUTPUT", default=None)
+
+
+def nv_output():
+    """Return the stream to which game output should currently be written."""
+    return OUTPUT.get() or sys.stdout
+
+
+def nv_print(text, width=None):
+    """Pretty-print long text to a narrow screen (default width: that of the
+    output if it has one, e.g. an output sink, else DEFAULT_WIDTH chars)."""
+    output = nv_output()
+    width = width or getattr(output, "width", DEFAULT_WIDTH)
+    output.write("\n".join(textwrap.wrap(text, width)) + "\n")
 
 
 def func_name():
@@ -34,7 +53,8 @@ def func_name():
 
 def dbg_print(funcname, *args):
     """
-    Print debug output, if debugging is enabled.
+    Print debug output, if debugging is enabled.  The arguments are
+    computed regardless, so code run often should test DEBUG_MODE first.
 
     Args:
         funcname: name of the calling function
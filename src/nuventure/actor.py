@@ -10,8 +10,12 @@ in the LICENSE file at the root directory of this distribution.
 """
 
 import random
+from typing import Union
+
+import nuventure
 from nuventure import dbg_print, func_name, nv_print
-from nuventure.item import NVItem
+from nuventure.item import NVItem, NVItemSet
+from nuventure.strings import text
 from nuventure.errors import NVBadArgError
 from nuventure.parser import do_quit
 
@@ -24,6 +28,9 @@ class NVActor:
     or an NPC.  An Actor is bound to the world that it occupies and
     to the node it currently occupies within that world, as of the
     current gametic.
+
+    An NPC whose goal is set to a node heads there along a shortest route
+    (see NVWorld.paths); any other NPC wanders at random.
     """
 
     def __init__(
@@ -34,6 +41,7 @@ class NVActor:
         friendly_name="Adventurer",
         hit_points=100,
         movement_rate=1,
+        kind=None,
     ):
         """Create a new actor object.
 
@@ -44,26 +52,81 @@ class NVActor:
             friendly_name: the friendly_name of this actor (defaults to "Adventurer")
             hit_points: the amount of hit points to give this character (defaults to 100)
             movement_rate: the actor's movement rate (defaults to 1 node per gametic)
+            kind: the kind of actor, from the "type" of an NPC in the world
+                JSON (defaults to "player" or "npc", as the case may be)
         """
         self.internal_name = internal_name
         self.friendly_name = friendly_name
+        self.kind = kind or ("npc" if self.is_npc() else "player")
         self.bound_world = bound_world
+        self._location = None
         self.location = world_node
         self.hit_points = hit_points
-        self.inventory = {}
-        self.description = None
+        self.inventory = NVItemSet()
+        self._description = None
+        self._goal = None
+        self.movement_rate = movement_rate
 
         if self.is_npc():
-            self.bound_world.actors[self.internal_name] = self
-
-        self.movement_rate = movement_rate
+            self.bound_world.add_actor(self)
 
     def __str__(self):
         """Returns the actor's friendly_name."""
         return self.friendly_name
 
+    @property
+    def location(self):
+        """The node where the actor stands, or None if it is not on the map.
+        Setting this moves the actor from the occupants of one node to
+        those of the other, and so changes how both are rendered."""
+        return self._location
+
+    @location.setter
+    def location(self, node) -> None:
+        # Scenes show NPCs, but not the player who is looking at them.
+        shown_p = self.is_npc()
+        if self._location is not None:
+            self._location.occupants.pop(self, None)
+            if shown_p:
+                self._location.invalidate()
+        self._location = node
+        if node is not None:
+            node.occupants[self] = None
+            if shown_p:
+                node.invalidate()
+
+    @property
+    def description(self) -> str:
+        """The line describing the actor where it stands."""
+        return text(self.bound_world.strings, self._description)
+
+    @description.setter
+    def description(self, value) -> None:
+        self._description = value
+        if self._location is not None:
+            self._location.invalidate()
+
+    @property
+    def goal(self):
+        """The node the NPC is heading for, or None if it wanders.  Setting
+        this wakes the NPC if it has somewhere to go."""
+        return self._goal
+
+    @goal.setter
+    def goal(self, node) -> None:
+        self._goal = node
+        world = self.bound_world
+        if world is None:
+            return
+        # A crowd moves only the NPCs without a goal.
+        if world.crowd:
+            world.crowd.dirty = True
+        if not self.idle_p():
+            world.wake(self)
+
     def injure(self, amount: int = 5) -> bool:
-        """Injures an actor, detracting the specified amount of HP.
+        """Injures an actor, detracting the specified amount of HP.  An
+        actor killed thus wakes on the next world tic to meet its end.
 
         Arguments:
             amount: the amount by which to reduce the actor's
@@ -71,6 +134,8 @@ class NVActor:
 
         Returns True if the actor is dead, False otherwise."""
         self.hit_points -= amount
+        if self.is_dead() and self.bound_world is not None:
+            self.bound_world.wake(self)
         return self.is_dead()
 
     def is_dead(self) -> bool:
@@ -81,25 +146,57 @@ class NVActor:
         """Returns whether the actor is a player character."""
         return self.internal_name != "PLAYER"
 
+    def in_scope(self) -> set[str]:
+        """Returns the internal names of everything the actor can refer to:
+        the items in its inventory, and the items and NPCs where it is."""
+        names = set(self.inventory.keys())
+        names.update(item.internal_name for item in self.location.items)
+        names.update(actor.internal_name for actor in self.location.npcs)
+        return names
+
     def do_tic(self) -> None:
         """Do this actor's tic during the world tic."""
-        dbg_print(func_name(), f"doing tic for {self}")
+        # The message is not even formatted unless debugging is enabled.
+        if nuventure.DEBUG_MODE:
+            dbg_print(func_name(), f"doing tic for {self}")
         if self.is_dead():
             if self.is_npc():
-                dbg_print(func_name(), f"{self} has died, removing from map")
-                del self.bound_world.actors[self.internal_name]
+                if nuventure.DEBUG_MODE:
+                    dbg_print(func_name(), f"{self} has died, removing from map")
+                self.bound_world.remove_actor(self)
             else:
                 nv_print("You have died.")
                 do_quit(None)
         else:
             if self.is_npc():
                 for _ in range(0, self.movement_rate):
-                    directions = list(self.location.neighbors.keys())
-                    this_way = random.choice(directions)
+                    this_way = self.next_way()
+                    if this_way is None:
+                        break
                     movement = self.bound_world.game_instance.parser.verbs[this_way]
-                    movement.invoker = self
-                    movement.target = this_way
-                    movement.invoke()
+                    movement.bind(this_way, invoker=self).invoke()
+
+    def idle_p(self) -> bool:
+        """Returns whether the actor has nothing to do on the next world
+        tic unless something befalls it: it is the player, or an NPC that
+        does not move or has reached its goal."""
+        if not self.is_npc() or self.movement_rate <= 0:
+            return True
+        return self._goal is not None and self.location is self._goal
+
+    def next_way(self) -> Union[str, None]:
+        """Returns the direction in which the NPC moves next: along a
+        shortest route toward its goal if it has one it can reach, and at
+        random otherwise; or None if it stays put, having reached its goal
+        or standing where there is no way out."""
+        if self.goal is not None:
+            if self.location is self.goal:
+                return None
+            step = self.bound_world.paths.next_step(self.location.id, self.goal.id)
+            if step is not None:
+                return str(step)
+        exits = self.location.exits()
+        return random.choice(exits) if exits else None
 
     def move(self, direction) -> bool:
         """Attempts to move the actor within the world map.
@@ -117,7 +214,7 @@ class NVActor:
             raise NVBadArgError(direction, direction)
 
         if movement_succeeded_p and not self.is_npc():
-            nv_print(last_location.neighbors[direction]["travel_description"])
+            nv_print(last_location.travel_description(direction))
             self.location.render()
         return movement_succeeded_p
 
@@ -129,9 +226,8 @@ class NVActor:
 
         Returns:
             True if successful, False otherwise"""
-        if item:
-            item.take(self)
-            self.inventory[item.internal_name] = item
+        if item and item.take(self):
+            self.inventory.add(item)
             return True
 
         return False
@@ -150,6 +246,6 @@ class NVActor:
             nv_print(
                 f"You remove the {item.friendly_name} from your pack and set it aside."
             )
-            del self.inventory[item.internal_name]
+            self.inventory.remove(item)
             return True
         return False
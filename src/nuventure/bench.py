@@ -0,0 +1,544 @@
+"""Benchmarks for Nuventure, a poor man's implementation of ScummVM.
+
+Run this module from the source directory to time loading the world,
+parsing each type of verb, world tics as the number of actors grows,
+rendering nodes, and whole turns played with NVGame.step:
+
+    python -m nuventure.bench ../data
+    python -m nuventure.bench ../data --json baseline.json
+    python -m nuventure.bench ../data --compare baseline.json
+
+Timing tics with NPCs moved by worker processes (see NVShardedCrowd)
+starts a process per CPU for each number of NPCs, so it is left out
+unless --sharded is given.
+
+Every measurement is a time per operation, so lower is better.  When
+comparing against a baseline saved with --json, any measurement that has
+grown by more than the threshold is flagged as a regression and the exit
+status is 1.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Iterable, Union
+
+from nuventure import OUTPUT
+from nuventure.actor import NVActor
+from nuventure.game import NVGame
+from nuventure.grammar import NVGrammar
+from nuventure.parser import ALL_VERBS, NVParser, _compile_frames, _nltk_chunk
+from nuventure.world import NVWorld, NVWorldNode
+from nuventure.worldgen import generate_world
+
+"""Commands of the first, second, and third types, which go through
+NVParser.do_hard_parse."""
+HARD_PARSE_CORPUS = (
+    "take lamp",
+    "take the lamp",
+    "take the rusty lamp",
+    "light lamp",
+    "light the lamp",
+    "extinguish the lamp",
+    "drop lamp",
+    "inspect sword",
+    "inspect the stele",
+    "take alchemist's journal",
+    "inspect william the merchant",
+    "take the axe",
+)
+
+"""Commands of each type of verb.  The verbs of the first and second types
+have no callbacks yet, so those are resolved by the grammar alone."""
+PARSE_CORPORA = {
+    "first": (
+        "unlock the door with the key",
+        "attack william with the sword",
+        "lock door with key",
+    ),
+    "second": ("cast fire on william", "buy the axe from william", "sell the lamp to william"),
+    "third": HARD_PARSE_CORPUS,
+    "fourth": ("look", "inventory", "quit"),
+    "fifth": ("help", "help take"),
+    "sixth": ("north", "south", "east", "west", "up", "down"),
+}
+
+"""A round trip through the test world, played over and over to measure
+the throughput of whole turns."""
+TURN_CORPUS = (
+    "look",
+    "take lamp",
+    "light lamp",
+    "down",
+    "look",
+    "up",
+    "extinguish lamp",
+    "drop lamp",
+    "up",
+    "inspect sword",
+    "down",
+    "inventory",
+    "frobnicate",
+)
+
+"""The numbers of NPCs that world tics are timed with."""
+ACTOR_COUNTS = (10, 100, 1000, 10000)
+
+"""The numbers of nodes in the generated worlds that scaling is measured
+with, if asked for; each has a tenth as many NPCs as nodes."""
+WORLD_SIZES = (1000, 10000, 100000)
+
+"""How much a measurement may grow over its baseline before it counts as
+a regression."""
+DEFAULT_THRESHOLD = 0.10
+
+
+def time_per_call(func: Callable, args: Iterable, repeat: int = 1000) -> float:
+    """Time a function over a set of arguments.
+
+    Args:
+        func: the function to time
+        args: the arguments to call it with, one call per argument
+        repeat: the number of times to go over the arguments
+
+    Returns:
+        The mean time per call, in microseconds.
+    """
+    args = list(args)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for arg in args:
+            func(arg)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(args)) * 1e6
+
+
+def _quietly(func: Callable) -> Callable:
+    """Wrap a function so that whatever it raises is ignored, for timing
+    commands that end in errors."""
+
+    def wrapper(arg):
+        try:
+            func(arg)
+        except Exception:  # pylint: disable=broad-except
+            pass
+
+    return wrapper
+
+
+def bench_load(path: str, repeat: int = 20) -> dict[str, float]:
+    """Time loading the world and the verb table.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        repeat: the number of times to load each
+
+    Returns:
+        A dict with the mean milliseconds to load the world ("world_ms")
+        and the verb table ("parser_ms").
+    """
+    world_file = path + "/dirtest.json"
+    verb_file = path + "/verbs.json"
+    vocabulary = NVWorld(None, world_file).vocabulary()
+    return {
+        "world_ms": time_per_call(lambda _: NVWorld(None, world_file), [None], repeat) / 1e3,
+        "parser_ms": time_per_call(
+            lambda _: NVParser(verb_file, vocabulary), [None], repeat
+        ) / 1e3,
+    }
+
+
+def bench_parse(path: str, repeat: int = 1000) -> dict[str, float]:
+    """Time parsing each type of verb, with the cache both off and on.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        repeat: the number of times to go over each corpus
+
+    Returns:
+        A dict with the mean microseconds per uncached parse for each
+        type of verb (keyed by "first" through "sixth"), and per cached
+        parse of the verbs that have callbacks ("cached").
+    """
+    world = NVWorld(None, path + "/dirtest.json")
+    uncached = NVParser(path + "/verbs.json", world.vocabulary(), cache_size=0)
+    cached = NVParser(path + "/verbs.json", world.vocabulary())
+    grammar = NVGrammar(_compile_frames(ALL_VERBS), world.vocabulary())
+
+    results = {}
+    callable_commands = []
+    for kind, corpus in PARSE_CORPORA.items():
+        if kind in ("first", "second"):
+            results[kind] = time_per_call(grammar.parse, corpus, repeat)
+        else:
+            results[kind] = time_per_call(_quietly(uncached.do_parse), corpus, repeat)
+            callable_commands.extend(corpus)
+
+    results["cached"] = time_per_call(_quietly(cached.do_parse), callable_commands, repeat)
+    return results
+
+
+def bench_hard_parse(
+    path: str, corpus: Iterable[str] = HARD_PARSE_CORPUS, repeat: int = 1000
+) -> dict[str, Union[float, None]]:
+    """Compare the grammar against the NLTK fallback over a command corpus.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        corpus: the commands to parse
+        repeat: the number of times to go over the corpus
+
+    Returns:
+        A dict with the mean microseconds per command for the "grammar"
+        and "nltk" paths; "nltk" is None if NLTK or its corpora are not
+        installed.
+    """
+    corpus = list(corpus)
+    world = NVWorld(None, path + "/dirtest.json")
+    grammar_parser = NVParser(path + "/verbs.json", world.vocabulary())
+    nltk_parser = NVParser(path + "/verbs.json", world.vocabulary(), use_nltk=True)
+
+    results = {"grammar": time_per_call(grammar_parser.do_hard_parse, corpus, repeat)}
+
+    try:
+        _nltk_chunk(corpus[0])
+    except (ImportError, LookupError):
+        results["nltk"] = None
+    else:
+        # NLTK is slow enough that a tenth of the repetitions suffices.
+        results["nltk"] = time_per_call(
+            nltk_parser.do_hard_parse, corpus, max(1, repeat // 10)
+        )
+
+    return results
+
+
+def bench_invocation(path: str, repeat: int = 100000) -> dict[str, float]:
+    """Measure what binding a verb to a fresh invocation costs per command.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        repeat: the number of invocations to create
+
+    Returns:
+        A dict with the mean microseconds to bind a verb ("bind"), to
+        parse a cached command including the bind ("cached_parse"), and
+        the bytes allocated per invocation ("bytes").
+    """
+    world = NVWorld(None, path + "/dirtest.json")
+    parser = NVParser(path + "/verbs.json", world.vocabulary())
+    actor = NVActor(world, world.nodes["ORIGIN"])
+    take = parser.verbs["take"]
+
+    results = {
+        "bind": time_per_call(lambda _: take.bind("lamp", invoker=actor), [None], repeat),
+        "cached_parse": time_per_call(parser.do_parse, ["take lamp"], repeat),
+    }
+
+    tracemalloc.start()
+    invocations = [take.bind("lamp", invoker=actor) for _ in range(1000)]
+    results["bytes"] = tracemalloc.get_traced_memory()[0] / len(invocations)
+    tracemalloc.stop()
+
+    return results
+
+
+def bench_tic(
+    path: str, actor_counts: Iterable[int] = ACTOR_COUNTS, tics: int = 5, sharded: bool = False
+) -> dict[str, float]:
+    """Time world tics as the number of wandering NPCs grows.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        actor_counts: the numbers of NPCs to time tics with
+        tics: the number of tics to time for each number of NPCs
+        sharded: whether to time sharded movement too, which starts a
+            worker process per CPU for each number of NPCs (defaults to
+            False)
+
+    Returns:
+        A dict with the mean milliseconds per tic for each number of NPCs,
+        keyed by that number, both moving the NPCs one at a time and, keyed
+        by "<number>_batched", all at once; and, keyed by "<number>_idle",
+        with that many NPCs that never move.  If sharded, the same moving
+        them all at once in worker processes is keyed by
+        "<number>_sharded".
+    """
+    modes = ("", "batched", "sharded", "idle") if sharded else ("", "batched", "idle")
+    results = {}
+    for count in actor_counts:
+        for mode in modes:
+            game = NVGame(path)
+            nodes = list(game.world.nodes.values())
+            rate = 0 if mode == "idle" else 1
+            for i in range(count):
+                NVActor(game.world, nodes[i % len(nodes)], f"BENCH{i}", f"Extra #{i}", 100, rate)
+            if mode == "batched":
+                game.world.use_batched_movement(seed=count)
+            elif mode == "sharded":
+                game.world.use_sharded_movement(seed=count)
+            key = f"{count}_{mode}" if mode else str(count)
+            results[key] = time_per_call(NVWorld.do_world_tic, [game.world], tics) / 1e3
+            if game.world.crowd:
+                game.world.crowd.close()
+    return results
+
+
+def _render_afresh(node, long_p: bool = False) -> None:
+    """Render a node, building its scene anew rather than from its cache."""
+    node.invalidate()
+    node.render(long_p=long_p)
+
+
+def bench_render(path: str, repeat: int = 1000) -> dict[str, float]:
+    """Time rendering every node of the world, both long and short.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        repeat: the number of times to render each node
+
+    Returns:
+        A dict with the mean microseconds per render of a node, for the
+        "long" and "short" descriptions, each building its scene anew; and
+        the same with the scene taken from the node's cache, keyed by
+        "long_cached" and "short_cached".
+    """
+    nodes = list(NVWorld(None, path + "/dirtest.json").nodes.values())
+    for node in nodes:
+        node.visited_p = True
+    return {
+        "long": time_per_call(functools.partial(_render_afresh, long_p=True), nodes, repeat),
+        "short": time_per_call(_render_afresh, nodes, repeat),
+        "long_cached": time_per_call(
+            functools.partial(NVWorldNode.render, long_p=True), nodes, repeat
+        ),
+        "short_cached": time_per_call(NVWorldNode.render, nodes, repeat),
+    }
+
+
+def bench_turns(
+    path: str, corpus: Iterable[str] = TURN_CORPUS, repeat: int = 200
+) -> dict[str, float]:
+    """Measure the throughput of whole turns played with NVGame.step.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        corpus: the commands to play, in order
+        repeat: the number of times to play through the corpus
+
+    Returns:
+        A dict with the number of turns played ("turns") and the turns
+        played per second ("turns_per_second").
+    """
+    corpus = list(corpus)
+    game = NVGame(path)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for command in corpus:
+            game.step(command)
+    elapsed = time.perf_counter() - start
+    turns = repeat * len(corpus)
+    return {"turns": turns, "turns_per_second": turns / elapsed}
+
+
+def bench_world_size(
+    path: str, sizes: Iterable[int] = WORLD_SIZES, topology: str = "grid", tics: int = 5
+) -> dict[str, float]:
+    """Measure loading and ticking generated worlds as they grow.
+
+    Args:
+        path: the directory holding verbs.json
+        sizes: the numbers of nodes in the worlds to generate; each world
+            has a tenth as many NPCs and items as nodes
+        topology: the shape of the generated maps
+        tics: the number of tics to time in each world
+
+    Returns:
+        A dict with the milliseconds to load each world ("load_ms"), the
+        bytes allocated while loading it ("load_bytes"), the mean
+        milliseconds per tic ("tic_ms"), and the same simulating only the
+        NPCs near the player ("active_tic_ms"), each keyed by the number
+        of nodes as "<nodes>.<measurement>".
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in sizes:
+            world_file = f"{tmpdir}/world{size}.json"
+            with open(world_file, "w", encoding="utf-8") as fh:
+                json.dump(generate_world(size, size // 10, size // 10, topology, seed=size), fh)
+
+            start = time.perf_counter()
+            game = NVGame(path, world_file)
+            results[f"{size}.load_ms"] = (time.perf_counter() - start) * 1e3
+
+            # Tracing allocations slows loading down severalfold, so the
+            # memory is measured on a load of its own.
+            tracemalloc.start()
+            NVGame(path, world_file)
+            results[f"{size}.load_bytes"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            results[f"{size}.tic_ms"] = (
+                time_per_call(NVWorld.do_world_tic, [game.world], tics) / 1e3
+            )
+
+            # The first tic freezes the NPCs far away, once and for all.
+            game.world.use_active_region()
+            game.world.do_world_tic()
+            results[f"{size}.active_tic_ms"] = (
+                time_per_call(NVWorld.do_world_tic, [game.world], tics) / 1e3
+            )
+    return results
+
+
+def run_suite(
+    path: str,
+    quick: bool = False,
+    actor_counts: Iterable[int] = ACTOR_COUNTS,
+    world_sizes: Iterable[int] = (),
+    sharded: bool = False,
+) -> dict:
+    """Run every benchmark.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        quick: whether to run fewer repetitions, for a rough answer fast
+        actor_counts: the numbers of NPCs to time world tics with
+        world_sizes: the numbers of nodes in the generated worlds to
+            measure scaling with (defaults to none)
+        sharded: whether to time world tics with sharded movement too
+            (defaults to False)
+
+    Returns:
+        A dict mapping the name of each measurement, which ends in its
+        unit, onto its value.  Every measurement is a time per operation.
+    """
+    scale = 10 if quick else 1
+    results = {}
+
+    # Rendering and help print a lot, which is not what is being timed.
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        token = OUTPUT.set(devnull)
+        try:
+            for name, value in bench_load(path, 20 // scale).items():
+                results[f"load.{name}"] = value
+            for name, value in bench_parse(path, 1000 // scale).items():
+                results[f"parse.{name}_us"] = value
+            for name, value in bench_hard_parse(path, repeat=1000 // scale).items():
+                if value is not None:
+                    results[f"hard_parse.{name}_us"] = value
+            results["invocation.bind_us"] = bench_invocation(path, 100000 // scale)["bind"]
+            for name, value in bench_tic(path, actor_counts, sharded=sharded).items():
+                results[f"tic.actors_{name}_ms"] = value
+            for name, value in bench_render(path, 1000 // scale).items():
+                results[f"render.{name}_us"] = value
+            turns = bench_turns(path, repeat=200 // scale)
+            results["turn.step_us"] = 1e6 / turns["turns_per_second"]
+            for name, value in bench_world_size(path, world_sizes).items():
+                results[f"world.nodes_{name}"] = value
+        finally:
+            OUTPUT.reset(token)
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """Compare measurements against a baseline.
+
+    Args:
+        results: the measurements, as returned by run_suite
+        baseline: earlier measurements to compare against
+        threshold: how much a measurement may grow over its baseline, as
+            a fraction of it, before it counts as a regression
+
+    Returns:
+        A dict mapping the name of each measurement in both onto a tuple
+        of its baseline, its relative change, and whether it regressed.
+    """
+    comparison = {}
+    for name, value in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        change = (value - old) / old
+        comparison[name] = (old, change, change > threshold)
+    return comparison
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line, run the benchmarks, and report."""
+    argp = argparse.ArgumentParser(prog="nuventure.bench", description="Benchmark Nuventure.")
+    argp.add_argument("path", nargs="?", default="../data", help="the game data directory")
+    argp.add_argument("--json", metavar="FILE", help='save the results as JSON ("-" for stdout)')
+    argp.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    argp.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="the relative slowdown counted as a regression (default: %(default)s)",
+    )
+    argp.add_argument(
+        "--actors",
+        default=",".join(str(n) for n in ACTOR_COUNTS),
+        help="comma-separated NPC counts to time world tics with",
+    )
+    argp.add_argument(
+        "--world-sizes",
+        default="",
+        metavar="SIZES",
+        help="comma-separated node counts of generated worlds to measure scaling with "
+        f"(e.g. {','.join(str(n) for n in WORLD_SIZES)})",
+    )
+    argp.add_argument("--quick", action="store_true", help="run fewer repetitions")
+    argp.add_argument(
+        "--sharded",
+        action="store_true",
+        help="also time world tics moving NPCs in a worker process per CPU",
+    )
+    args = argp.parse_args(argv[1:])
+
+    actor_counts = [int(n) for n in args.actors.split(",") if n]
+    world_sizes = [int(n) for n in args.world_sizes.split(",") if n]
+    results = run_suite(args.path, args.quick, actor_counts, world_sizes, args.sharded)
+
+    if args.json == "-":
+        print(json.dumps(results, indent=2))
+        return 0
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+    comparison = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            comparison = compare(results, json.load(fh), args.threshold)
+
+    regressions = 0
+    for name, value in results.items():
+        line = f"{name:28}{value:14.3f}"
+        if name in comparison:
+            old, change, regressed = comparison[name]
+            regressions += regressed
+            line += f"{old:14.3f}{change:+9.1%}" + ("  REGRESSION" if regressed else "")
+        print(line)
+
+    if args.compare:
+        print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
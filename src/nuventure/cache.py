@@ -0,0 +1,232 @@
+"""World cache module for Nuventure, a poor man's implementation of ScummVM.
+
+Loading a game parses the world and verb JSON and builds every node,
+item, actor, and the parser's grammar afresh, which for a large world
+costs seconds on each start.  Compiling a world saves the result of all
+that as a binary cache next to the world file, which NVGame loads instead
+whenever it is present and up to date.
+
+A cache records the size, modification time, and SHA-256 hash of each
+file it was compiled from.  If a file's size or modification time has
+changed, its hash is checked; if that has changed too, the cache is stale
+and is compiled afresh in place.  A cache is a pickle, so it must only be
+loaded from a directory as trusted as the code itself.
+
+Run this module from the source directory to compile a world:
+
+    python -m nuventure.cache ../data
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+from typing import Tuple, Union
+
+from nuventure.parser import NVParser
+from nuventure.world import NVWorld
+
+"""The first bytes of every world cache."""
+MAGIC = b"NVWCACHE"
+
+"""The version of the cache format, which must be bumped whenever the
+classes saved in it change shape."""
+CACHE_VERSION = 9
+
+"""The extension of a world cache, which replaces that of the world file."""
+CACHE_EXTENSION = ".nvc"
+
+"""The length of the header following the magic number."""
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def cache_path(world_file: str) -> str:
+    """Returns the path of the cache for a world file."""
+    return os.path.splitext(world_file)[0] + CACHE_EXTENSION
+
+
+def _hash(pathname: str) -> str:
+    """Returns the SHA-256 hash of a file, in hex."""
+    digest = hashlib.sha256()
+    with open(pathname, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fingerprint(pathname: str) -> dict:
+    """Returns what a cache records of a file it was compiled from."""
+    st = os.stat(pathname)
+    return {
+        "path": os.path.abspath(pathname),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": _hash(pathname),
+    }
+
+
+def _is_fresh(fingerprint: dict) -> bool:
+    """Returns whether a file is unchanged since it was fingerprinted."""
+    try:
+        st = os.stat(fingerprint["path"])
+    except OSError:
+        return False
+    if (st.st_size, st.st_mtime_ns) == (fingerprint["size"], fingerprint["mtime_ns"]):
+        return True
+    if st.st_size != fingerprint["size"]:
+        return False
+    return _hash(fingerprint["path"]) == fingerprint["sha256"]
+
+
+def _sources(world: NVWorld, world_file: str, verb_table: str) -> list[str]:
+    """Returns the files a world and its parser were loaded from."""
+    sources = [world_file, verb_table]
+    if world.strings is not None:
+        sources.append(world.strings.pathname)
+    return sources
+
+
+def compile_world(
+    world_file: str, verb_table: str, dest: Union[str, None] = None
+) -> Tuple[NVWorld, NVParser]:
+    """Load a world and its parser, and save them as a cache.
+
+    Args:
+        world_file: the world JSON to load
+        verb_table: the verb table JSON to load
+        dest: the cache to write (defaults to the world file's name with
+            the extension CACHE_EXTENSION)
+
+    Returns:
+        A tuple of the newly loaded world, which is not yet bound to a
+        game, and its parser.
+    """
+    world = NVWorld(None, world_file)
+    parser = NVParser(verb_table, world.vocabulary())
+
+    sources = _sources(world, world_file, verb_table)
+    header = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "python": sys.implementation.cache_tag,
+            "sources": [_fingerprint(source) for source in sources],
+        }
+    ).encode("utf-8")
+    payload = pickle.dumps((world, parser), pickle.HIGHEST_PROTOCOL)
+
+    # Write to a temporary file first, so that other processes loading the
+    # same world never see a cache half written.
+    dest = dest or cache_path(world_file)
+    temp = f"{dest}.{os.getpid()}.tmp"
+    with open(temp, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER_LENGTH.pack(len(header)))
+        fh.write(header)
+        fh.write(payload)
+    os.replace(temp, dest)
+
+    return world, parser
+
+
+def read_cache(pathname: str) -> Union[Tuple[NVWorld, NVParser], None]:
+    """Load a world and its parser from a cache, if it is up to date.
+
+    Args:
+        pathname: the cache to load
+
+    Returns:
+        A tuple of the world, which is not yet bound to a game, and its
+        parser; or None if the cache is missing, stale, unreadable, or
+        was written by another version of the cache format or of Python.
+    """
+    try:
+        with open(pathname, "rb") as fh:
+            if fh.read(len(MAGIC)) != MAGIC:
+                return None
+            (length,) = _HEADER_LENGTH.unpack(fh.read(_HEADER_LENGTH.size))
+            header = json.loads(fh.read(length))
+            if (
+                header["version"] != CACHE_VERSION
+                or header["python"] != sys.implementation.cache_tag
+                or not all(_is_fresh(source) for source in header["sources"])
+            ):
+                return None
+
+            # Unpickling creates a great many objects and no garbage, so
+            # the cyclic collector would only be wasting its time.
+            enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(fh)
+            finally:
+                if enabled:
+                    gc.enable()
+    except (OSError, ValueError, KeyError, struct.error, pickle.UnpicklingError, EOFError):
+        return None
+    except (AttributeError, ImportError, TypeError):
+        # The classes saved in the cache have changed shape since.
+        return None
+
+
+def load_world(world_file: str, verb_table: str) -> Tuple[NVWorld, NVParser]:
+    """Load a world and its parser, from their cache if possible.
+
+    If the world has a cache that is up to date, it is loaded; if it has
+    one that is not, it is compiled afresh.  A world without a cache is
+    loaded from its JSON, and no cache is written for it.
+
+    Args:
+        world_file: the world JSON
+        verb_table: the verb table JSON
+
+    Returns:
+        A tuple of the world, which is not yet bound to a game, and its
+        parser.
+    """
+    pathname = cache_path(world_file)
+    if not os.path.exists(pathname):
+        world = NVWorld(None, world_file)
+        return world, NVParser(verb_table, world.vocabulary())
+
+    loaded = read_cache(pathname)
+    if loaded is not None:
+        return loaded
+
+    try:
+        return compile_world(world_file, verb_table, pathname)
+    except OSError:
+        # A stale cache that cannot be replaced is simply ignored.
+        world = NVWorld(None, world_file)
+        return world, NVParser(verb_table, world.vocabulary())
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line and compile a world."""
+    argp = argparse.ArgumentParser(
+        prog="nuventure.cache", description="Compile a world into a binary cache."
+    )
+    argp.add_argument("path", nargs="?", default="../data", help="the game data directory")
+    argp.add_argument("--world", default="dirtest.json", help="the world file, in that directory")
+    argp.add_argument("--verbs", default="verbs.json", help="the verb table, in that directory")
+    args = argp.parse_args(argv[1:])
+
+    world_file = os.path.join(args.path, args.world)
+    compile_world(world_file, os.path.join(args.path, args.verbs))
+    print(f"{cache_path(world_file)}: compiled", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
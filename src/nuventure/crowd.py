@@ -0,0 +1,133 @@
+"""Crowd module for Nuventure, a poor man's implementation of ScummVM.
+
+NVCrowd moves every NPC in the world at once.  The map is flattened into
+a CSR adjacency (each node's neighbors laid end to end in one array, with
+an array of offsets saying where each node's neighbors start) and the
+NPCs' locations are kept in an array of node indices, so that a whole
+step of every NPC's wandering is a handful of NumPy operations rather than
+a trip through the parser for each of them.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+from typing import Union
+
+import numpy as np
+
+
+class NVCrowd:
+    """
+    NVCrowd holds the locations of a world's NPCs in arrays over a CSR
+    adjacency of its map, and advances them all by one world tic at a
+    time.  It follows the same rules as NVActor.do_tic: dead NPCs are
+    removed from the world, and every other NPC takes as many steps as
+    its movement rate, each in a direction chosen at random from those
+    leading out of where it stands.  NPCs with a goal follow their routes
+    one by one, like the player, by way of NVActor.do_tic.
+    """
+
+    def __init__(self, world, seed: Union[int, None] = None):
+        """Create a new crowd from the actors in a world.
+
+        Args:
+            world: the world whose NPCs are moved
+            seed: the seed for the random number generator (defaults to
+                seeding from the operating system)
+        """
+        self.world = world
+        self.rng = np.random.default_rng(seed)
+
+        self.nodes = world.nodes.by_id
+        self.indptr = self.indices = self.degree = np.empty(0, np.intp)
+        self._version = None
+        self.npcs = []
+        self.locations = self.rates = np.empty(0, np.intp)
+        self.dirty = True
+        self.relink()
+        self.rebuild()
+
+    def relink(self) -> None:
+        """Take the links of the map afresh from the world.  This happens
+        on its own whenever they change."""
+        # The world's edge table is already a CSR adjacency, with each
+        # node's links in the order of its exits, so drawing the k-th
+        # neighbor is drawing the k-th direction.
+        graph = self.world.graph
+        self.indptr = np.asarray(graph.offsets, np.intp)
+        self.indices = np.asarray(graph.targets, np.intp)
+        self.degree = np.diff(self.indptr)
+        self._version = graph.version
+
+    def rebuild(self) -> None:
+        """Take the roster of wandering NPCs, their locations, and their
+        movement rates afresh from the world.  This happens on its own on
+        the next tic once the crowd is marked `dirty`, as it is whenever an
+        actor is added to or removed from the world or an NPC's goal is set
+        or cleared, but must be called by hand after moving an NPC by any
+        other means than a world tic."""
+        self.npcs = [
+            actor
+            for actor in self.world.actors.values()
+            if actor.is_npc() and actor.goal is None
+        ]
+
+        self.locations = np.fromiter(
+            (actor.location.id for actor in self.npcs),
+            np.intp,
+            len(self.npcs),
+        )
+        self.rates = np.fromiter(
+            (actor.movement_rate for actor in self.npcs), np.intp, len(self.npcs)
+        )
+        self.dirty = False
+
+    def do_tic(self) -> None:
+        """Remove the dead NPCs from the world, then move the living ones."""
+        if self.world.graph.version != self._version:
+            self.relink()
+        if self.dirty:
+            self.rebuild()
+
+        dead = [i for i, actor in enumerate(self.npcs) if actor.is_dead()]
+        if dead:
+            self.bury(dead)
+
+        if not self.npcs:
+            return
+
+        before = self.locations.copy()
+        self.step()
+        for i in np.flatnonzero(self.locations != before).tolist():
+            self.npcs[i].location = self.nodes[self.locations[i]]
+
+    def bury(self, dead: list[int]) -> None:
+        """Remove the given NPCs, by their position in the roster, from
+        the world and from the crowd."""
+        for i in dead:
+            self.world.remove_actor(self.npcs[i])
+        keep = np.ones(len(self.npcs), bool)
+        keep[dead] = False
+        self.npcs = [actor for actor, kept in zip(self.npcs, keep) if kept]
+        self.locations = self.locations[keep]
+        self.rates = self.rates[keep]
+        # Only the dead have left the world since the roster was taken.
+        self.dirty = False
+
+    def step(self) -> None:
+        """Move every NPC in the roster as far as its movement rate."""
+        for step in range(int(self.rates.max())):
+            # An NPC stranded in a node with no way out stays put.
+            moving = (self.rates > step) & (self.degree[self.locations] > 0)
+            where = self.locations[moving]
+            draws = (self.rng.random(len(where)) * self.degree[where]).astype(np.intp)
+            self.locations[moving] = self.indices[self.indptr[where] + draws]
+
+    def close(self) -> None:
+        """Release whatever the crowd holds besides its arrays, which for
+        a crowd moved in this process is nothing."""
@@ -11,12 +11,15 @@ This software is licensed under the MIT License.
 class NVParseError(Exception):
     """
     General parsing exception.  This is a generic error only suited for
-    when there is no better exception to throw.
+    when there is no better exception to throw.  When a verb is given the
+    wrong number of arguments, et_key is "noargs" if too few were given
+    and "toomanyargs" if too many were.
     """
 
-    def __init__(self, verb):
+    def __init__(self, verb, et_key=None):
         super().__init__()
         self.what = verb
+        self.et_key = et_key
 
 
 class NVBadTargetError(Exception):
@@ -69,3 +72,16 @@ class NVGameStateError(Exception):
     def __init__(self, verb):
         super().__init__()
         self.verb = verb
+
+
+class NVGameExit(SystemExit):
+    """
+    Exception to be raised when the game is over, whether the player
+    quit, won, or died.  As a SystemExit, it exits the console game
+    when left unhandled, but hosts of the engine such as NVGame.step
+    may catch it to carry on.
+    """
+
+    def __init__(self, verb=None):
+        super().__init__(0)
+        self.verb = verb
@@ -8,19 +8,66 @@ Copyright (c) 2021 by William Ellison.
 Nuventure is licensed under the terms of the MIT License, furnished
 in the LICENSE file at the root directory of this distribution.
 """
+import os
+import time
 from typing import Union, Callable
 
-from nuventure import ERROR_STR, nv_print
+from nuventure import DEFAULT_WIDTH, ERROR_STR, OUTPUT, nv_output, nv_print, trace
 from nuventure.errors import (
     NVParseError,
     NVBadTargetError,
     NVBadArgError,
     NVNoArgError,
     NVGameStateError,
+    NVGameExit,
 )
-from nuventure.world import NVWorld
+from nuventure.cache import load_world
 from nuventure.actor import NVActor
-from nuventure.parser import NVParser, do_quit
+from nuventure.parser import ALL_TARGETED_VERBS, do_quit
+from nuventure.sink import NVBufferSink, NVStreamSink
+
+
+class NVTurnResult:
+    """
+    NVTurnResult describes a turn played with NVGame.step: the command
+    and what the parser made of it, the error that resulted (as one of
+    the keys of a verb's error text, or "unknown", "notimpl", or "empty"
+    for commands that did not parse), the lines of text the turn printed,
+    whether the world ticked afterward, and whether the game is over.
+    The time taken by each phase of the turn, in seconds, is recorded in
+    `timings` under "read", "parse", "invoke", and "tic", for turns played
+    with NVGame.step or while tracing is enabled.
+    """
+
+    __slots__ = (
+        "command",
+        "verb",
+        "target",
+        "implement",
+        "error",
+        "output",
+        "tic_ran",
+        "quit",
+        "timings",
+    )
+
+    def __init__(self, command: Union[str, None] = None):
+        """Create a blank result for a turn playing the given command."""
+        self.command = command
+        self.verb = None
+        self.target = None
+        self.implement = None
+        self.error = None
+        self.output = []
+        self.tic_ran = False
+        self.quit = False
+        self.timings = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"NVTurnResult(command={self.command!r}, verb={self.verb!r}, "
+            f"error={self.error!r}, tic_ran={self.tic_ran}, quit={self.quit})"
+        )
 
 
 class NVGame:
@@ -29,60 +76,195 @@ class NVGame:
     It runs the input loop and handles some outlier parse errors.
     """
 
-    def __init__(self, path):
-        self.world = NVWorld(self, path + "/dirtest.json")
+    def __init__(self, path, world_file="dirtest.json", width=DEFAULT_WIDTH):
+        self.width = width
+        self.world, self.parser = load_world(
+            os.path.join(path, world_file), os.path.join(path, "verbs.json")
+        )
+        self.world.game_instance = self
         self.start_node = self.world.nodes["ORIGIN"]
         self.player = NVActor(self.world, self.start_node)
         self.world.add_actor(self.player)
-        self.parser = NVParser(path + "/verbs.json")
 
-    def run(self) -> None:
+    def run(self, profiler=None) -> None:
         """Run the game by rendering the player's starting location
-        and then starting the input loop.
+        and then starting the input loop.  Each turn's output is written
+        to standard output at once, when the turn is over.
+
+        Args:
+            profiler: if given, an NVProfiler with which to profile each
+                turn; it is closed, writing out its results, when the
+                game ends
+        """
+        sink = NVStreamSink(width=self.width)
+        token = OUTPUT.set(sink)
+        try:
+            self.player.location.render()
+            sink.flush()
+
+            while True:
+                if profiler:
+                    # Waiting for the player is no part of the turn.
+                    command = self._read_command()
+                    with profiler.turn():
+                        self.do_turn(command)
+                else:
+                    self.do_turn()
+                sink.flush()
+        finally:
+            sink.flush()
+            OUTPUT.reset(token)
+            if profiler:
+                profiler.close()
+
+    def step(self, command: str) -> NVTurnResult:
+        """Play a single turn without touching standard input or output.
+
+        The turn's output is captured into the result rather than printed,
+        and the end of the game is reported in the result rather than by
+        exiting.  This is meant for embedding the engine in other programs.
+
+        Args:
+            command: the command to play
+
+        Returns:
+            An NVTurnResult describing the turn.
         """
-        self.player.location.render()
+        result = NVTurnResult(command)
+        output = NVBufferSink(self.width)
+        token = OUTPUT.set(output)
+        try:
+            self.do_turn(command, result, timed_p=True)
+        except NVGameExit:
+            result.quit = True
+        finally:
+            OUTPUT.reset(token)
+        result.output = output.lines()
+        return result
 
-        while True:
-            result = self._do_input_loop()
-            if result:
+    def do_turn(
+        self,
+        command: Union[str, None] = None,
+        result: Union[NVTurnResult, None] = None,
+        timed_p: bool = False,
+    ) -> bool:
+        """Play a single turn: process a command, then do a world tic if
+        the command succeeded.
+
+        Args:
+            command: the command to process (defaults to reading one
+                from the user)
+            result: if given, this is filled in with what became of the turn
+            timed_p: whether to time each phase of the turn into the
+                result's timings; they are timed anyway while tracing
+
+        Returns:
+            True if the command succeeded and the world ticked, False
+            otherwise.
+        """
+        if result is None:
+            result = NVTurnResult(command)
+        timed_p = timed_p or trace.TRACING
+        if self._do_input_loop(command, result, timed_p):
+            result.tic_ran = True
+            start = time.perf_counter() if timed_p else 0.0
+            try:
                 self.world.do_world_tic()
+            finally:
+                if timed_p:
+                    result.timings["tic"] = time.perf_counter() - start
+        if trace.TRACING:
+            trace.record_turn(result.timings)
+        return result.tic_ran
 
-    def _do_parse_error(self):
-        """Issue a parse error."""
-        last = self.parser.last_command.split(" ")
-        if last:
-            if last[0] != "help":
-                self.parser.error(last[0])
-            elif last[0] == "help":
-                return
-        else:
-            nv_print(ERROR_STR)
+    def _read_command(self) -> str:
+        """Prompt the player for a command and read it."""
+        print(" ", file=nv_output())
+        # The player must see the whole turn before typing the next.
+        nv_output().flush()
+        return self.parser.read_input(self.player)
+
+    def _do_parse_error(self, kind: str) -> Union[str, None]:
+        """Issue a parse error, unless the parser already has.
+
+        Args:
+            kind: the kind of outcome the parse had (see NVParser.parse)
+
+        Returns:
+            The key of the error, or None for the help command."""
+        if kind == "help":
+            return None
+        if kind in ("noargs", "toomanyargs"):
+            # The parser has already complained about the arguments.
+            return kind
+        nv_print(ERROR_STR)
+        return "empty"
+
+    def _suggest_nouns(self, verb: str, word: str) -> None:
+        """Propose the things in scope the player may have meant instead
+        of the given word, if the verb takes a target and any are close."""
+        if verb not in ALL_TARGETED_VERBS or not isinstance(word, str):
+            return
+        scope = self.player.in_scope()
+        candidates = [c for c in self.parser.suggest_nouns(word, scope) if c != word]
+        if candidates:
+            nv_print(f"Did you mean: {', '.join(candidates)}?")
 
-    def _do_input_loop(self) -> Union[None, Callable]:
-        """Accept input from the user and process it."""
+    def _do_input_loop(
+        self,
+        command: Union[str, None] = None,
+        turn: Union[NVTurnResult, None] = None,
+        timed_p: bool = False,
+    ) -> Union[None, Callable]:
+        """Accept input from the user (unless a command is given) and
+        process it, noting what became of it in `turn` if given, and how
+        long each phase took if timed_p is set."""
+        if turn is None:
+            turn = NVTurnResult(command)
         self.player.location.visited_p = True
-        print(" ")
 
         try:
-            verb = self.parser.read_command(self.player)
+            if command is None:
+                start = time.perf_counter() if timed_p else 0.0
+                command = self._read_command()
+                if timed_p:
+                    turn.timings["read"] = time.perf_counter() - start
+                turn.command = command
+            start = time.perf_counter() if timed_p else 0.0
+            try:
+                verb, kind = self.parser.parse(self.player, command)
+            finally:
+                if timed_p:
+                    turn.timings["parse"] = time.perf_counter() - start
         except NotImplementedError:
+            turn.error = "notimpl"
             return nv_print("this action is not implemented yet")
         except (KeyboardInterrupt, EOFError):
             return do_quit(None)
         except NVParseError:
+            turn.error = "unknown"
             return None
         else:
             if verb:
+                turn.verb, turn.target, turn.implement = verb.name, verb.target, verb.bound_item
+                start = time.perf_counter() if timed_p else 0.0
                 try:
                     result = verb.invoke()
                 except (NVBadArgError, NVBadTargetError) as ex:
+                    turn.error = ex.et_key
                     self.parser.rich_error(ex.verb, ex.et_key, ex.arg)
+                    self._suggest_nouns(ex.verb, ex.arg)
                 except NVNoArgError as ex:
+                    turn.error = "noargs"
                     self.parser.rich_error(ex.verb, "noargs")
                 except NVGameStateError as ex:
+                    turn.error = "badstate"
                     self.parser.rich_error(ex.verb, "badstate")
                 else:
                     return result
+                finally:
+                    if timed_p:
+                        turn.timings["invoke"] = time.perf_counter() - start
             else:
-                self._do_parse_error()
+                turn.error = self._do_parse_error(kind)
                 return None
@@ -0,0 +1,195 @@
+"""Grammar module for Nuventure, a poor man's implementation of ScummVM.
+
+NVGrammar is a deterministic command grammar compiled from the verb table
+and the world's vocabulary.  Since the game only ever understands a closed
+set of verbs and nouns, there is no need to tag parts of speech: a command
+is a verb followed by noun phrases, which are separated by prepositions and
+padded out with articles.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+from typing import Iterable, Mapping, Tuple, Union
+
+from .errors import NVParseError
+
+"""Words that carry no meaning in a command and are simply skipped."""
+FILLER_WORDS = {"a", "an", "the", "some", "my", "your", "around", "here", "please"}
+
+"""Words that separate one noun phrase from the next, e.g. the "with" in
+"unlock the door with the key"."""
+PREPOSITIONS = {"with", "on", "at", "to", "from", "in", "into", "onto", "using", "upon"}
+
+"""Punctuation that is discarded before a command is split into words."""
+_PUNCTUATION = str.maketrans("", "", ",.!?;:\"")
+
+
+def tokenize(input_string: str) -> list[str]:
+    """Split a command into lowercase words, discarding punctuation."""
+    return input_string.lower().translate(_PUNCTUATION).split()
+
+
+class NVGrammar:
+    """
+    NVGrammar resolves a command into its verb, target, and implement.
+
+    The grammar is built from two tables at load time: the argument frames
+    for each verb, which map the number of nouns a verb accepts onto the
+    role that each noun plays, and the vocabulary, which maps each way of
+    naming a thing in the world onto that thing's internal name.
+    """
+
+    def __init__(
+        self,
+        frames: Mapping[str, Mapping[int, Tuple[str, ...]]],
+        vocabulary: Union[Mapping[str, str], None] = None,
+    ):
+        """Compile a new grammar.
+
+        Args:
+            frames: a mapping of each verb onto its argument frames; each
+                frame maps a noun count onto a tuple of "target" and
+                "implement" roles in the order the nouns appear
+            vocabulary: a mapping of noun phrases onto internal names
+                (defaults to an empty vocabulary)
+        """
+        self.frames = {verb: dict(frame) for verb, frame in frames.items()}
+        self.vocabulary = {}
+        self._phrases = {}
+        self.add_nouns(vocabulary or {})
+
+    def add_nouns(self, vocabulary: Mapping[str, str]) -> None:
+        """Add noun phrases to the grammar's vocabulary.
+
+        Phrases are indexed by their first word, longest phrase first, so
+        that "alchemist's journal" wins over a hypothetical "alchemist's".
+        Filler words are dropped from phrases just as they are from commands.
+
+        Args:
+            vocabulary: a mapping of noun phrases onto internal names
+        """
+        added = set()
+        for phrase, name in vocabulary.items():
+            words = tuple(word for word in tokenize(phrase) if word not in FILLER_WORDS)
+            if not words:
+                continue
+            key = " ".join(words)
+            if key not in self.vocabulary:
+                self._phrases.setdefault(words[0], []).append(words)
+                added.add(words[0])
+            self.vocabulary[key] = name
+
+        for first in added:
+            self._phrases[first].sort(key=len, reverse=True)
+
+    def parse(self, input_string: str) -> Tuple[str, Union[str, None], Union[str, None]]:
+        """Resolve a command into its verb, target, and implement.
+
+        Args:
+            input_string: the command as typed, starting with the verb
+
+        Returns:
+            A tuple of the verb, the target, and the implement; the target
+            and implement are None if the verb does not take them.
+
+        Raises:
+            NVParseError: if the nouns given do not fit the verb
+            NotImplementedError: if the verb has no argument frames
+        """
+        words = tokenize(input_string)
+        if not words:
+            raise NVParseError(None)
+        return self.bind(words[0], self.chunk(words[1:]))
+
+    def chunk(self, words: Iterable[str]) -> list[str]:
+        """Group the words following a verb into noun phrases.
+
+        Args:
+            words: the words of the command, less the verb
+
+        Returns:
+            A list of nouns in the order they appear, each resolved to
+            an internal name if it is in the vocabulary.
+        """
+        nouns = []
+        phrase = []
+        for word in words:
+            if word in PREPOSITIONS:
+                nouns.extend(self._resolve(phrase))
+                phrase = []
+            elif word not in FILLER_WORDS:
+                phrase.append(word)
+        nouns.extend(self._resolve(phrase))
+        return nouns
+
+    def bind(
+        self, verb: str, nouns: list[str]
+    ) -> Tuple[str, Union[str, None], Union[str, None]]:
+        """Bind a list of nouns to a verb's target and implement.
+
+        There are two types of commands that accept two arguments: those
+        that accept the target first (the "first type", e.g. "unlock the
+        door with the key"), and those that accept the implement first
+        (the "second type", e.g. "cast fire on the goblin").  If there
+        is only one argument, it is the target (the "third type", e.g.
+        "extinguish the lamp").
+
+        Args:
+            verb: the verb of the command
+            nouns: the nouns of the command, in the order they appear
+
+        Returns:
+            A tuple of the verb, the target, and the implement.
+
+        Raises:
+            NVParseError: if there is no verb, or the nouns given do not
+                fit the verb
+            NotImplementedError: if the verb has no argument frames
+        """
+        if verb is None:
+            raise NVParseError(None)
+        if verb not in self.frames:
+            raise NotImplementedError(verb)
+
+        frames = self.frames[verb]
+        roles = frames.get(len(nouns))
+        if roles is None:
+            too_many_p = bool(frames) and len(nouns) > max(frames)
+            raise NVParseError(verb, "toomanyargs" if too_many_p else "noargs")
+
+        bound = dict(zip(roles, nouns))
+        return verb, bound.get("target"), bound.get("implement")
+
+    def _resolve(self, phrase: list[str]) -> list[str]:
+        """Resolve one noun phrase against the vocabulary.
+
+        A phrase made up entirely of known nouns ("door key") yields each
+        of them; a phrase containing a single known noun ("rusty lamp")
+        yields just that noun; anything else is taken as typed, so that
+        verbs can complain about it by name.
+        """
+        if not phrase:
+            return []
+
+        known = []
+        leftovers = False
+        i = 0
+        while i < len(phrase):
+            for words in self._phrases.get(phrase[i], ()):
+                if tuple(phrase[i : i + len(words)]) == words:
+                    known.append(self.vocabulary[" ".join(words)])
+                    i += len(words)
+                    break
+            else:
+                leftovers = True
+                i += 1
+
+        if known and (not leftovers or len(known) == 1):
+            return known
+        return [" ".join(phrase)]
@@ -0,0 +1,250 @@
+"""Graph module for Nuventure, a poor man's implementation of ScummVM.
+
+NVWorldGraph holds the links between a world's nodes in compact form.
+Each node is numbered in the order it was added, and its links are kept
+in flat arrays as an edge table: the direction, the number of the node it
+leads to, and the travel description of every link are laid end to end,
+with an array of offsets saying where each node's links start.  Node names,
+travel descriptions, and the lists of exits out of each node are interned,
+so a description shared by a thousand links is stored once.
+
+Links may be changed once the graph is finished, e.g. when a door is
+opened; each change bumps the graph's version, by which anything derived
+from the links, such as cached routes, knows to throw itself away.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import sys
+from array import array
+from enum import IntEnum
+from typing import Iterable, Mapping, Union
+
+
+class NVDirection(IntEnum):
+    """
+    The directions of travel, numbered so that each direction and its
+    opposite differ only in the lowest bit.
+    """
+
+    NORTH = 0
+    SOUTH = 1
+    EAST = 2
+    WEST = 3
+    UP = 4
+    DOWN = 5
+
+    def __str__(self) -> str:
+        """Returns the direction as the player types it."""
+        return self.name.lower()
+
+    @property
+    def opposite(self) -> "NVDirection":
+        """The direction leading back the way this one came."""
+        return NVDirection(self ^ 1)
+
+
+"""The name of each direction, indexed by its number."""
+DIRECTION_NAMES = tuple(str(direction) for direction in NVDirection)
+
+"""Each direction, keyed by its name."""
+DIRECTIONS_BY_NAME = {str(direction): direction for direction in NVDirection}
+
+
+class NVWorldGraph:
+    """
+    NVWorldGraph is the edge table of a world's map.  Nodes are added in
+    order, each with its links; since a link may lead to a node that has
+    not been added yet, the graph must be finished once every node is in
+    before any link can be followed.
+    """
+
+    __slots__ = (
+        "names",
+        "ids",
+        "offsets",
+        "directions",
+        "exit_names",
+        "_exit_sets",
+        "targets",
+        "travel",
+        "strings",
+        "_string_ids",
+        "_pending",
+        "version",
+    )
+
+    def __init__(self):
+        """Create a new, empty graph."""
+        self.names = []
+        self.ids = {}
+        self.offsets = array("i", [0])
+        self.directions = bytearray()
+        self.exit_names = []
+        self._exit_sets = {}
+        self.targets = array("i")
+        self.travel = array("i")
+        self.strings = []
+        self._string_ids = {}
+        self._pending = []
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Returns the number of nodes in the graph."""
+        return len(self.names)
+
+    def add_node(self, name: str, links: Iterable[Mapping[str, str]]) -> int:
+        """Add a node and its links to the graph.
+
+        Args:
+            name: the internal name of the node
+            links: the node's "linkedNodes" from the world JSON, each with
+                a "name", a "direction", and a "travelDescription"
+
+        Returns:
+            The number of the new node.
+
+        Raises:
+            ValueError: if the graph is already finished, or a link goes
+                in a direction that does not exist
+        """
+        if self._pending is None:
+            raise ValueError("cannot add nodes to a finished graph")
+
+        node_id = len(self.names)
+        name = sys.intern(name)
+        self.names.append(name)
+        self.ids[name] = node_id
+
+        for link in links:
+            direction = DIRECTIONS_BY_NAME.get(link["direction"])
+            if direction is None:
+                raise ValueError(f"{name}: no such direction {link['direction']!r}")
+            self.directions.append(direction)
+            self._pending.append(sys.intern(link["name"]))
+            self.travel.append(self.intern_string(link["travelDescription"]))
+        self.offsets.append(len(self.directions))
+
+        self.exit_names.append(self._exits_of(node_id))
+
+        return node_id
+
+    def _exits_of(self, node_id: int) -> tuple[str, ...]:
+        """Returns the interned tuple of the names of a node's exits."""
+        begin, end = self.offsets[node_id], self.offsets[node_id + 1]
+        exits = tuple(DIRECTION_NAMES[d] for d in self.directions[begin:end])
+        return self._exit_sets.setdefault(exits, exits)
+
+    def finish(self) -> None:
+        """Resolve every link to the number of the node it leads to.
+
+        Raises:
+            ValueError: if a link leads to a node that does not exist
+        """
+        if self._pending is None:
+            return
+        for name in self._pending:
+            target = self.ids.get(name)
+            if target is None:
+                raise ValueError(f"link to nonexistent node {name!r}")
+            self.targets.append(target)
+        self._pending = None
+
+    def intern_string(self, text: Union[str, int]) -> int:
+        """Store a string once, returning its number in the string table.
+
+        In a built world, the strings are already in the world's string
+        table, which replaces the graph's own, and are given by number."""
+        if isinstance(text, int):
+            return text
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def set_link(
+        self, node_id: int, direction: int, target: int, travel: Union[str, int]
+    ) -> None:
+        """Make the given way out of a finished graph's node lead to another
+        node, adding the link if there was none that way.
+
+        Args:
+            node_id: the number of the node the link leads out of
+            direction: the direction of the link
+            target: the number of the node the link leads to
+            travel: the description of travelling the link
+
+        Raises:
+            ValueError: if the graph is not finished, or either node does
+                not exist
+        """
+        if self._pending is not None:
+            raise ValueError("cannot change the links of an unfinished graph")
+        for node in (node_id, target):
+            if not 0 <= node < len(self.names):
+                raise ValueError(f"no such node: {node}")
+
+        i = self.edge(node_id, direction)
+        if i < 0:
+            i = self.offsets[node_id + 1]
+            self.directions.insert(i, direction)
+            self.targets.insert(i, target)
+            self.travel.insert(i, self.intern_string(travel))
+            for later in range(node_id + 1, len(self.offsets)):
+                self.offsets[later] += 1
+            self.exit_names[node_id] = self._exits_of(node_id)
+        else:
+            self.targets[i] = target
+            self.travel[i] = self.intern_string(travel)
+        self.version += 1
+
+    def remove_link(self, node_id: int, direction: int) -> bool:
+        """Remove the link going the given way out of a finished graph's node.
+
+        Returns:
+            True if there was such a link, False otherwise.
+
+        Raises:
+            ValueError: if the graph is not finished
+        """
+        if self._pending is not None:
+            raise ValueError("cannot change the links of an unfinished graph")
+        i = self.edge(node_id, direction)
+        if i < 0:
+            return False
+        del self.directions[i]
+        del self.targets[i]
+        del self.travel[i]
+        for later in range(node_id + 1, len(self.offsets)):
+            self.offsets[later] -= 1
+        self.exit_names[node_id] = self._exits_of(node_id)
+        self.version += 1
+        return True
+
+    def exits(self, node_id: int) -> tuple[str, ...]:
+        """Returns the names of the directions leading out of a node."""
+        return self.exit_names[node_id]
+
+    def edge(self, node_id: int, direction: int) -> int:
+        """Returns the index of the link going the given way out of a
+        node in the edge table, or -1 if there is none."""
+        return self.directions.find(direction, self.offsets[node_id], self.offsets[node_id + 1])
+
+    def neighbor(self, node_id: int, direction: int) -> int:
+        """Returns the number of the node lying the given way from a node,
+        or -1 if there is none."""
+        i = self.edge(node_id, direction)
+        return self.targets[i] if i >= 0 else -1
+
+    def travel_description(self, node_id: int, direction: int) -> str:
+        """Returns the description of travelling the given way out of a
+        node, or None if there is no such way."""
+        i = self.edge(node_id, direction)
+        return self.strings[self.travel[i]] if i >= 0 else None
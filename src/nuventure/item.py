@@ -10,6 +10,7 @@ in the LICENSE file at the root directory of this distribution.
 """
 
 from nuventure import nv_print
+from nuventure.strings import text
 
 
 class NVItem:
@@ -28,21 +29,54 @@ class NVItem:
             world: the world to which this item is bound"""
         self.internal_name = internal_name
         self.friendly_name = database_info["friendlyName"]
-        self.look_description = database_info["inSceneDescription"]
-        self.long_description = database_info["longDescription"]
-        self.take_description = database_info["takeDescription"] or None
-        self.use_description = [database_info["useDescription"], database_info["useAltDescription"]]
-
+        self.aliases = tuple(database_info.get("aliases") or ())
+        self.strings = world.strings
+        self._look_description = database_info["inSceneDescription"]
+        self._long_description = database_info["longDescription"]
+        # A description may be the number of a string in the string table,
+        # and 0 is as good a number as any.
+        self._take_description = database_info["takeDescription"]
+        if self._take_description == "":
+            self._take_description = None
+        self._use_description = (
+            database_info["useDescription"],
+            database_info["useAltDescription"],
+        )
+
+        self.ownership = world.ownership
         self.location = world.nodes.get(database_info["originCell"], None)
+        self.owner = None
 
         if database_info["originOwner"]:
             self.owner = world.actors.get(database_info["originOwner"], None)
-            self.owner.inventory[internal_name] = self
+            self.owner.inventory.add(self)
+            self.ownership.give(self, self.owner)
 
         if self.location:
-            self.location.items.append(self)
-
-    def take(self, taker) -> None:
+            self.location.items.add(self)
+            self.ownership.place(self, self.location)
+
+    @property
+    def look_description(self) -> str:
+        """The line describing the item where it lies."""
+        return text(self.strings, self._look_description)
+
+    @property
+    def long_description(self) -> str:
+        """The description of the item on close inspection."""
+        return text(self.strings, self._long_description)
+
+    @property
+    def take_description(self) -> str:
+        """The line printed on taking the item, or None if it cannot be taken."""
+        return text(self.strings, self._take_description)
+
+    @property
+    def use_description(self) -> list[str]:
+        """The lines printed on using the item, and on using it again."""
+        return [text(self.strings, line) for line in self._use_description]
+
+    def take(self, taker) -> bool:
         """Take an item from the world and give it to the actor
         taking it.
 
@@ -50,17 +84,21 @@ class NVItem:
             taker: the actor taking the item
 
         Returns:
-            Nothing.
+            True if the item was taken, False if it cannot be.
 
         See Also:
-            NVActor.take_item"""
+            NVActor.add_item"""
         if not self.take_description:
             nv_print(f"You cannot take the {self.friendly_name}.")
-        else:
-            nv_print(self.take_description)
-            self.owner = taker
-            self.location.items.remove(self)
-            self.location = None
+            return False
+
+        nv_print(self.take_description)
+        if self.location:
+            self.location.items.discard(self)
+        self.owner = taker
+        self.location = None
+        self.ownership.give(self, taker)
+        return True
 
     def drop(self, giver) -> None:
         """Drop an item back into the world, taking it from the
@@ -76,7 +114,8 @@ class NVItem:
             NVActor.drop_item"""
         self.owner = None
         self.location = giver.location
-        self.location.items.append(self)
+        self.location.items.add(self)
+        self.ownership.place(self, self.location)
 
     def __str__(self) -> str:
         return self.internal_name
@@ -174,3 +213,125 @@ class NVSpellbook(NVItem):
             if user.confer_spell(self.spell):
                 return user.drop(self)
         return False
+
+
+class NVItemSet:
+    """
+    An NVItemSet holds the items in a node or an actor's inventory.  Items
+    are kept in the order they were added, and indexed both by internal
+    name and by every noun that names them (their internal name, their
+    friendly name, and their aliases, in any case), so that adding,
+    removing, and finding an item take constant time however many items
+    there are.
+
+    For the sake of code written against inventories as dicts, an item
+    set may also be indexed by internal name like one.
+    """
+
+    __slots__ = ("_items", "_nouns", "on_change")
+
+    def __init__(self, items=(), on_change=None):
+        """Create a new item set.
+
+        Args:
+            items: the items to start with (defaults to none)
+            on_change: a callable taking no arguments, called whenever an
+                item is added or removed thereafter (defaults to none)
+        """
+        self._items = {}
+        self._nouns = {}
+        self.on_change = None
+        for item in items:
+            self.add(item)
+        self.on_change = on_change
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        """Iterates over the items, in the order they were added."""
+        return iter(list(self._items.values()))
+
+    def __contains__(self, item) -> bool:
+        """Returns whether an item, or an item by that internal name, is here."""
+        if isinstance(item, str):
+            return item in self._items
+        return self._items.get(item.internal_name) is item
+
+    def __getitem__(self, name: str) -> NVItem:
+        return self._items[name]
+
+    def __setitem__(self, name: str, item: NVItem) -> None:
+        if name != item.internal_name:
+            raise KeyError(name)
+        self.add(item)
+
+    def __delitem__(self, name: str) -> None:
+        self.remove(self._items[name])
+
+    def __repr__(self) -> str:
+        return f"NVItemSet({list(self._items)!r})"
+
+    def get(self, name: str, default=None):
+        """Returns the item here by the given internal name, or the default."""
+        return self._items.get(name, default)
+
+    def keys(self):
+        """Returns the internal names of the items here."""
+        return self._items.keys()
+
+    def values(self):
+        """Returns the items here."""
+        return self._items.values()
+
+    def add(self, item: NVItem) -> None:
+        """Add an item, if it is not here already."""
+        if item.internal_name in self._items:
+            return
+        self._items[item.internal_name] = item
+        for noun in _nouns_for(item):
+            self._nouns.setdefault(noun, {})[item.internal_name] = item
+        if self.on_change:
+            self.on_change()
+
+    def remove(self, item: NVItem) -> None:
+        """Remove an item.
+
+        Raises:
+            ValueError: if the item is not here
+        """
+        if item not in self:
+            raise ValueError(f"{item} is not here")
+        del self._items[item.internal_name]
+        for noun in _nouns_for(item):
+            named = self._nouns[noun]
+            del named[item.internal_name]
+            if not named:
+                del self._nouns[noun]
+        if self.on_change:
+            self.on_change()
+
+    def discard(self, item: NVItem) -> None:
+        """Remove an item, if it is here."""
+        if item in self:
+            self.remove(item)
+
+    def find(self, noun: str) -> list[NVItem]:
+        """Returns the items here that the given noun names, in the order
+        they were added."""
+        return list(self._nouns.get(noun.lower(), {}).values())
+
+    def resolve(self, noun: str):
+        """Returns the one item here named by the given noun, or None if
+        there is no such item or the noun is ambiguous."""
+        found = self._nouns.get(noun.lower(), {})
+        if len(found) != 1:
+            return None
+        return next(iter(found.values()))
+
+
+def _nouns_for(item: NVItem) -> set[str]:
+    """Returns every noun by which an item may be named, in lowercase."""
+    nouns = {item.internal_name.lower(), item.friendly_name.lower()}
+    nouns.update(alias.lower() for alias in item.aliases)
+    return nouns
@@ -0,0 +1,101 @@
+"""Ownership module for Nuventure, a poor man's implementation of ScummVM.
+
+Every item in the world is either lying in a node or held by an actor.
+The item and its holder each know this, but answering "where is this
+item?" or "what do all the merchants hold?" from that alone means going
+over every actor and node.  NVOwnershipIndex keeps the reverse index:
+each item's holder, and the items held by each kind of actor.  Items
+report every change of hands to it as they are taken and dropped.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+from typing import Iterable
+
+
+class NVOwnershipIndex:
+    """
+    NVOwnershipIndex maps each item onto the node or actor holding it,
+    and each kind of actor (e.g. "merchant") onto the items that actors
+    of that kind hold.
+    """
+
+    def __init__(self):
+        """Create a new, empty index."""
+        self.holders = {}
+        self.by_kind = {}
+
+    def __len__(self) -> int:
+        """Returns the number of items in the index."""
+        return len(self.holders)
+
+    def place(self, item, node) -> None:
+        """Record that an item is lying in a node.
+
+        Args:
+            item: the item
+            node: the node it lies in
+        """
+        self.release(item)
+        self.holders[item.internal_name] = node
+
+    def give(self, item, actor) -> None:
+        """Record that an item is held by an actor.
+
+        Args:
+            item: the item
+            actor: the actor holding it
+        """
+        self.release(item)
+        self.holders[item.internal_name] = actor
+        self.by_kind.setdefault(actor.kind, {})[item.internal_name] = item
+
+    def release(self, item) -> None:
+        """Record that an item is nowhere, e.g. before it changes hands."""
+        holder = self.holders.pop(item.internal_name, None)
+        kind = getattr(holder, "kind", None)
+        if kind is not None:
+            held = self.by_kind[kind]
+            del held[item.internal_name]
+            if not held:
+                del self.by_kind[kind]
+
+    def holder(self, name: str):
+        """Returns the node or actor holding the item by the given internal
+        name, or None if it is nowhere."""
+        return self.holders.get(name)
+
+    def location(self, name: str):
+        """Returns the node where the item by the given internal name is,
+        whether lying there or held by an actor standing there, or None if
+        it is nowhere."""
+        holder = self.holders.get(name)
+        if holder is None:
+            return None
+        return getattr(holder, "location", holder)
+
+    def held_by_kind(self, kind: str) -> list:
+        """Returns the items held by actors of the given kind."""
+        return list(self.by_kind.get(kind, {}).values())
+
+    def items_in(self, nodes: Iterable, carried_p: bool = False) -> list:
+        """Returns the items lying in any of the given nodes.
+
+        Args:
+            nodes: the nodes making up a region of the map
+            carried_p: whether to include the items held by the actors
+                standing in those nodes (defaults to False)
+        """
+        found = []
+        for node in nodes:
+            found.extend(node.items)
+            if carried_p:
+                for actor in node.occupants:
+                    found.extend(actor.inventory)
+        return found
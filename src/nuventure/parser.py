@@ -1,7 +1,9 @@
 """Parser module for Nuventure, a poor man's implementation of ScummVM.
 
-NVParser requires the NLTK library for parsing input text.  It is also in
-dire need of proper documentation.
+NVParser resolves commands with the grammar in nuventure.grammar, which is
+compiled from the verb table and the world's vocabulary.  The NLTK library
+is only needed when the parser is run in its NLTK fallback mode.  It is also
+in dire need of proper documentation.
 
 https://github.com/tnwae/nuventure
 
@@ -12,23 +14,22 @@ Nuventure is licensed under the terms of the MIT License, furnished
 in the LICENSE file at the root directory of this distribution.
 """
 
-import sys
 import json
-from typing import Callable, Tuple, Union
+from collections import OrderedDict
+from typing import Callable, Collection, Iterable, Mapping, Tuple, Union
 
-from functools import cmp_to_key
-from thefuzz import fuzz
-from nltk import ne_chunk, pos_tag, word_tokenize
-
-from . import ERROR_STR, nv_print
+from . import ERROR_STR, nv_output, nv_print
 from .errors import (
     NVBadArgError,
     NVNoArgError,
     NVBadTargetError,
     NVGameStateError,
     NVParseError,
+    NVGameExit,
 )
+from .grammar import NVGrammar
 from .item import NVLamp
+from .suggest import NVSuggestionIndex
 
 VERB_PREFIX = "do_"
 
@@ -95,6 +96,13 @@ ALL_TARGETED_VERBS = (
     TARGET_ACTIONS_IMPL_FIRST | TARGET_ACTIONS_NO_IMPL | TARGET_ACTIONS_TARGET_FIRST
 )
 
+"""How alike a noun must be to the word typed to be suggested in its stead."""
+NOUN_SUGGESTION_CUTOFF = 60
+
+"""The index of verbs suggested when the player types an unknown verb; the
+cheat codes are left out so as not to give them away."""
+_VERB_INDEX = NVSuggestionIndex(sorted(ALL_VERBS - CHEAT_ACTIONS))
+
 
 def _get_callback(verb: str, cbk_name: str) -> Callable:
     """
@@ -116,16 +124,93 @@ def _get_callback(verb: str, cbk_name: str) -> Callable:
     return cbk
 
 
+def _compile_frames(verbs: Iterable[str]) -> dict[str, dict[int, Tuple[str, ...]]]:
+    """
+    Compile the argument frames of each verb for the grammar.  A frame maps
+    the number of nouns given to a verb onto the roles those nouns play.
+
+    Args:
+        verbs: the verbs to compile frames for
+
+    Returns:
+        A mapping of each verb onto its frames.
+    """
+    frames = {}
+    for verb in verbs:
+        frame = {}
+        if verb in TARGET_ACTIONS_IMPL_FIRST:
+            frame[2] = ("implement", "target")
+        elif verb in TARGET_ACTIONS_TARGET_FIRST:
+            frame[2] = ("target", "implement")
+        if verb in TARGET_ACTIONS_NO_IMPL:
+            frame[1] = ("target",)
+        if verb not in ALL_TARGETED_VERBS:
+            frame[0] = ()
+        frames[verb] = frame
+    return frames
+
+
+def _nltk_chunk(input_string: str) -> Tuple[Union[str, None], list[str]]:
+    """
+    Pick the verb and the nouns out of a command using NLTK.  This is the
+    fallback to the grammar, and requires NLTK and its corpora.
+
+    Args:
+        input_string: the command as typed, starting with the verb
+
+    Returns:
+        A tuple of the verb (None if NLTK could not find one) and the
+        nouns in the order they appear.
+    """
+    # pylint: disable=import-outside-toplevel
+    from nltk import ne_chunk, pos_tag, word_tokenize
+
+    verb = None
+    noun_candidates = []
+
+    # Make it a (mostly) valid English sentence, then break it into tagged
+    # entities, which we will use to extract the relevant parts.
+    entities = ne_chunk(pos_tag(word_tokenize("I " + input_string)))
+
+    # Each entity in the input sentence is tagged by what it is.
+    # These are just tuples contained within a list.
+    #
+    # Verbs are the heads of verb phrases, hence they are marked
+    # by VBP.  We will later attempt to retrieve the relevant verb
+    # from the parser's verb table, but for now it suffices just
+    # to pick it from the input text.
+    #
+    # There are potentially multiple nouns in an input sentence,
+    # and we select them from the entity list by looking at the
+    # tag which they have been given: NN, JJ, or NNS.
+    #
+    # Note for future reference:
+    # Proper names of people are handled differently and are
+    # tagged with the tuple `(PERSON, PersonName/NNP)`; as such,
+    # they need special handling when the speak, steal, buy, and
+    # and sell actions are implemented.
+    for i in entities:
+        if i[1] in {"VBP", "VBD"}:
+            verb = i[0]
+        elif i[1] in {"NN", "JJ", "NNS"}:
+            noun_candidates.append(i[0])
+
+    return verb, noun_candidates
+
+
 class NVVerb:
     """
     NVVerb is the class for actions invoked by the parsing engine.
 
-    Verbs represent permissible actions in the Nuventure engine.  A
-    given NVVerb is bound to the actor that invokes it, the world object
-    in which it is invoked, and the item and target, if needed; they are
-    set to None otherwise before NVVerb.invoke is called.
+    Verbs represent permissible actions in the Nuventure engine.  Verbs
+    are immutable once created, so the parser's verb table may be shared
+    freely between the player, the NPCs, and any number of threads; each
+    command binds its verb to an actor and arguments with NVVerb.bind,
+    which returns a new NVInvocation.
     """
 
+    __slots__ = ("name", "callback", "help_text", "errortext")
+
     def __init__(
         self,
         name: str,
@@ -134,18 +219,37 @@ class NVVerb:
         errortext: str,
     ):
         """Creates a new verb object."""
-        self.name = name
-        self.invoker = None
-        self.bound_item = None
-        self.target = None
-        self.callback = callback
-        self.help_text = help_text
-        self.errortext = errortext
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "callback", callback)
+        object.__setattr__(self, "help_text", help_text)
+        object.__setattr__(self, "errortext", errortext)
 
-    def invoke(self) -> Callable:
-        """Invokes the verb's bound callback.  The callback is selected and
-        bound by the parsing routine."""
-        return self.callback(self)
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot set {name}: verbs are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete {name}: verbs are immutable")
+
+    def __reduce__(self):
+        return (NVVerb, (self.name, self.callback, self.help_text, self.errortext))
+
+    def bind(
+        self,
+        target: Union[str, None] = None,
+        implement: Union[str, None] = None,
+        invoker=None,
+    ) -> "NVInvocation":
+        """Binds the verb to the given arguments for a single command.
+
+        Args:
+            target: the verb's target, if it takes one
+            implement: the verb's implement, if it takes one
+            invoker: the actor invoking the verb, if known yet
+
+        Returns:
+            A new NVInvocation of this verb.
+        """
+        return NVInvocation(self, invoker, target, implement)
 
     def help(self, verbose=False) -> None:
         """Prints the verb's help text, if present."""
@@ -158,48 +262,69 @@ class NVVerb:
                 raise NotImplementedError("verbose help is not yet implemented")
 
 
-def _compare_candidate_match(c1: Tuple[int, str], c2: Tuple[int, str]) -> int:
-    return c1[0] - c2[0]
+class NVInvocation:
+    """
+    An NVInvocation is a single use of a verb: the verb, the actor that
+    invokes it, and the target and item (the "bound item") it acts on,
+    which are None when not needed.  Callbacks receive the invocation.
+    """
+
+    __slots__ = ("verb", "invoker", "target", "bound_item")
+
+    def __init__(self, verb: NVVerb, invoker=None, target=None, bound_item=None):
+        """Creates a new invocation of a verb."""
+        self.verb = verb
+        self.invoker = invoker
+        self.target = target
+        self.bound_item = bound_item
 
+    @property
+    def name(self) -> str:
+        """Returns the name of the invoked verb."""
+        return self.verb.name
+
+    def invoke(self) -> Callable:
+        """Invokes the verb's callback on this invocation."""
+        return self.verb.callback(self)
 
-def _dwim(user_input: str) -> list[str]:
+
+def _dwim(user_input: str, index: Union[NVSuggestionIndex, None] = None) -> list[str]:
     """
     Ascertain potentially meant verbs from erroneous user input.
 
     Args:
         user_input [str]: the user's input string
+        index: the index of verbs to suggest from (defaults to all verbs
+            but the cheat codes)
 
     Returns:
         A list of the top three candidates matching the input string.
     """
-    command_candidates = []
-
-    # Check the match ratio between our input and each potential match.
-    # Then, add that to a list of candidates as a tuple with the ratio
-    # first and the potential match second.
-    #
-    # I believe that TheFuzz uses the Levenshtein distance for this
-    # but I am not certain without checking the documentation.
-    for verb in ALL_VERBS:
-        if verb in CHEAT_ACTIONS:
-            continue
-        ratio = fuzz.ratio(user_input, verb)
-        command_candidates.append((ratio, verb))
-
-    # Reverse-sort the candidates list to get a list of the matches
-    # from best to worst.
-    dwim = sorted(command_candidates, key=cmp_to_key(_compare_candidate_match), reverse=True)
-    candidates = [candidate[1] for candidate in dwim[:3]]
+    # The index scores the verbs sharing the most letter pairs with the
+    # input using TheFuzz's ratio, which is based on the Levenshtein
+    # distance, and keeps the best three.
+    candidates = (index or _VERB_INDEX).suggest(user_input, 3)
+    if not candidates:
+        nv_print(f'I don\'t understand "{user_input}".')
+        return candidates
 
     # Now print just the top three such matches.
     nv_print(f'I don\'t understand "{user_input}"; did you mean:')
 
     for candidate in candidates:
-        print(f"    {candidate}")
+        print(f"    {candidate}", file=nv_output())
 
     return candidates
 
 
+def _check_player(actor) -> None:
+    """Raise RuntimeError unless the actor is the player character."""
+    if actor.internal_name != "PLAYER":
+        raise RuntimeError(
+            "Non-player characters should not invoke interactive commands"
+        )
+
+
 class NVParser:
     """
     NVParser is responsible for handling input from the user and converting
@@ -208,13 +333,47 @@ class NVParser:
     game runner script.
     """
 
-    def __init__(self, verb_table: str = "../data/verbs.json"):
-        """Create a new parser object and load the verbs from memory."""
+    def __init__(
+        self,
+        verb_table: str = "../data/verbs.json",
+        vocabulary: Union[Mapping[str, str], None] = None,
+        use_nltk: bool = False,
+        cache_size: int = 256,
+    ):
+        """Create a new parser object and load the verbs from memory.
+
+        Args:
+            verb_table: path to the verb table JSON file
+            vocabulary: a mapping of the nouns the player may use onto the
+                internal names of the things they denote (see
+                NVWorld.vocabulary)
+            use_nltk: whether to fall back to NLTK for complex commands
+                instead of the grammar (defaults to False)
+            cache_size: the number of distinct commands whose parses are
+                remembered (defaults to 256; 0 disables the cache)
+        """
         self.verbs = {}
-        self.last_command = ""
+        self.use_nltk = use_nltk
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.grammar = None
+        self.nouns = None
+        self._vocabulary = dict(vocabulary or {})
+        self.load_verbs(verb_table)
+
+    def load_verbs(self, verb_table: str) -> None:
+        """Load the verb table, replacing any verbs loaded before, and
+        recompile the grammar.
+
+        Args:
+            verb_table: path to the verb table JSON file
+        """
         with open(verb_table, "r") as fh:
             db = json.load(fh)
 
+        self.verbs = {}
         for verb, rest in db.items():
             # special case: `help` is handled elsewhere
             if verb == "help":
@@ -231,7 +390,51 @@ class NVParser:
             else:
                 self.verbs[verb] = NVVerb(verb, callback, help_text, error_text)
 
-    def read_command(self, actor) -> NVVerb:
+        self._compile()
+
+    def set_vocabulary(self, vocabulary: Mapping[str, str]) -> None:
+        """Replace the nouns known to the grammar, e.g. after the world's
+        items or NPCs have changed.
+
+        Args:
+            vocabulary: a mapping of nouns onto internal names (see
+                NVWorld.vocabulary)
+        """
+        self._vocabulary = dict(vocabulary)
+        self._compile()
+
+    def invalidate_cache(self) -> None:
+        """Forget every cached parse.  This must be called whenever the
+        verb table or the vocabulary changes; NVParser.load_verbs and
+        NVParser.set_vocabulary do so themselves."""
+        self.cache.clear()
+
+    def suggest_nouns(
+        self, word: str, scope: Union[Collection[str], None] = None, limit: int = 3
+    ) -> list[str]:
+        """Propose nouns the player may have meant by an unrecognized word.
+
+        Args:
+            word: the word the player typed
+            scope: if given, only nouns denoting these internal names are
+                proposed (see NVActor.in_scope)
+            limit: the most nouns to propose (defaults to 3)
+
+        Returns:
+            Up to `limit` nouns, best first, each denoting a different thing.
+        """
+        return self.nouns.suggest(word, limit, scope, NOUN_SUGGESTION_CUTOFF)
+
+    def _compile(self) -> None:
+        """Compile the grammar and noun index from the verb table and the
+        vocabulary."""
+        self.grammar = NVGrammar(
+            _compile_frames(ALL_VERBS & self.verbs.keys()), self._vocabulary
+        )
+        self.nouns = NVSuggestionIndex(self._vocabulary)
+        self.invalidate_cache()
+
+    def read_command(self, actor) -> Union[NVInvocation, None]:
         """Read a command from an actor.  The actor must be the player
         character.  If not, this command will raise an exception.
 
@@ -239,84 +442,220 @@ class NVParser:
             actor: the actor on whose behalf we are executing a command
                 (must be an NVActor instance)
 
-        Returns: The NVVerb object corresponding to the entered command if
+        Returns: The NVInvocation corresponding to the entered command if
             the parse was successful, None otherwise.
 
+        Raises:
+            RuntimeError: if an NPC is passed as the invoking actor
+        """
+        return self.parse_command(actor, self.read_input(actor))
+
+    def read_input(self, actor) -> str:
+        """Read a line of input on behalf of an actor without parsing it.
+        The actor must be the player character.
+
+        Args:
+            actor: the actor on whose behalf we are reading a command
+                (must be an NVActor instance)
+
+        Returns: The line as typed.
+
         Raises:
             RuntimeError: if an NPC is passed as the invoking actor
         """
         tmp = ""
 
-        if actor.internal_name != "PLAYER":
-            raise RuntimeError(
-                "Non-player characters should not invoke interactive commands"
-            )
+        _check_player(actor)
 
         try:
             tmp = input("> ")
         except (EOFError, KeyboardInterrupt):
-            do_quit()
-        else:
-            self.last_command = tmp
+            do_quit(None)
+
+        return tmp
+
+    def parse_command(self, actor, command: str) -> Union[NVInvocation, None]:
+        """Parse a command that was read on behalf of an actor by some
+        other means than NVParser.read_command, e.g. from a network
+        connection.  The actor must be the player character.
+
+        Args:
+            actor: the actor on whose behalf we are executing a command
+                (must be an NVActor instance)
+            command: the command as typed
+
+        Returns: The NVInvocation corresponding to the command if the parse
+            was successful, None otherwise.
+
+        Raises:
+            RuntimeError: if an NPC is passed as the invoking actor
+        """
+        return self.parse(actor, command)[0]
+
+    def parse(self, actor, command: str) -> Tuple[Union[NVInvocation, None], str]:
+        """Parse a command on behalf of an actor as NVParser.parse_command
+        does, also telling what became of it.  Nothing about the command
+        is kept in the parser, so sessions may share it.
+
+        Args:
+            actor: the actor on whose behalf we are executing a command
+                (must be an NVActor instance)
+            command: the command as typed
+
+        Returns: A tuple of the NVInvocation corresponding to the command,
+            or None if the parse was unsuccessful, and the kind of outcome:
+            "verb" if it parsed, "help", "empty", or, if it was given the
+            wrong number of arguments (which the parser has already
+            complained of), "noargs" or "toomanyargs".
+
+        Raises:
+            RuntimeError: if an NPC is passed as the invoking actor
+            NVParseError: if the verb is unknown
+            NotImplementedError: if the verb has no callback yet
+        """
+        _check_player(actor)
 
-        action = self.do_parse(tmp)
-        if action is NVVerb:
+        outcome = self.resolve(command)
+        action = self._replay_outcome(outcome)
+        if isinstance(action, NVInvocation):
             action.invoker = actor
         else:
             action = None
 
-        return action
+        if outcome[0] == "error":
+            return action, outcome[2]
+        return action, outcome[0]
 
-    def do_parse(self, input_string: str) -> Union[NVVerb, None]:
+    def do_parse(self, input_string: str) -> Union[NVInvocation, None]:
         """
-        Execute the actual parsing of the command string.  This method
-        checks for some simple edge cases before invoking the real parsing
-        method if needed.
+        Execute the actual parsing of the command string.  The outcome of
+        parsing a command is cached, so that a command seen recently is
+        not parsed again; either way, a fresh NVInvocation is returned.
+
+        The cache tolerates being used from several threads at once without
+        a lock: at worst, two threads parse the same command twice.
 
         Args:
             input_string: the input read by NVParser.read_command
 
         Returns:
-            An NVVerb object describing the parsed command; None if the
+            An NVInvocation describing the parsed command; None if the
             command is not found or is invalid.
         """
-        if not input_string:
-            return None
+        return self._replay_outcome(self.resolve(input_string))
+
+    def resolve(self, input_string: str) -> tuple:
+        """
+        Find out what a command means without acting on it, from the cache
+        if possible.
+
+        Args:
+            input_string: the command as typed
+
+        Returns:
+            A tuple as returned by NVParser._parse_outcome, or ("empty", "")
+            if the command is blank.
+        """
+        # Commands differing only in case or spacing parse the same way.
+        command = " ".join((input_string or "").lower().split())
+        if not command:
+            return ("empty", "")
+
+        outcome = self.cache.get(command)
+        if outcome is None:
+            self.cache_misses += 1
+            outcome = self._parse_outcome(command)
+            if outcome[0] != "help" and self.cache_size > 0:
+                self.cache[command] = outcome
+                try:
+                    while len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+                except KeyError:
+                    pass
+        else:
+            self.cache_hits += 1
+            try:
+                self.cache.move_to_end(command)
+            except KeyError:
+                # another thread evicted it in the meantime
+                pass
+
+        return outcome
 
+    def _parse_outcome(self, command: str) -> tuple:
+        """
+        Parse a normalized command without side effects.  This checks for
+        some simple edge cases before invoking the real parsing method if
+        needed.
+
+        Args:
+            command: the lowercased command, with single spaces
+
+        Returns:
+            A tuple whose first element says what became of the command:
+            ("verb", name, target, implement) if it parsed, ("error", name,
+            key) if it was given the wrong number of arguments, where key
+            is "noargs" or "toomanyargs", ("unknown", word) if the verb is
+            unknown, ("unimplemented", name) if the verb has no callback,
+            or ("help", command) for the help command.
+        """
         # Verify that the user's input even contains a valid verb before
-        # proceeding.  Use fuzzy matching to propose potential matches if
-        # an invalid input is given, but just return None if there is no
-        # input at all.
-        input_string = input_string.lower()
-        tokens = input_string.split()
-        if not tokens:
-            return None
-        elif not tokens[0] in ALL_VERBS:
-            _dwim(tokens[0])
-            raise NVParseError(tokens[0])
+        # proceeding.  Fuzzy matching proposes potential matches when the
+        # outcome is replayed.
+        tokens = command.split()
+        if not tokens[0] in ALL_VERBS:
+            return ("unknown", tokens[0])
 
         # The "help" bareword is a special case since it does not need to
         # invoke a callback.  The "help" bareword is the "fifth type" of
         # verb in Nuventure.
         if tokens[0] == "help":
-            return self.do_help(input_string)
+            return ("help", command)
+
+        if tokens[0] not in self.verbs:
+            return ("unimplemented", tokens[0])
 
         # Simple actions require no arguments.  These are considered to be
         # the "fourth type" of verbs in Nuventure.  The compass directions
         # are a special case of this, since they all invoke the "move" method,
         # with the name of the direction as its "target;" because of this
         # special handling, they are the "sixth type" of verbs in Nuventure.
-        if input_string in SIMPLE_ACTIONS:
-            return self.verbs[input_string]
-        elif input_string in DIRECTIONS:
-            verb = self.verbs[tokens[0]]
-            verb.target = tokens[0]
-            return verb
-
-        # Make it a (mostly) valid English sentence and then hand it over to
-        # the real parser.
-        input_string = "I " + input_string
-        return self.do_hard_parse(input_string)
+        if command in SIMPLE_ACTIONS:
+            return ("verb", command, None, None)
+        elif command in DIRECTIONS:
+            return ("verb", command, command, None)
+
+        # Hand it over to the real parser.
+        return self._hard_parse_outcome(command)
+
+    def _replay_outcome(self, outcome: tuple) -> Union[NVInvocation, None]:
+        """
+        Act on the outcome of a parse: bind the verb, or report the error.
+
+        Args:
+            outcome: a tuple as returned by NVParser._parse_outcome
+
+        Returns:
+            A fresh NVInvocation of the command's verb, or None.
+
+        Raises:
+            NVParseError: if the verb is unknown
+            NotImplementedError: if the verb has no callback yet
+        """
+        kind = outcome[0]
+        if kind == "empty":
+            return None
+        if kind == "verb":
+            return self.verbs[outcome[1]].bind(outcome[2], outcome[3])
+        if kind == "error":
+            self.error(outcome[1], outcome[2])
+            return None
+        if kind == "unknown":
+            _dwim(outcome[1])
+            raise NVParseError(outcome[1])
+        if kind == "help":
+            return self.do_help(outcome[1])
+        raise NotImplementedError(outcome[1])
 
     def do_help(self, input_string: str) -> None:
         """
@@ -344,110 +683,66 @@ class NVParser:
             for verb in self.verbs.values():
                 verb.help()
 
-    def do_hard_parse(self, input_string: str) -> Union[NVVerb, None]:
+    def do_hard_parse(self, input_string: str) -> Union[NVInvocation, None]:
         """
         Invokes the "real" parsing routine for more complex commands.
-        This uses NLTK to create a parse tree from the user's input.
+        This resolves the verb and its arguments with the parser's grammar,
+        or with NLTK if the parser is in its fallback mode.  Unlike
+        NVParser.do_parse, this never consults the cache.
+
+        Verbs of the fourth, fifth, and sixth types are handled in
+        NVParser.do_parse, as they do not require any arguments.
 
         Args:
             input_string: The user's input string as typed.
 
         Returns:
-            The `NVVerb` object corresponding to the player's input if
+            The `NVInvocation` corresponding to the player's input if
             it exists and the input is valid, None otherwise.
+
+        Raises:
+            NotImplementedError: if the verb has no callback yet
+        """
+        return self._replay_outcome(self._hard_parse_outcome(input_string))
+
+    def _hard_parse_outcome(self, input_string: str) -> tuple:
         """
-        verb = None
-        target = None
-        implement = None
-        noun_candidates = []
-
-        # Break the input string into tagged entities, which we will use
-        # to extract the relevant parts.
-        entities = ne_chunk(pos_tag(word_tokenize(input_string)))
-
-        # Each entity in the input sentence is tagged by what it is.
-        # These are just tuples contained within a list.
-        #
-        # Verbs are the heads of verb phrases, hence they are marked
-        # by VBP.  We will later attempt to retrieve the relevant verb
-        # from the parser's verb table, but for now it suffices just
-        # to pick it from the input text.
-        #
-        # There are potentially multiple nouns in an input sentence,
-        # and we select them from the entity list by looking at the
-        # tag which they have been given: NN, JJ, or NNS.
-        #
-        # Note for future reference:
-        # Proper names of people are handled differently and are
-        # tagged with the tuple `(PERSON, PersonName/NNP)`; as such,
-        # they need special handling when the speak, steal, buy, and
-        # and sell actions are implemented.
-        for i in entities:
-            if i[1] in {"VBP", "VBD"}:
-                verb = i[0]
-            elif i[1] in {"NN", "JJ", "NNS"}:
-                noun_candidates.append(i[0])
-
-        # There are two types of commands that accept two arguments:
-        # those that accept the target first (the "first type"), and
-        # those that accept the "implement" (an item or spell) first
-        # (the "second type").  Here we determine which applies.
-        #
-        # In linguistic terms this is the position of the direct and
-        # indirect (if present) objects within the input sentence, and
-        # which word is which.
-        #
-        # If there is only one argument to a given verb, then we assume
-        # it to be the target.  This is the third type of verb in the
-        # Nuventure engine.  Verbs of the fourth, fifth, and sixth types
-        # are handled in NVParser.do_parse, as they do not require NLTK
-        # to aid in parsing.
-        #
-        # An example of the first type is "unlock the door with the key".
-        # An example of the second type is "cast fire on the goblin".
-        # An example of the third type is "extinguish the lamp".
-        #
-        # If parsing the argument list fails, error and return None.
+        Resolve a complex command without side effects.
+
+        Args:
+            input_string: The user's input string as typed.
+
+        Returns:
+            A tuple as returned by NVParser._parse_outcome.
+        """
+        # If parsing the argument list fails, the outcome is an error.
         # There are three possible error states: if an argument is
         # required but none is supplied (or too many are supplied);
         # if one argument is given but two are required; and if too
         # many arguments are given to a verb that only requires one.
-        if len(noun_candidates) == 2:
-            if verb in TARGET_ACTIONS_IMPL_FIRST:
-                implement = noun_candidates[0]
-                target = noun_candidates[1]
-            elif verb in TARGET_ACTIONS_TARGET_FIRST:
-                implement = noun_candidates[1]
-                target = noun_candidates[0]
-            else:
-                self.error(verb)
-                return None
-        elif len(noun_candidates) == 1:
-            if verb in TARGET_ACTIONS_NO_IMPL:
-                target = noun_candidates[0]
+        try:
+            if self.use_nltk:
+                verb, target, implement = self.grammar.bind(*_nltk_chunk(input_string))
             else:
-                self.error(verb)
-                return None
-        else:
-            if verb in ALL_TARGETED_VERBS:
-                self.error(verb)
-                return None
-
-        # Once the type of verb and arguments have been determined,
-        # pull the appropriate verb and set its target and bound item
-        # appropriately, then return it to the caller for invocation.
-        retval = self.verbs[verb]
-        retval.target = target
-        retval.bound_item = implement
-        return retval
-
-    def error(self, whoopsie: str) -> None:
+                verb, target, implement = self.grammar.parse(input_string)
+        except NVParseError as ex:
+            return ("error", ex.what, ex.et_key or "noargs")
+        except NotImplementedError as ex:
+            return ("unimplemented", ex.args[0])
+
+        # Once the type of verb and arguments have been determined, the
+        # appropriate verb is bound to them when the outcome is replayed.
+        return ("verb", verb, target, implement)
+
+    def error(self, whoopsie: str, which: str = "noargs") -> None:
         """
-        Print an error message if parsing generates an error.
+        Print an error message if parsing generates an error.  Verbs
+        given too few arguments print their "noargs" text, and verbs
+        given too many their "toomanyargs" text.
         """
         verb = self.verbs.get(whoopsie, None)
-        if verb:
-            nv_print(verb.errortext)
+        if verb and verb.errortext:
+            nv_print(verb.errortext.get(which, ERROR_STR))
         else:
             nv_print(ERROR_STR)
 
@@ -467,7 +762,7 @@ class NVParser:
             nv_print(ERROR_STR)
 
 
-def do_move(verb: NVVerb) -> bool:
+def do_move(verb: NVInvocation) -> bool:
     """Attempt to move the given character in the specified direction."""
     try:
         return verb.invoker.move(verb.target)
@@ -475,58 +770,52 @@ def do_move(verb: NVVerb) -> bool:
         raise NVBadArgError("move", verb.target) from ex
 
 
-def do_look(verb: NVVerb) -> bool:
+def do_look(verb: NVInvocation) -> bool:
     """Print a description of the cell where the player is."""
     print_state = False
     if verb.invoker.location.wanted_state == "lamp_lit":
         lamp = verb.invoker.inventory.get("lamp")
-        if lamp is NVLamp and lamp.is_lit():
+        if isinstance(lamp, NVLamp) and lamp.is_lit():
             print_state = True
     verb.invoker.location.render(long_p=True, stateful_p=print_state)
     return True
 
 
-def do_inspect(verb: NVVerb) -> bool:
+def do_inspect(verb: NVInvocation) -> bool:
     """Inspect an item in the same cell as the player."""
-    here = verb.invoker.location
-    target_itm = verb.invoker.bound_world.items[verb.target]
-    if target_itm in here.items:
-        target_itm.render()
-        return True
-    raise NVBadArgError("inspect", verb.target)
+    items = verb.invoker.location.items
+    target_itm = items.get(verb.target) or items.resolve(verb.target)
+    if target_itm is None:
+        raise NVBadArgError("inspect", verb.target)
+    target_itm.render()
+    return True
 
 
-def do_take(verb: NVVerb) -> bool:
+def do_take(verb: NVInvocation) -> bool:
     """
     Take an item from the scene and put it in the player's inventory,
     if it exists in the same cell as the player.
     """
-    here = verb.invoker.location
-    try:
-        target_itm = verb.invoker.bound_world.items.get(verb.target, None)
-        assert target_itm.location == here
-    except (AssertionError, AttributeError) as ex:
-        raise NVBadArgError("take", verb.target) from ex
-    except KeyError as ex:
-        raise NVBadTargetError("take", verb.target) from ex
-    else:
-        return verb.invoker.add_item(target_itm)
+    items = verb.invoker.location.items
+    target_itm = items.get(verb.target) or items.resolve(verb.target)
+    if target_itm is None:
+        raise NVBadArgError("take", verb.target)
+    return verb.invoker.add_item(target_itm)
 
 
-def do_drop(verb: NVVerb) -> bool:
+def do_drop(verb: NVInvocation) -> bool:
     """
     Take an item from the player's inventory and place it in the cell
     where the player is.
     """
-    try:
-        target_itm = verb.invoker.inventory[verb.target]
-    except KeyError as ex:
-        raise NVBadArgError("drop", verb.target) from ex
-    else:
-        return verb.invoker.drop_item(target_itm)
+    inventory = verb.invoker.inventory
+    target_itm = inventory.get(verb.target) or inventory.resolve(verb.target)
+    if target_itm is None:
+        raise NVBadArgError("drop", verb.target)
+    return verb.invoker.drop_item(target_itm)
 
 
-def do_inventory(verb: NVVerb) -> bool:
+def do_inventory(verb: NVInvocation) -> bool:
     """
     Show the player's inventory, if there is anything in it.
     """
@@ -539,13 +828,13 @@ def do_inventory(verb: NVVerb) -> bool:
     raise NVNoArgError("inventory")
 
 
-def do_light(verb: NVVerb) -> bool:
+def do_light(verb: NVInvocation) -> bool:
     """
     Light the player's lamp, if the player has it and it is not lit.
     """
     try:
         lamp = verb.invoker.inventory[verb.target]
-        assert lamp is NVLamp
+        assert isinstance(lamp, NVLamp)
     except AssertionError as ex:
         raise NVBadArgError("light", verb.target) from ex
     except KeyError as ex:
@@ -558,13 +847,13 @@ def do_light(verb: NVVerb) -> bool:
     return True
 
 
-def do_extinguish(verb: NVVerb) -> bool:
+def do_extinguish(verb: NVInvocation) -> bool:
     """
     Extinguish the player's lamp, if the player has it, and if it is lit.
     """
     try:
         lamp = verb.invoker.inventory[verb.target]
-        assert lamp is NVLamp
+        assert isinstance(lamp, NVLamp)
     except AssertionError as ex:
         raise NVBadArgError("extinguish", verb.target) from ex
     except KeyError as ex:
@@ -577,7 +866,7 @@ def do_extinguish(verb: NVVerb) -> bool:
     return True
 
 
-def do_arkhtos(verb: NVVerb) -> None:
+def do_arkhtos(verb: NVInvocation) -> None:
     """Trigger the game's win condition."""
     world = verb.invoker.bound_world
     if world.nodes["DEST"].visited_p:
@@ -592,7 +881,7 @@ Python programming language, which was used to implement this game.
         raise NVGameStateError("arkhtos")
 
 
-def do_xyzzy(_: NVVerb) -> None:
+def do_xyzzy(_: NVInvocation) -> None:
     """Trigger the game's loss condition."""
     nv_print(
         """Your memory serves you well.
@@ -605,6 +894,6 @@ However, you choose poorly.  Goodbye.
     do_quit(_)
 
 
-def do_quit(_: NVVerb) -> None:
+def do_quit(verb: NVInvocation) -> None:
     """Quit the game."""
-    sys.exit(0)
+    raise NVGameExit(verb)
@@ -0,0 +1,323 @@
+"""Pathfinding module for Nuventure, a poor man's implementation of ScummVM.
+
+NVPathfinder finds shortest routes over a world's NVWorldGraph, counting
+each link as one step.  How it does so depends on the size of the world:
+
+- In a small world, a route field is kept for each destination asked
+  about: a breadth-first search backward from the destination gives, for
+  every node, the link to take toward it.  Every route to a destination
+  then costs one lookup per step, and precompute() fills in the fields of
+  every destination at once, which amounts to an all-pairs table.
+- In a large world, where a field per destination would not fit, routes
+  are found by A* guided by landmarks (the ALT algorithm): the distances
+  to and from a few nodes far apart bound the distance between any two
+  nodes from below.  The next step of each route found is remembered for
+  every node along it, so an NPC following a route searches only once.
+
+Everything derived from the links is thrown away when they change, as
+told by the graph's version.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import heapq
+from array import array
+from typing import Union
+
+from nuventure.graph import NVDirection, NVWorldGraph
+
+"""The largest world, in nodes, for which route fields are kept."""
+ALL_PAIRS_LIMIT = 2048
+
+"""The number of landmarks chosen for A* in a large world."""
+LANDMARKS = 8
+
+"""The most next steps remembered from routes found by A*, after which
+they are forgotten all at once."""
+ROUTE_CACHE_SIZE = 1 << 16
+
+
+class NVPathfinder:
+    """
+    NVPathfinder answers questions of distance and direction between the
+    nodes of a graph, given and returned by number.
+    """
+
+    def __init__(
+        self,
+        graph: NVWorldGraph,
+        all_pairs_limit: int = ALL_PAIRS_LIMIT,
+        landmarks: int = LANDMARKS,
+        cache_size: int = ROUTE_CACHE_SIZE,
+    ):
+        """Create a new pathfinder over a finished graph.
+
+        Args:
+            graph: the graph to find routes over
+            all_pairs_limit: the largest graph, in nodes, for which route
+                fields are kept rather than searching with A*
+            landmarks: the number of landmarks to choose for A*
+            cache_size: the most next steps to remember from A*
+        """
+        self.graph = graph
+        self.all_pairs_limit = all_pairs_limit
+        self.landmark_count = landmarks
+        self.cache_size = cache_size
+        self._version = None
+        self._sources = None
+        self._reverse = None
+        self.fields = {}
+        self.landmarks = None
+        self._hops = {}
+        self._check()
+
+    def _check(self) -> None:
+        """Throw away everything derived from the graph's links, if they
+        have changed since."""
+        if self._version == self.graph.version:
+            return
+        self._version = self.graph.version
+        self._sources = None
+        self._reverse = None
+        self.fields = {}
+        self.landmarks = None
+        self._hops = {}
+
+    def _edge_sources(self) -> array:
+        """Returns the number of the node each link leads out of."""
+        if self._sources is None:
+            offsets = self.graph.offsets
+            self._sources = array("i", [0]) * len(self.graph.targets)
+            for node in range(len(self.graph)):
+                for i in range(offsets[node], offsets[node + 1]):
+                    self._sources[i] = node
+        return self._sources
+
+    def _reverse_links(self) -> tuple[array, array]:
+        """Returns the graph's links grouped by the node they lead to: an
+        array of offsets, and the links into each node laid end to end."""
+        if self._reverse is None:
+            targets = self.graph.targets
+            counts = [0] * (len(self.graph) + 1)
+            for target in targets:
+                counts[target + 1] += 1
+            for node in range(len(self.graph)):
+                counts[node + 1] += counts[node]
+            offsets = array("i", counts)
+            edges = array("i", [0]) * len(targets)
+            fill = list(counts)
+            for i, target in enumerate(targets):
+                edges[fill[target]] = i
+                fill[target] += 1
+            self._reverse = (offsets, edges)
+        return self._reverse
+
+    def distances_from(self, source: int) -> array:
+        """Returns the number of steps from a node to every node, or -1
+        for nodes that cannot be reached from it."""
+        self._check()
+        offsets, targets = self.graph.offsets, self.graph.targets
+        dist = array("i", [-1]) * len(self.graph)
+        dist[source] = 0
+        frontier = [source]
+        steps = 0
+        while frontier:
+            steps += 1
+            reached = []
+            for node in frontier:
+                for i in range(offsets[node], offsets[node + 1]):
+                    target = targets[i]
+                    if dist[target] < 0:
+                        dist[target] = steps
+                        reached.append(target)
+            frontier = reached
+        return dist
+
+    def _search_back(self, dest: int) -> tuple[array, array]:
+        """Search backward from a node, returning the number of steps from
+        every node to it and the link each node takes toward it (-1 for
+        nodes that cannot reach it, and for the node itself)."""
+        offsets, edges = self._reverse_links()
+        sources = self._edge_sources()
+        dist = array("i", [-1]) * len(self.graph)
+        toward = array("i", [-1]) * len(self.graph)
+        dist[dest] = 0
+        frontier = [dest]
+        steps = 0
+        while frontier:
+            steps += 1
+            reached = []
+            for node in frontier:
+                for j in range(offsets[node], offsets[node + 1]):
+                    i = edges[j]
+                    source = sources[i]
+                    if dist[source] < 0:
+                        dist[source] = steps
+                        toward[source] = i
+                        reached.append(source)
+            frontier = reached
+        return dist, toward
+
+    def distances_to(self, dest: int) -> array:
+        """Returns the number of steps from every node to a node, or -1
+        for nodes that cannot reach it."""
+        self._check()
+        return self._search_back(dest)[0]
+
+    def field(self, dest: int) -> array:
+        """Returns the route field of a node: the link each node takes
+        toward it, or -1 for nodes that cannot reach it."""
+        self._check()
+        toward = self.fields.get(dest)
+        if toward is None:
+            toward = self.fields[dest] = self._search_back(dest)[1]
+        return toward
+
+    def precompute(self) -> None:
+        """Fill in the route field of every node, so that no route need
+        ever be searched for."""
+        for dest in range(len(self.graph)):
+            self.field(dest)
+
+    def _choose_landmarks(self) -> list[tuple[array, array]]:
+        """Choose nodes far apart from one another as landmarks, returning
+        the distances from and to each of them."""
+        if self.landmarks is not None:
+            return self.landmarks
+        self.landmarks = []
+        if not len(self.graph):
+            return self.landmarks
+
+        # Each landmark is the node farthest from those chosen so far.
+        nearest = array("i", [-1]) * len(self.graph)
+        landmark = 0
+        for _ in range(min(self.landmark_count, len(self.graph))):
+            dist_from = self.distances_from(landmark)
+            self.landmarks.append((dist_from, self._search_back(landmark)[0]))
+            farthest, landmark = 0, None
+            for node, steps in enumerate(dist_from):
+                if steps >= 0 and (nearest[node] < 0 or steps < nearest[node]):
+                    nearest[node] = steps
+                if nearest[node] > farthest:
+                    farthest, landmark = nearest[node], node
+            if landmark is None:
+                break
+        return self.landmarks
+
+    def _lower_bound(self, node: int, dest: int) -> Union[int, None]:
+        """Returns a lower bound on the steps from one node to another, or
+        None if the landmarks show the destination cannot be reached."""
+        bound = 0
+        for dist_from, dist_to in self.landmarks:
+            # A node reached from a landmark reaches everything the node
+            # reaches; and likewise for nodes reaching the landmark.
+            if dist_from[node] >= 0:
+                if dist_from[dest] < 0:
+                    return None
+                bound = max(bound, dist_from[dest] - dist_from[node])
+            if dist_to[dest] >= 0:
+                if dist_to[node] < 0:
+                    return None
+                bound = max(bound, dist_to[node] - dist_to[dest])
+        return bound
+
+    def _search(self, source: int, dest: int) -> Union[list[int], None]:
+        """Find a shortest route with A*, returning its links in order,
+        or None if there is none."""
+        self._choose_landmarks()
+        offsets, targets = self.graph.offsets, self.graph.targets
+        start = self._lower_bound(source, dest)
+        if start is None:
+            return None
+
+        # Among equally promising nodes, those farthest along are taken
+        # first, which on a map with many shortest routes saves exploring
+        # all of them.
+        steps = {source: 0}
+        via = {source: -1}
+        heap = [(start, 0, source)]
+        while heap:
+            _, taken, node = heapq.heappop(heap)
+            taken = -taken
+            if node == dest:
+                break
+            if taken > steps[node]:
+                continue
+            for i in range(offsets[node], offsets[node + 1]):
+                target = targets[i]
+                if taken + 1 < steps.get(target, taken + 2):
+                    bound = self._lower_bound(target, dest)
+                    if bound is None:
+                        continue
+                    steps[target] = taken + 1
+                    via[target] = i
+                    heapq.heappush(heap, (taken + 1 + bound, -taken - 1, target))
+        else:
+            return None
+
+        sources = self._edge_sources()
+        links = []
+        node = dest
+        while via[node] >= 0:
+            links.append(via[node])
+            node = sources[via[node]]
+        links.reverse()
+        return links
+
+    def next_link(self, source: int, dest: int) -> Union[int, None]:
+        """Returns the index in the edge table of the first link of a
+        shortest route between two nodes, or None if there is no route or
+        the nodes are one and the same."""
+        self._check()
+        if source == dest:
+            return None
+        if len(self.graph) <= self.all_pairs_limit:
+            i = self.field(dest)[source]
+            return i if i >= 0 else None
+
+        i = self._hops.get((source, dest))
+        if i is None:
+            links = self._search(source, dest)
+            if links is None:
+                return None
+            if len(self._hops) + len(links) > self.cache_size:
+                self._hops.clear()
+            sources = self._edge_sources()
+            for link in links:
+                self._hops[(sources[link], dest)] = link
+            i = links[0]
+        return i
+
+    def route(self, source: int, dest: int) -> Union[list[NVDirection], None]:
+        """Returns the directions to take, in order, along a shortest route
+        between two nodes, or None if there is no route."""
+        directions = self.graph.directions
+        targets = self.graph.targets
+        route = []
+        node = source
+        while node != dest:
+            i = self.next_link(node, dest)
+            if i is None:
+                return None
+            route.append(NVDirection(directions[i]))
+            node = targets[i]
+        return route
+
+    def distance(self, source: int, dest: int) -> int:
+        """Returns the number of steps along a shortest route between two
+        nodes, or -1 if there is no route."""
+        route = self.route(source, dest)
+        return -1 if route is None else len(route)
+
+    def next_step(self, source: int, dest: int) -> Union[NVDirection, None]:
+        """Returns the direction of the first step of a shortest route
+        between two nodes, or None if there is no route or the nodes are
+        one and the same."""
+        i = self.next_link(source, dest)
+        return None if i is None else NVDirection(self.graph.directions[i])
@@ -0,0 +1,170 @@
+"""Profiling module for Nuventure, a poor man's implementation of ScummVM.
+
+NVProfiler profiles the turns of a game, whether played at the console by
+NVGame.run or replayed from transcripts, and nothing in between them, such
+as waiting for the player to type.  It produces two things:
+
+- collapsed stacks, one line per distinct call stack seen, giving the
+  frames from the outermost in, separated by semicolons, and the number
+  of samples taken in it.  This is the input format of flamegraph.pl and
+  of most flame graph viewers.  Stacks are sampled every so often of CPU
+  time with a profiling timer, which is only available on Unix; elsewhere,
+  no stacks are collected.
+- a report of the functions in which the most time was spent, from
+  cProfile.
+
+To profile a game at the console or a replay, from the source directory:
+
+    python game.py --profile game.folded
+    python replay.py --profile replay.folded transcripts/*.txt
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import cProfile
+import os
+import pstats
+import signal
+import sys
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, TextIO, Union
+
+"""The CPU time between samples of the stack, in seconds."""
+SAMPLE_INTERVAL = 0.001
+
+"""The number of functions listed in the report by default."""
+TOP_COUNT = 20
+
+
+def _frame_name(code) -> str:
+    """Returns the name of a frame in a collapsed stack: its module's file
+    name and its function's name, e.g. "world.py:render"."""
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class NVProfiler:
+    """
+    An NVProfiler collects samples of the stack and cProfile statistics
+    for each turn played within turn(), then writes them out at the end.
+    """
+
+    def __init__(
+        self,
+        collapsed_path: Union[str, None] = None,
+        top: int = TOP_COUNT,
+        report: Union[TextIO, None] = None,
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        """Create a new profiler.
+
+        Args:
+            collapsed_path: the file to write collapsed stacks to when
+                closed (defaults to writing none)
+            top: the number of functions to list in the report
+            report: the stream to write the report to when closed
+                (defaults to standard error)
+            interval: the CPU time between samples of the stack, in seconds
+        """
+        self.collapsed_path = collapsed_path
+        self.top = top
+        self.report = report
+        self.interval = interval
+        self.stacks = Counter()
+        self.turns = 0
+        self.profile = cProfile.Profile()
+        self.sampling_p = hasattr(signal, "setitimer")
+        self.active_p = False
+        self._previous_handler = None
+
+    def _sample(self, signum, frame) -> None:  # pylint: disable=unused-argument
+        """Count the stack the timer went off in, if it is within a turn."""
+        if not self.active_p:
+            return
+        names = []
+        while frame is not None:
+            names.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        names.reverse()
+        self.stacks[";".join(names)] += 1
+
+    @contextmanager
+    def turn(self) -> Iterator[None]:
+        """Profile what is run within a with block, usually one turn."""
+        if self.sampling_p and self._previous_handler is None:
+            # Turns are often shorter than the timer's resolution, so the
+            # timer runs from the first turn on, and samples taken between
+            # turns are dropped.
+            self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        self.active_p = True
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            self.active_p = False
+            self.turns += 1
+
+    def collapsed(self) -> list[str]:
+        """Returns the collapsed stacks sampled so far, one per line,
+        most sampled first."""
+        return [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+
+    def hot_functions(self, top: Union[int, None] = None) -> list[dict]:
+        """Returns the functions in which the most time was spent, not
+        counting the functions they called.
+
+        Args:
+            top: the number of functions to return (defaults to the number
+                given when the profiler was created)
+
+        Returns:
+            A list of dicts, most time first, each giving the "function",
+            the number of "calls", and the "self" and "cumulative" seconds
+            spent in it.
+        """
+        if not self.turns:
+            return []
+        stats = pstats.Stats(self.profile).stats
+        ranked = sorted(stats.items(), key=lambda entry: entry[1][2], reverse=True)
+        return [
+            {
+                "function": f"{os.path.basename(filename)}:{line}:{name}",
+                "calls": calls,
+                "self": tottime,
+                "cumulative": cumtime,
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in ranked[
+                : top or self.top
+            ]
+        ]
+
+    def write_report(self, stream: TextIO) -> None:
+        """Write the report of the hottest functions to a stream."""
+        print(f"profiled {self.turns} turn(s); hottest functions:", file=stream)
+        print(f"{'calls':>10}{'self ms':>12}{'cum ms':>12}  function", file=stream)
+        for entry in self.hot_functions():
+            print(
+                f"{entry['calls']:>10}{entry['self'] * 1e3:>12.3f}"
+                f"{entry['cumulative'] * 1e3:>12.3f}  {entry['function']}",
+                file=stream,
+            )
+
+    def close(self) -> None:
+        """Stop sampling, then write out the collapsed stacks and the report."""
+        if self._previous_handler is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+        if self.collapsed_path:
+            with open(self.collapsed_path, "w") as fh:
+                for line in self.collapsed():
+                    print(line, file=fh)
+        self.write_report(self.report or sys.stderr)
@@ -0,0 +1,142 @@
+"""Active region module for Nuventure, a poor man's implementation of ScummVM.
+
+In a large world, only the NPCs near a player can be seen to do anything.
+NVActiveRegion keeps the set of nodes within a few links of any player,
+and only the NPCs in it are simulated tic by tic.  An NPC due to act
+anywhere else is frozen instead: it stays where it is, and costs nothing,
+until its node falls within the region again.  It is then caught up on
+the tics it missed in one go, coarsely: a wanderer takes as many random
+steps as it would have, up to a limit, and an NPC with a goal walks as far
+along its route.  The random steps are drawn from a generator seeded by
+the NPC and the tics it was frozen between, so catching up is the same
+however the game got there.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import random
+
+"""The number of links from a player within which NPCs are simulated."""
+DEFAULT_RADIUS = 3
+
+"""The most random steps a frozen wanderer takes while catching up.  A
+random walk this long has wandered about as far as it ever will."""
+CATCH_UP_LIMIT = 64
+
+
+class NVActiveRegion:
+    """
+    NVActiveRegion holds the numbers of the nodes within `radius` links of
+    any player, and the NPCs frozen outside them with the tic on which
+    each was frozen.
+    """
+
+    def __init__(
+        self, world, radius: int = DEFAULT_RADIUS, seed: int = 0, catch_up_limit=CATCH_UP_LIMIT
+    ):
+        """Create a new active region for a world.
+
+        Args:
+            world: the world whose NPCs are simulated
+            radius: the number of links from a player within which NPCs
+                are simulated
+            seed: the seed from which the steps of frozen NPCs catching up
+                are drawn
+            catch_up_limit: the most random steps a frozen wanderer takes
+                while catching up
+        """
+        self.world = world
+        self.radius = radius
+        self.seed = seed
+        self.catch_up_limit = catch_up_limit
+        self.nodes = set()
+        self.frozen = {}
+        self._anchors = None
+
+    def _players(self) -> list:
+        """Returns the players in the world."""
+        return [actor for actor in self.world.players.values() if actor.location is not None]
+
+    def update(self) -> None:
+        """Find the region afresh if a player has moved or the map has
+        changed, and thaw the NPCs in any node that has come into it."""
+        players = self._players()
+        anchors = (self.world.graph.version, tuple(actor.location.id for actor in players))
+        if anchors == self._anchors:
+            return
+        self._anchors = anchors
+
+        graph = self.world.graph
+        offsets, targets = graph.offsets, graph.targets
+        region = {actor.location.id for actor in players}
+        frontier = list(region)
+        for _ in range(self.radius):
+            reached = []
+            for node in frontier:
+                for i in range(offsets[node], offsets[node + 1]):
+                    if targets[i] not in region:
+                        region.add(targets[i])
+                        reached.append(targets[i])
+            frontier = reached
+
+        entered = region - self.nodes
+        self.nodes = region
+        if self.frozen:
+            by_id = self.world.nodes.by_id
+            for node in sorted(entered):
+                for actor in list(by_id[node].occupants):
+                    if actor in self.frozen:
+                        self.thaw(actor)
+
+    def active_p(self, actor) -> bool:
+        """Returns whether an actor stands within the region."""
+        return actor.location is not None and actor.location.id in self.nodes
+
+    def freeze(self, actor) -> None:
+        """Freeze an NPC where it stands, from this tic on."""
+        self.frozen.setdefault(actor, self.world.tic)
+
+    def thaw(self, actor) -> None:
+        """Catch a frozen NPC up on the tics it missed, and have it act
+        from this tic on."""
+        since = self.frozen.pop(actor)
+        self._catch_up(actor, since, self.world.tic)
+        self.world.scheduler.schedule(actor, self.world.tic)
+
+    def forget(self, actor) -> None:
+        """Forget an NPC that has left the world."""
+        self.frozen.pop(actor, None)
+
+    def _catch_up(self, actor, since: int, now: int) -> None:
+        """Move an NPC as it might have moved on the tics from `since` up
+        to, but not including, `now`."""
+        steps = (now - since) * actor.movement_rate
+        if steps <= 0 or actor.is_dead():
+            return
+
+        graph = self.world.graph
+        node = actor.location.id
+        if actor.goal is not None:
+            paths = self.world.paths
+            for _ in range(steps):
+                i = paths.next_link(node, actor.goal.id)
+                if i is None:
+                    break
+                node = graph.targets[i]
+        else:
+            rng = random.Random(f"{self.seed}:{actor.internal_name}:{since}:{now}")
+            offsets, targets = graph.offsets, graph.targets
+            for _ in range(min(steps, self.catch_up_limit)):
+                degree = offsets[node + 1] - offsets[node]
+                if not degree:
+                    break
+                node = targets[offsets[node] + rng.randrange(degree)]
+
+        if node != actor.location.id:
+            actor.location = self.world.nodes.by_id[node]
@@ -0,0 +1,219 @@
+"""Transcript replay for Nuventure, a poor man's implementation of ScummVM.
+
+A transcript is a text file of commands, one per line, as a player typed
+them; lines starting with "#" are comments.  Replaying a transcript plays
+each command with NVGame.step, with no interactive input or output, and
+reports how many turns per second were played and how long each phase of
+a turn took.  Many transcripts may be replayed at once across a pool of
+processes.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, TextIO, Union
+
+from nuventure.game import NVGame
+from nuventure.profiling import TOP_COUNT, NVProfiler
+
+"""The phases of a turn whose timings are reported, in order."""
+PHASES = ("parse", "invoke", "tic")
+
+
+def read_transcript(stream: TextIO) -> Iterable[str]:
+    """Yield the commands of a transcript, skipping comments.
+
+    Args:
+        stream: the transcript, opened for reading
+
+    Returns:
+        An iterator over the commands, without their line endings.
+    """
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if line.startswith("#"):
+            continue
+        yield line
+
+
+def replay(
+    game: NVGame,
+    commands: Iterable[str],
+    name: str = "<stream>",
+    profiler: Union[NVProfiler, None] = None,
+) -> dict:
+    """Play a series of commands against a game.
+
+    Replay stops early if the game ends.
+
+    Args:
+        game: the game to play the commands against
+        commands: the commands to play
+        name: the name of the transcript, for the report
+        profiler: if given, an NVProfiler with which to profile each turn
+
+    Returns:
+        A report: a dict giving the transcript's "name", the number of
+        "turns" played, how many ended in "errors", whether the game was
+        "quit", the "elapsed" seconds, and the total seconds spent in each
+        phase of a turn under "phases".
+    """
+    report = {
+        "name": name,
+        "turns": 0,
+        "errors": 0,
+        "quit": False,
+        "elapsed": 0.0,
+        "phases": dict.fromkeys(PHASES, 0.0),
+    }
+    phases = report["phases"]
+
+    start = time.perf_counter()
+    for command in commands:
+        if profiler:
+            with profiler.turn():
+                result = game.step(command)
+        else:
+            result = game.step(command)
+        report["turns"] += 1
+        if result.error:
+            report["errors"] += 1
+        for phase, seconds in result.timings.items():
+            if phase in phases:
+                phases[phase] += seconds
+        if result.quit:
+            report["quit"] = True
+            break
+    report["elapsed"] = time.perf_counter() - start
+
+    return report
+
+
+def replay_file(path: str, transcript: str, profiler: Union[NVProfiler, None] = None) -> dict:
+    """Replay a transcript file against a new game.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        transcript: the transcript's filename, or "-" for standard input
+        profiler: if given, an NVProfiler with which to profile each turn
+
+    Returns:
+        A report as returned by replay.
+    """
+    game = NVGame(path)
+    if transcript == "-":
+        return replay(game, read_transcript(sys.stdin), transcript, profiler)
+    with open(transcript, "r") as fh:
+        return replay(game, read_transcript(fh), transcript, profiler)
+
+
+def replay_many(
+    path: str,
+    transcripts: list[str],
+    jobs: int = 1,
+    profiler: Union[NVProfiler, None] = None,
+) -> list[dict]:
+    """Replay several transcript files, each against a new game.
+
+    Args:
+        path: the directory holding dirtest.json and verbs.json
+        transcripts: the transcripts' filenames
+        jobs: the number of processes to replay them in (defaults to 1,
+            which replays them one after the other in this process)
+        profiler: if given, an NVProfiler with which to profile each turn;
+            the transcripts are then replayed in this process, whatever
+            the number of jobs
+
+    Returns:
+        A list of reports as returned by replay, in the order given.
+    """
+    if profiler or jobs <= 1 or len(transcripts) <= 1:
+        return [replay_file(path, transcript, profiler) for transcript in transcripts]
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(replay_file, [path] * len(transcripts), transcripts))
+
+
+def summarize(reports: list[dict], wall: float) -> dict:
+    """Combine the reports of several replays.
+
+    Args:
+        reports: the reports of each replay
+        wall: the wall-clock seconds taken to replay all of them
+
+    Returns:
+        A report like those of replay, named "total", whose "elapsed"
+        time is the wall-clock time, with "turns_per_second" added.
+    """
+    total = {
+        "name": "total",
+        "turns": sum(report["turns"] for report in reports),
+        "errors": sum(report["errors"] for report in reports),
+        "quit": all(report["quit"] for report in reports),
+        "elapsed": wall,
+        "phases": {
+            phase: sum(report["phases"][phase] for report in reports) for phase in PHASES
+        },
+    }
+    total["turns_per_second"] = total["turns"] / wall if wall else 0.0
+    return total
+
+
+def _print_report(report: dict) -> None:
+    """Print a line of the summary table for a single report."""
+    turns = report["turns"] or 1
+    rate = report["turns"] / report["elapsed"] if report["elapsed"] else 0.0
+    micros = [report["phases"][phase] / turns * 1e6 for phase in PHASES]
+    print(
+        f"{report['name'][:30]:30}{report['turns']:>8}{report['errors']:>8}{rate:>12.0f}"
+        + "".join(f"{m:>10.1f}" for m in micros)
+    )
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line, replay the transcripts, and report."""
+    argp = argparse.ArgumentParser(
+        prog="replay", description="Replay transcripts of commands against Nuventure."
+    )
+    argp.add_argument("transcripts", nargs="+", help='transcript files, or "-" for stdin')
+    argp.add_argument("--data", default="../data", help="the game data directory")
+    argp.add_argument("--jobs", type=int, default=1, help="replay in this many processes")
+    argp.add_argument("--json", action="store_true", help="print the reports as JSON")
+    argp.add_argument(
+        "--profile", metavar="FILE", help="profile each turn, writing collapsed stacks to FILE"
+    )
+    argp.add_argument(
+        "--profile-top", type=int, default=TOP_COUNT, help="the number of hot functions to report"
+    )
+    args = argp.parse_args(argv[1:])
+
+    profiler = NVProfiler(args.profile, args.profile_top) if args.profile else None
+    start = time.perf_counter()
+    reports = replay_many(args.data, args.transcripts, args.jobs, profiler)
+    total = summarize(reports, time.perf_counter() - start)
+    if profiler:
+        profiler.close()
+
+    if args.json:
+        print(json.dumps({"transcripts": reports, "total": total}, indent=2))
+        return 0
+
+    print(
+        f"{'transcript':30}{'turns':>8}{'errors':>8}{'turns/s':>12}"
+        + "".join(f"{phase + ' us':>10}" for phase in PHASES)
+    )
+    for report in reports:
+        _print_report(report)
+    if len(reports) > 1:
+        _print_report(total)
+    return 0
@@ -0,0 +1,91 @@
+"""Scheduler module for Nuventure, a poor man's implementation of ScummVM.
+
+A world tic used to give every actor a turn, though most actors in a large
+world have nothing to do on most tics: merchants never move, the player
+only acts on the tic after dying, and a dead NPC only needs a turn to be
+removed.  NVScheduler instead keeps a calendar of the tics on which each
+actor next wakes, so that a tic costs in proportion to the actors waking
+on it.
+
+The calendar is a bucket per tic holding the actors waking then, with a
+heap of the tics that have buckets; since actors mostly wake on the very
+next tic, the heap stays tiny however many actors there are.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import heapq
+from typing import Union
+
+
+class NVScheduler:
+    """
+    NVScheduler holds the tic on which each actor next wakes.  An actor
+    wakes at most once per tic, on the earliest tic it was scheduled for.
+    """
+
+    def __init__(self):
+        """Create a new, empty calendar."""
+        self.buckets = {}
+        self.tics = []
+        self.wakeups = {}
+
+    def __len__(self) -> int:
+        """Returns the number of actors waiting to wake."""
+        return len(self.wakeups)
+
+    def __contains__(self, actor) -> bool:
+        """Returns whether an actor is waiting to wake."""
+        return actor in self.wakeups
+
+    def schedule(self, actor, tic: int) -> None:
+        """Wake an actor on the given tic, unless it is to wake sooner.
+
+        Args:
+            actor: the actor to wake
+            tic: the number of the tic to wake it on
+        """
+        current = self.wakeups.get(actor)
+        if current is not None:
+            if current <= tic:
+                return
+            self.cancel(actor)
+
+        bucket = self.buckets.get(tic)
+        if bucket is None:
+            bucket = self.buckets[tic] = {}
+            heapq.heappush(self.tics, tic)
+        bucket[actor] = None
+        self.wakeups[actor] = tic
+
+    def cancel(self, actor) -> None:
+        """Stop an actor from waking, if it was to."""
+        tic = self.wakeups.pop(actor, None)
+        if tic is not None:
+            # An empty bucket's tic is left in the heap, and skipped.
+            del self.buckets[tic][actor]
+
+    def next_tic(self) -> Union[int, None]:
+        """Returns the tic on which the next actor wakes, or None if no
+        actor is waiting to wake."""
+        while self.tics and not self.buckets[self.tics[0]]:
+            del self.buckets[heapq.heappop(self.tics)]
+        return self.tics[0] if self.tics else None
+
+    def pop_due(self, tic: int) -> list:
+        """Returns the actors waking on or before the given tic, in the
+        order of their tics and then the order they were scheduled, and
+        forgets them."""
+        due = []
+        while self.tics and self.tics[0] <= tic:
+            bucket = self.buckets.pop(heapq.heappop(self.tics))
+            for actor in bucket:
+                del self.wakeups[actor]
+            due.extend(bucket)
+        return due
@@ -0,0 +1,231 @@
+"""Server module for Nuventure, a poor man's implementation of ScummVM.
+
+NVServer hosts many games in one process over a line-oriented protocol on
+a TCP or Unix socket: each connection is a session with its own NVGame,
+and hence its own player and world.  Each line received is a command, and
+the output of each turn, followed by a prompt, is sent back in one write
+through an output sink.
+
+Run this module from the source directory to start a server:
+
+    python -m nuventure.server ../data --port 4000
+    python -m nuventure.server ../data --unix /tmp/nuventure.sock
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import Callable, Union
+
+from nuventure import DEFAULT_WIDTH, OUTPUT
+from nuventure.errors import NVGameExit
+from nuventure.game import NVGame
+from nuventure.sink import NVSocketSink
+
+"""The prompt sent after the output of each turn."""
+PROMPT = "> "
+
+"""The longest line, in bytes, accepted as a command."""
+MAX_LINE = 1024
+
+"""The number of connections allowed to wait to be accepted, which must be
+large enough for many players connecting at once."""
+BACKLOG = 4096
+
+
+class NVSession:
+    """
+    An NVSession is one player's game on one connection.  Output written
+    while a turn is played is collected and sent when the turn is over.
+    """
+
+    def __init__(
+        self,
+        game: NVGame,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        width: int = DEFAULT_WIDTH,
+    ):
+        """Create a new session.
+
+        Args:
+            game: the game played in this session
+            reader: the stream commands are read from
+            writer: the stream output is written to
+            width: the width to which the session's output is wrapped
+        """
+        self.game = game
+        self.reader = reader
+        self.writer = writer
+        self.output = NVSocketSink(writer, width)
+        self.turns = 0
+
+    async def run(self) -> None:
+        """Play the game until the player quits or disconnects.
+
+        This must run in a task of its own, as the session's output is
+        redirected within the task's context."""
+        OUTPUT.set(self.output)
+        try:
+            self.game.player.location.render()
+            await self._flush(PROMPT)
+
+            while True:
+                command = await self._read_command()
+                if command is None:
+                    break
+                try:
+                    self.game.do_turn(command)
+                except NVGameExit:
+                    # The end of the game exits the console game; here it
+                    # only ends the session.
+                    await self._flush()
+                    break
+                self.turns += 1
+                await self._flush(PROMPT)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def close(self) -> None:
+        """Hang up on the player; the session then ends of its own accord."""
+        self.writer.close()
+
+    async def _read_command(self) -> Union[str, None]:
+        """Read the next command, or None if the connection has closed
+        or sent an overlong line."""
+        try:
+            line = await self.reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as ex:
+            line = ex.partial
+        except asyncio.LimitOverrunError:
+            return None
+
+        if not line:
+            return None
+        return line.decode("utf-8", errors="replace").strip()
+
+    async def _flush(self, prompt: str = "") -> None:
+        """Send the output collected so far, then the prompt."""
+        self.output.write(prompt)
+        await self.output.drain()
+
+
+class NVServer:
+    """
+    NVServer accepts connections and hosts a session for each of them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        game_factory: Union[Callable[[], NVGame], None] = None,
+        width: int = DEFAULT_WIDTH,
+    ):
+        """Create a new server.
+
+        Args:
+            path: the directory holding dirtest.json and verbs.json
+            game_factory: a callable returning a new game for each session
+                (defaults to loading a new NVGame from `path`)
+            width: the width to which each session's output is wrapped
+        """
+        self.path = path
+        self.width = width
+        self.game_factory = game_factory or (lambda: NVGame(self.path))
+        self.sessions = {}
+        self.server = None
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        unix_path: Union[str, None] = None,
+    ) -> asyncio.AbstractServer:
+        """Start listening for connections.
+
+        Args:
+            host: the address to listen on (defaults to the loopback address)
+            port: the TCP port to listen on (defaults to any free port)
+            unix_path: if given, listen on this Unix socket instead of TCP
+
+        Returns:
+            The underlying asyncio server.
+        """
+        if unix_path:
+            self.server = await asyncio.start_unix_server(
+                self._on_connect, path=unix_path, limit=MAX_LINE, backlog=BACKLOG
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self._on_connect, host, port, limit=MAX_LINE, backlog=BACKLOG
+            )
+        return self.server
+
+    async def close(self) -> None:
+        """Stop listening for connections, then end every session."""
+        if self.server:
+            self.server.close()
+        for session in self.sessions:
+            session.close()
+        await asyncio.gather(*self.sessions.values(), return_exceptions=True)
+        if self.server:
+            await self.server.wait_closed()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Host a session on a new connection.  asyncio runs each of these
+        in a task of its own.  The game is loaded in a worker thread, so
+        that other sessions carry on meanwhile."""
+        game = await asyncio.get_running_loop().run_in_executor(None, self.game_factory)
+        session = NVSession(game, reader, writer, self.width)
+        self.sessions[session] = asyncio.current_task()
+        try:
+            await session.run()
+        finally:
+            del self.sessions[session]
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run a server until interrupted."""
+    server = NVServer(args.path, width=args.width)
+    listener = await server.start(args.host, args.port, args.unix)
+    for sock in listener.sockets:
+        print(f"nuventure: listening on {sock.getsockname()}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line and run a server."""
+    argp = argparse.ArgumentParser(prog="nuventure.server", description=__doc__.split("\n")[0])
+    argp.add_argument("path", nargs="?", default="../data", help="the game data directory")
+    argp.add_argument("--host", default="127.0.0.1", help="the address to listen on")
+    argp.add_argument("--port", type=int, default=4000, help="the TCP port to listen on")
+    argp.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    argp.add_argument(
+        "--width", type=int, default=DEFAULT_WIDTH, help="the width to wrap output to"
+    )
+    args = argp.parse_args(argv[1:])
+
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
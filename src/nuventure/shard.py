@@ -0,0 +1,283 @@
+"""Shard module for Nuventure, a poor man's implementation of ScummVM.
+
+In the largest worlds, even moving every NPC at once with NumPy (see
+NVCrowd) leaves a single core to do all the work.  NVShardedCrowd splits
+the map into shards of nodes near one another, and gives each shard to a
+worker process of its own.  The map and the NPCs' locations are kept in
+shared memory, which every worker maps, so a tic costs each worker one
+message telling it to go and one back; no location is ever copied
+between processes.
+
+An NPC belongs to the shard holding the node where it stands at the start
+of a tic, and only that shard's worker moves it, so no two workers ever
+write the same location.  An NPC may wander into another shard during a
+tic; its worker hands it over once the tic is done, and the main process
+passes it on to its new worker along with the next tic.  The main process
+then moves each NPC whose location has changed in the world the player
+sees, just as NVCrowd does.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import multiprocessing
+import os
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import Union
+
+import numpy as np
+
+from nuventure.crowd import NVCrowd
+from nuventure.graph import NVWorldGraph
+
+
+def partition(graph: NVWorldGraph, shards: int) -> np.ndarray:
+    """Returns the shard of each node of a graph.  The nodes are taken in
+    breadth-first order and cut into runs of equal length, so that each
+    shard holds nodes near one another and few links cross between shards.
+
+    Args:
+        graph: the graph to partition
+        shards: the number of shards to cut it into
+    """
+    offsets, targets = graph.offsets, graph.targets
+    seen = bytearray(len(graph))
+    order = []
+    for root in range(len(graph)):
+        if seen[root]:
+            continue
+        seen[root] = 1
+        order.append(root)
+        head = len(order) - 1
+        while head < len(order):
+            node = order[head]
+            head += 1
+            for i in range(offsets[node], offsets[node + 1]):
+                if not seen[targets[i]]:
+                    seen[targets[i]] = 1
+                    order.append(targets[i])
+
+    owner = np.empty(len(graph), np.intp)
+    owner[np.asarray(order, np.intp)] = np.arange(len(graph)) * shards // max(len(graph), 1)
+    return owner
+
+
+def _share(values: np.ndarray) -> tuple:
+    """Copy an array into a new block of shared memory, returning the
+    block together with what a worker needs to map it."""
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+    return block, (block.name, values.dtype.str, len(values))
+
+
+def _view(block: shared_memory.SharedMemory, spec: tuple) -> np.ndarray:
+    """Returns the array kept in a block of shared memory."""
+    _, dtype, length = spec
+    return np.ndarray(length, dtype, buffer=block.buf)
+
+
+def _release(block: shared_memory.SharedMemory) -> None:
+    """Unmap a block of shared memory and free it."""
+    try:
+        block.close()
+    except BufferError:
+        # An array still maps it; the mapping goes with the process.
+        pass
+    block.unlink()
+
+
+def _step(arrays: dict, members: np.ndarray, rng, shard: int) -> tuple:
+    """Move the NPCs in a shard as far as their movement rates, following
+    NVCrowd.step, and returns those that have left the shard and those
+    that remain."""
+    indptr, indices, degree = arrays["indptr"], arrays["indices"], arrays["degree"]
+    locations, rates = arrays["locations"], arrays["rates"]
+    if len(members):
+        where_all = locations[members]
+        rates_here = rates[members]
+        for step in range(int(rates_here.max())):
+            moving = (rates_here > step) & (degree[where_all] > 0)
+            where = where_all[moving]
+            draws = (rng.random(len(where)) * degree[where]).astype(np.intp)
+            where_all[moving] = indices[indptr[where] + draws]
+        locations[members] = where_all
+
+    leaving = arrays["owner"][locations[members]] != shard
+    return members[leaving], members[~leaving]
+
+
+def _work(shard: int, seed: Union[int, None], conn) -> None:
+    """Move the NPCs in one shard, tic by tic, as the main process says.
+
+    Args:
+        shard: the number of the shard
+        seed: the seed of the crowd, from which the shard's random number
+            generator is seeded (None to seed it from the operating system)
+        conn: the worker's end of its pipe to the main process
+    """
+    rng = np.random.default_rng(None if seed is None else [seed, shard])
+    blocks = []
+    arrays = {}
+    members = np.empty(0, np.intp)
+    while True:
+        message = conn.recv()
+        if message[0] == "tic":
+            leaving, members = _step(arrays, np.concatenate((members, message[1])), rng, shard)
+            conn.send(leaving)
+        elif message[0] == "load":
+            arrays.clear()
+            for block in blocks:
+                block.close()
+            blocks = []
+            for key, spec in message[1].items():
+                blocks.append(shared_memory.SharedMemory(name=spec[0]))
+                arrays[key] = _view(blocks[-1], spec)
+            arrays["degree"] = np.diff(arrays["indptr"])
+            members = np.flatnonzero(arrays["owner"][arrays["locations"]] == shard)
+            conn.send(None)
+        else:
+            break
+
+    arrays.clear()
+    for block in blocks:
+        block.close()
+    conn.close()
+
+
+def _shut_down(pipes: list, workers: list, blocks: dict) -> None:
+    """Stop a crowd's workers and free its shared memory."""
+    for pipe in pipes:
+        try:
+            pipe.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+    for worker in workers:
+        worker.join(5)
+        if worker.is_alive():
+            worker.terminate()
+    for pipe in pipes:
+        pipe.close()
+    for block, _ in blocks.values():
+        _release(block)
+    blocks.clear()
+
+
+class NVShardedCrowd(NVCrowd):
+    """
+    NVShardedCrowd is an NVCrowd whose NPCs are moved by worker processes,
+    one per shard of the map.  It follows the same rules, and likewise
+    must be rebuilt by hand after moving an NPC by any other means than a
+    world tic.  Its workers are stopped by close(), or else when the crowd
+    is collected or the program exits.
+
+    The NPCs' locations are kept in shared memory; the map, and which
+    shard each node belongs to (`owner`), are shared as well.  With a seed,
+    the NPCs move the same way each time for the same number of shards.
+    """
+
+    def __init__(
+        self, world, shards: Union[int, None] = None, seed: Union[int, None] = None
+    ):
+        """Create a new sharded crowd from the actors in a world, and start
+        its workers.
+
+        Args:
+            world: the world whose NPCs are moved
+            shards: the number of shards, and so of worker processes
+                (defaults to the number of CPUs)
+            seed: the seed for the workers' random number generators
+                (defaults to seeding from the operating system)
+        """
+        self.shards = shards or os.cpu_count() or 1
+        self.handoffs = 0
+        self.owner = np.empty(0, np.intp)
+        self._blocks = {}
+        self._joiners = []
+        self.pipes = []
+        self.workers = []
+        # The workers must share the main process's resource tracker, or
+        # each would start its own and free the blocks it maps on exit.
+        resource_tracker.ensure_running()
+        context = multiprocessing.get_context()
+        for shard in range(self.shards):
+            here, there = context.Pipe()
+            worker = context.Process(
+                target=_work,
+                args=(shard, seed, there),
+                name=f"nuventure-shard-{shard}",
+                daemon=True,
+            )
+            worker.start()
+            there.close()
+            self.pipes.append(here)
+            self.workers.append(worker)
+        self._finalizer = weakref.finalize(
+            self, _shut_down, self.pipes, self.workers, self._blocks
+        )
+        super().__init__(world, seed)
+
+    def _publish(self, **arrays) -> None:
+        """Copy arrays into shared memory, in place of any shared under the
+        same names before, and have the workers map them afresh."""
+        stale = []
+        for key, values in arrays.items():
+            if key in self._blocks:
+                stale.append(self._blocks[key][0])
+            self._blocks[key] = _share(values)
+        if "locations" in arrays:
+            self.locations = _view(*self._blocks["locations"])
+        for block in stale:
+            _release(block)
+
+        # The map is shared before the roster, which must wait for it.
+        if "locations" in self._blocks:
+            specs = {key: spec for key, (_, spec) in self._blocks.items()}
+            for pipe in self.pipes:
+                pipe.send(("load", specs))
+            for pipe in self.pipes:
+                pipe.recv()
+            self._joiners = [np.empty(0, np.intp)] * self.shards
+
+    def relink(self) -> None:
+        """Take the links of the map afresh from the world, partition it
+        anew, and share it with the workers."""
+        super().relink()
+        self.owner = partition(self.world.graph, self.shards)
+        self._publish(indptr=self.indptr, indices=self.indices, owner=self.owner)
+
+    def rebuild(self) -> None:
+        """Take the roster of NPCs afresh from the world, as NVCrowd.rebuild
+        does, and share it with the workers, who each take the NPCs
+        standing in their shards."""
+        super().rebuild()
+        self._publish(locations=self.locations, rates=self.rates)
+
+    def bury(self, dead: list[int]) -> None:
+        """Remove the given NPCs, by their position in the roster, from
+        the world, and share what remains of the roster anew."""
+        for i in dead:
+            self.world.remove_actor(self.npcs[i])
+        self.rebuild()
+
+    def step(self) -> None:
+        """Have every worker move the NPCs in its shard, and pass those
+        that have crossed into another shard on to its worker."""
+        for pipe, joiners in zip(self.pipes, self._joiners):
+            pipe.send(("tic", joiners))
+        leaving = np.concatenate([pipe.recv() for pipe in self.pipes])
+        self.handoffs += len(leaving)
+        bound = self.owner[self.locations[leaving]]
+        self._joiners = [leaving[bound == shard] for shard in range(self.shards)]
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory.  The crowd cannot
+        move its NPCs thereafter."""
+        # The locations are kept, unshared, for anyone still reading them.
+        self.locations = np.array(self.locations)
+        self._finalizer()
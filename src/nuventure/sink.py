@@ -0,0 +1,154 @@
+"""Output sink module for Nuventure, a poor man's implementation of ScummVM.
+
+A scene is printed a line or two at a time, so writing game output straight
+to a terminal or socket costs a system call for every line of every turn.
+An output sink instead collects what is written to it during a turn and
+sends it on in one piece when flushed, and knows how wide the screen it
+writes to is, so that each session may wrap text to a width of its own.
+
+A sink is a text stream, and is installed as the game's output with
+nuventure.OUTPUT like any other:
+
+    sink = NVBufferSink(width=60)
+    token = OUTPUT.set(sink)
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import asyncio
+import sys
+from contextlib import contextmanager
+from typing import Iterator, TextIO, Union
+
+from nuventure import DEFAULT_WIDTH, OUTPUT
+
+
+class NVSink:
+    """
+    An NVSink collects the text written to it until it is flushed, then
+    sends it all on at once.  Subclasses decide where it is sent.
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH):
+        """Create a new, empty sink.
+
+        Args:
+            width: the width to which text printed to this sink is wrapped
+                (defaults to DEFAULT_WIDTH)
+        """
+        self.width = width
+        self.pending = []
+
+    def write(self, text: str) -> int:
+        """Collect some text, to be sent on when the sink is flushed."""
+        self.pending.append(text)
+        return len(text)
+
+    def flush(self) -> None:
+        """Send on the text collected so far, if any."""
+        if self.pending:
+            text = "".join(self.pending)
+            self.pending.clear()
+            self._send(text)
+
+    def _send(self, text: str) -> None:
+        """Send on the text collected by the sink."""
+        raise NotImplementedError
+
+
+class NVStreamSink(NVSink):
+    """
+    An NVStreamSink sends what it collects on to a text stream, such as
+    standard output.
+    """
+
+    def __init__(self, stream: Union[TextIO, None] = None, width: int = DEFAULT_WIDTH):
+        """Create a new sink over a stream.
+
+        Args:
+            stream: the stream to write to (defaults to standard output)
+            width: the width to which text printed to this sink is wrapped
+        """
+        super().__init__(width)
+        self.stream = stream or sys.stdout
+
+    def _send(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+
+class NVBufferSink(NVSink):
+    """
+    An NVBufferSink keeps everything written to it in memory, which makes
+    it handy for capturing the output of a game in tests.
+    """
+
+    def __init__(self, width: int = DEFAULT_WIDTH):
+        super().__init__(width)
+        self.sent = []
+
+    def _send(self, text: str) -> None:
+        self.sent.append(text)
+
+    def getvalue(self) -> str:
+        """Returns everything written to the sink, flushed or not."""
+        return "".join(self.sent) + "".join(self.pending)
+
+    def lines(self) -> list[str]:
+        """Returns everything written to the sink, as a list of lines."""
+        return self.getvalue().splitlines()
+
+    def clear(self) -> None:
+        """Forget everything written to the sink so far."""
+        self.sent.clear()
+        self.pending.clear()
+
+
+class NVSocketSink(NVSink):
+    """
+    An NVSocketSink sends what it collects on to a connection, encoded as
+    UTF-8, in a single write to its asyncio stream.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, width: int = DEFAULT_WIDTH):
+        """Create a new sink over a connection.
+
+        Args:
+            writer: the stream of the connection to write to
+            width: the width to which text printed to this sink is wrapped
+        """
+        super().__init__(width)
+        self.writer = writer
+
+    def _send(self, text: str) -> None:
+        self.writer.write(text.encode("utf-8"))
+
+    async def drain(self) -> None:
+        """Flush the sink, then wait until the connection has taken
+        everything sent to it."""
+        self.flush()
+        await self.writer.drain()
+
+
+@contextmanager
+def nv_capture(width: int = DEFAULT_WIDTH) -> Iterator[NVBufferSink]:
+    """Capture the game output written within a with block.
+
+    Args:
+        width: the width to which text is wrapped meanwhile
+
+    Returns:
+        A context manager yielding the NVBufferSink output is written to.
+    """
+    sink = NVBufferSink(width)
+    token = OUTPUT.set(sink)
+    try:
+        yield sink
+    finally:
+        OUTPUT.reset(token)
@@ -0,0 +1,143 @@
+"""Streaming world reader for Nuventure, a poor man's implementation of ScummVM.
+
+json.load reads a whole world file into one dict before a single node is
+built, so loading a large world briefly holds both the raw dict and every
+object built from it.  iter_world instead reads the file a chunk at a time
+and yields the entries of its sections one by one, each decoded on its own
+and free to be thrown away as soon as its object is built.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import json
+from typing import Any, Iterator, TextIO, Tuple, Union
+
+"""The sections of a world file whose entries are streamed one by one."""
+SECTIONS = {"mapNodes", "items", "npcs"}
+
+"""The number of characters read from the file at a time."""
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """
+    A buffer over a text stream, from which JSON values are decoded one at
+    a time.  Only the part of the file not yet decoded is kept in memory.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> None:
+        """Discard what has been decoded and read more of the file."""
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+
+    def peek(self) -> str:
+        """Skip whitespace, then return the next character, or "" at the
+        end of the file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self._fill(self.chunk_size)
+
+    def expect(self, char: str) -> None:
+        """Skip whitespace, then consume the given character.
+
+        Raises:
+            json.JSONDecodeError: if the next character is another
+        """
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Skip whitespace, then decode the next value.
+
+        Raises:
+            json.JSONDecodeError: if the value is malformed
+        """
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            else:
+                # A number running up to the end of the buffer may go on
+                # in the next chunk.
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            # Read ever larger chunks, so that a value much longer than a
+            # chunk is not decoded over and over again.
+            self._fill(size)
+            size *= 2
+
+
+def iter_world(
+    stream: TextIO, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[str, Union[str, None], Any]]:
+    """Read a world file incrementally.
+
+    Args:
+        stream: the world file, opened for reading
+        chunk_size: the number of characters to read at a time
+
+    Returns:
+        An iterator over the entries of the world.  The entries of
+        "mapNodes", "items", and "npcs" are yielded one at a time as
+        (section, key, value) tuples; any other member of the top-level
+        object is yielded whole as a (member, None, value) tuple.
+
+    Raises:
+        json.JSONDecodeError: if the file is not a well-formed world
+    """
+    reader = _Reader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        member = reader.value()
+        reader.expect(":")
+        if member in SECTIONS and reader.peek() == "{":
+            reader.expect("{")
+            if reader.peek() == "}":
+                reader.expect("}")
+            else:
+                while True:
+                    key = reader.value()
+                    reader.expect(":")
+                    yield member, key, reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.expect(",")
+                reader.expect("}")
+        else:
+            yield member, None, reader.value()
+
+        if reader.peek() != ",":
+            break
+        reader.expect(",")
+    reader.expect("}")
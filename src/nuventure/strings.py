@@ -0,0 +1,219 @@
+"""String table module for Nuventure, a poor man's implementation of ScummVM.
+
+Descriptions are the bulk of a world's memory, yet most of them are never
+shown in a given session.  Building a world moves all of its prose into a
+string table: a single file of UTF-8 text indexed by offsets, which is
+mapped into memory rather than read.  In the built world JSON, each piece
+of prose is replaced by its number in the table, and the text is only
+decoded when it is shown.  Since the table is mapped read-only, every
+process serving the same world shares its pages.
+
+Run this module from the source directory to build a world:
+
+    python -m nuventure.strings ../data/dirtest.json ../data/dirtest.built.json
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Union
+
+"""The first bytes of every string table file."""
+MAGIC = b"NVSTRTB1"
+
+"""The header following the magic number: a value for telling the byte
+order the offsets were written in, and the number of strings."""
+_HEADER = struct.Struct("=II")
+_BYTE_ORDER_MARK = 0x01020304
+
+"""The prose fields of each section of the world JSON."""
+PROSE_FIELDS = {
+    "mapNodes": (
+        "longDescription",
+        "shortDescription",
+        "longDescriptionWithState",
+        "shortDescriptionWithState",
+    ),
+    "items": (
+        "inSceneDescription",
+        "longDescription",
+        "takeDescription",
+        "shortDescription",
+        "useDescription",
+        "useAltDescription",
+    ),
+    "npcs": ("inSceneDescription",),
+}
+
+
+def text(strings, value: Union[str, int, None]) -> Union[str, None]:
+    """Returns a piece of prose, looking it up in a string table if it has
+    been replaced by its number there."""
+    if isinstance(value, int):
+        return strings[value]
+    return value
+
+
+class NVStringTable:
+    """
+    A string table file, mapped into memory.  Strings are looked up by
+    number, and decoded afresh on each lookup.
+
+    Strings added while the game runs, such as the travel descriptions of
+    links made after loading, cannot be written to the file; they are kept
+    in memory in `extra`, numbered on from the last string in the file.
+    """
+
+    def __init__(self, pathname: str):
+        """Map a string table file into memory.
+
+        Args:
+            pathname: the string table file to map
+
+        Raises:
+            ValueError: if the file is not a string table written on a
+                machine of the same byte order
+        """
+        self.pathname = os.path.abspath(pathname)
+        with open(pathname, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{pathname}: not a string table")
+        mark, count = _HEADER.unpack_from(self._map, len(MAGIC))
+        if mark != _BYTE_ORDER_MARK:
+            self.close()
+            raise ValueError(f"{pathname}: string table has the wrong byte order")
+
+        start = len(MAGIC) + _HEADER.size
+        self._data = start + (count + 1) * 8
+        self._offsets = memoryview(self._map)[start : self._data].cast("Q")
+        self._count = count
+        self.extra = []
+
+    def __reduce__(self):
+        # The mapping itself cannot be saved, but the file can be mapped
+        # again wherever the table is loaded.
+        return (NVStringTable, (self.pathname,), {"extra": self.extra})
+
+    def __len__(self) -> int:
+        """Returns the number of strings in the table."""
+        return self._count + len(self.extra)
+
+    def __getitem__(self, string_id: int) -> str:
+        """Returns the string with the given number."""
+        if string_id >= self._count:
+            return self.extra[string_id - self._count]
+        begin = self._data + self._offsets[string_id]
+        end = self._data + self._offsets[string_id + 1]
+        return self._map[begin:end].decode("utf-8")
+
+    def append(self, string: str) -> None:
+        """Add a string to the table, in memory, numbered next."""
+        self.extra.append(string)
+
+    def close(self) -> None:
+        """Unmap the file.  No strings may be looked up afterward."""
+        if getattr(self, "_offsets", None) is not None:
+            self._offsets.release()
+            self._offsets = None
+        self._map.close()
+
+
+def write_string_table(pathname: str, strings: Iterable[str]) -> None:
+    """Write a string table file.
+
+    Args:
+        pathname: the file to write
+        strings: the strings, in the order of their numbers
+    """
+    blobs = [string.encode("utf-8") for string in strings]
+    offsets = array("Q", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+
+    with open(pathname, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(_HEADER.pack(_BYTE_ORDER_MARK, len(blobs)))
+        fh.write(offsets.tobytes())
+        for blob in blobs:
+            fh.write(blob)
+
+
+def build_world(source: str, dest: str) -> int:
+    """Build a world, moving its prose into a string table.
+
+    The string table is written next to the built world JSON, with the
+    same name but the extension ".strings", and the built JSON names it
+    under "stringTable".  Identical pieces of prose are stored once.
+
+    Args:
+        source: the world JSON to build from
+        dest: the built world JSON to write
+
+    Returns:
+        The number of strings in the table.
+    """
+    with open(source, "r") as fh:
+        world = json.load(fh)
+
+    strings = []
+    ids = {}
+
+    def intern(value):
+        if not isinstance(value, str):
+            return value
+        if value not in ids:
+            ids[value] = len(strings)
+            strings.append(value)
+        return ids[value]
+
+    for section, fields in PROSE_FIELDS.items():
+        for entity in world.get(section, {}).values():
+            for field in fields:
+                if field in entity:
+                    entity[field] = intern(entity[field])
+    for node in world.get("mapNodes", {}).values():
+        for link in node["linkedNodes"]:
+            link["travelDescription"] = intern(link["travelDescription"])
+
+    # The table is named first, so that a world read as a stream knows of
+    # it before reading any prose.
+    table = os.path.splitext(dest)[0] + ".strings"
+    world = {"stringTable": os.path.basename(table), **world}
+    write_string_table(table, strings)
+    with open(dest, "w") as fh:
+        json.dump(world, fh)
+
+    return len(strings)
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line and build a world."""
+    argp = argparse.ArgumentParser(
+        prog="nuventure.strings", description="Move a world's prose into a string table."
+    )
+    argp.add_argument("source", help="the world JSON to build from")
+    argp.add_argument("dest", help="the built world JSON to write")
+    args = argp.parse_args(argv[1:])
+
+    count = build_world(args.source, args.dest)
+    print(f"{args.dest}: {count} strings", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,126 @@
+"""Suggestion module for Nuventure, a poor man's implementation of ScummVM.
+
+NVSuggestionIndex proposes what the player may have meant when they type
+a word the game does not know.  Terms are indexed by their character
+bigrams, so a misspelling is only compared against terms that share some
+of its bigrams rather than against every verb and noun in the world.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import heapq
+from typing import Collection, Iterable, Mapping, Union
+
+from thefuzz import fuzz
+
+"""The most terms that are scored with TheFuzz for a single suggestion."""
+MAX_CANDIDATES = 64
+
+
+def _bigrams(word: str) -> set[str]:
+    """Returns the character bigrams of a word, padded so that its first
+    and last letters count for something on their own."""
+    padded = f"^{word}$"
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+class NVSuggestionIndex:
+    """
+    An index of the terms a player might have meant to type.  Each term
+    denotes a name, which is what filtering by scope is done on: the noun
+    "william the merchant" denotes the NPC "william", say, whereas a verb
+    simply denotes itself.
+    """
+
+    def __init__(self, terms: Union[Mapping[str, str], Iterable[str]] = ()):
+        """Create a new index.
+
+        Args:
+            terms: either the terms to index, or a mapping of the terms
+                onto the names they denote
+        """
+        self.terms = []
+        self.names = []
+        self.grams = {}
+        self._ids = {}
+        self.add_terms(terms)
+
+    def __len__(self) -> int:
+        """Returns the number of terms in the index."""
+        return len(self.terms)
+
+    def add_terms(self, terms: Union[Mapping[str, str], Iterable[str]]) -> None:
+        """Add terms to the index.
+
+        Args:
+            terms: either the terms to index, or a mapping of the terms
+                onto the names they denote
+        """
+        if isinstance(terms, Mapping):
+            pairs = terms.items()
+        else:
+            pairs = ((term, term) for term in terms)
+
+        for term, name in pairs:
+            term = term.lower()
+            if term in self._ids:
+                continue
+            term_id = len(self.terms)
+            self._ids[term] = term_id
+            self.terms.append(term)
+            self.names.append(name)
+            for gram in _bigrams(term):
+                self.grams.setdefault(gram, []).append(term_id)
+
+    def suggest(
+        self,
+        word: str,
+        limit: int = 3,
+        scope: Union[Collection[str], None] = None,
+        cutoff: int = 0,
+    ) -> list[str]:
+        """Propose the terms most like the given word.
+
+        Args:
+            word: the word as the player typed it
+            limit: the most terms to propose (defaults to 3)
+            scope: if given, only terms denoting these names are proposed
+            cutoff: the lowest TheFuzz ratio worth proposing (defaults to 0)
+
+        Returns:
+            Up to `limit` terms, best first, each denoting a different name.
+        """
+        word = word.lower()
+
+        # Count the bigrams that each term shares with the word, and only
+        # score the terms sharing the most.
+        shared = {}
+        for gram in _bigrams(word):
+            for term_id in self.grams.get(gram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        # A word sharing no bigram with any term is still compared against
+        # every term of an index small enough to score whole, as the verbs'.
+        if not shared and len(self.terms) <= MAX_CANDIDATES:
+            shared = dict.fromkeys(range(len(self.terms)), 0)
+
+        if scope is not None:
+            shared = {i: n for i, n in shared.items() if self.names[i] in scope}
+
+        candidates = heapq.nlargest(MAX_CANDIDATES, shared, key=shared.__getitem__)
+
+        # Keep the best-scoring term for each name, then take the top few.
+        best = {}
+        for term_id in candidates:
+            ratio = fuzz.ratio(word, self.terms[term_id])
+            name = self.names[term_id]
+            if ratio >= cutoff and (name not in best or ratio > best[name][0]):
+                best[name] = (ratio, self.terms[term_id])
+
+        return [term for _, term in heapq.nlargest(limit, best.values())]
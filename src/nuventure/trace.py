@@ -0,0 +1,156 @@
+"""Tracing module for Nuventure, a poor man's implementation of ScummVM.
+
+While tracing is enabled, the time taken by each phase of each turn (see
+NVTurnResult.timings) and by each scene rendered is recorded into a
+histogram per phase, which may be queried from code:
+
+    from nuventure import trace
+
+    trace.enable()
+    ...
+    trace.histogram("parse").percentile(0.99)
+
+Each trace point is guarded by a test of TRACING, so that while tracing is
+disabled, as it is by default, it costs one global lookup and nothing is
+timed or recorded on its account.
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+from typing import Union
+
+"""Whether trace points record anything.  Set this with enable() and disable()."""
+TRACING = False
+
+"""The phases recorded while tracing, in the order they happen in a turn."""
+PHASES = ("read", "parse", "invoke", "tic", "render")
+
+"""The number of buckets in a histogram; the last one takes every duration
+of 2 ** (BUCKETS - 2) microseconds or more."""
+BUCKETS = 40
+
+"""The histogram of each phase recorded so far, keyed by phase."""
+HISTOGRAMS = {}
+
+
+class NVHistogram:
+    """
+    An NVHistogram counts durations in buckets of powers of two
+    microseconds: bucket 0 holds durations under one microsecond, and
+    bucket n those of 2 ** (n - 1) microseconds up to 2 ** n.  Percentiles
+    are therefore given as the upper bound of the bucket they fall in,
+    which is at most twice the true value.
+    """
+
+    __slots__ = ("counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self):
+        """Create a new, empty histogram."""
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, seconds: float) -> None:
+        """Count a duration, in seconds."""
+        bucket = min(int(seconds * 1e6).bit_length(), BUCKETS - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if self.minimum is None or seconds < self.minimum:
+            self.minimum = seconds
+        if self.maximum is None or seconds > self.maximum:
+            self.maximum = seconds
+
+    def mean(self) -> Union[float, None]:
+        """Returns the mean duration in seconds, or None if there are none."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, fraction: float) -> Union[float, None]:
+        """Returns the duration in seconds under which the given fraction of
+        the durations fall, or None if there are none.
+
+        Args:
+            fraction: the fraction of durations, from 0 to 1, e.g. 0.99 for
+                the 99th percentile
+        """
+        if not self.count:
+            return None
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min((1 << bucket) / 1e6, self.maximum)
+        return self.maximum
+
+    def summary(self) -> dict[str, Union[int, float, None]]:
+        """Returns the count, mean, minimum, median, 90th and 99th
+        percentiles, and maximum of the durations, in seconds."""
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.minimum,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "max": self.maximum,
+        }
+
+
+def enable() -> None:
+    """Start recording at trace points."""
+    global TRACING  # pylint: disable=global-statement
+    TRACING = True
+
+
+def disable() -> None:
+    """Stop recording at trace points.  What has been recorded is kept."""
+    global TRACING  # pylint: disable=global-statement
+    TRACING = False
+
+
+def reset() -> None:
+    """Forget everything recorded so far."""
+    HISTOGRAMS.clear()
+
+
+def record(phase: str, seconds: float) -> None:
+    """Record the time taken by a phase.  Trace points call this only
+    while TRACING is set.
+
+    Args:
+        phase: the phase, usually one of PHASES
+        seconds: the time it took
+    """
+    histogram = HISTOGRAMS.get(phase)
+    if histogram is None:
+        histogram = HISTOGRAMS[phase] = NVHistogram()
+    histogram.add(seconds)
+
+
+def record_turn(timings: dict[str, float]) -> None:
+    """Record the time taken by each phase of a turn.
+
+    Args:
+        timings: the timings of the turn, as in NVTurnResult.timings
+    """
+    for phase, seconds in timings.items():
+        record(phase, seconds)
+
+
+def histogram(phase: str) -> Union[NVHistogram, None]:
+    """Returns the histogram of a phase, or None if it was never recorded."""
+    return HISTOGRAMS.get(phase)
+
+
+def summary() -> dict[str, dict]:
+    """Returns the summary of the histogram of every phase recorded."""
+    return {phase: hist.summary() for phase, hist in HISTOGRAMS.items()}
@@ -9,51 +9,123 @@ Nuventure is licensed under the terms of the MIT License, furnished
 in the LICENSE file at the root directory of this distribution.
 """
 
-import json
-from nuventure import nv_print
-from nuventure.item import NVItem, NVWeapon, NVSpellbook, NVLamp
+import os
+import sys
+import textwrap
+import time
+from typing import Iterator, Mapping, Union
+
+from nuventure import DEFAULT_WIDTH, nv_output, trace
+from nuventure.item import NVItem, NVItemSet, NVWeapon, NVSpellbook, NVLamp
 from nuventure.actor import NVActor
+from nuventure.graph import DIRECTIONS_BY_NAME, NVWorldGraph
+from nuventure.ownership import NVOwnershipIndex
+from nuventure.paths import NVPathfinder
+from nuventure.region import DEFAULT_RADIUS, NVActiveRegion
+from nuventure.schedule import NVScheduler
+from nuventure.stream import iter_world
+from nuventure.strings import NVStringTable, text
+
+"""The class of item built for each type of item in the world JSON."""
+ITEM_TYPES = {"lamp": NVLamp, "weapon": NVWeapon, "spellbook": NVSpellbook}
+
+"""The position of each description of a node in NVWorldNode.descriptions."""
+DESCRIPTION_KEYS = {"long": 0, "short": 1, "long_stateful": 2, "short_stateful": 3}
 
 
 class NVWorldNode:
     """
     A map node is a point on the map to which an Actor may travel.
     Nodes contain various internal state including a list of neighbor
-    nodes, which in technical terms is a directed graph.
+    nodes, which in technical terms is a directed graph.  The links
+    themselves are kept in the world's NVWorldGraph, where each node is
+    known by its number.
+
+    Each node also keeps track of the actors standing in it, which the
+    actors update themselves as they come and go (see NVActor.location).
+
+    Rendered scenes are kept in `scenes`, keyed by their length, whether
+    they are stateful, and the width they were wrapped to.  Anything that
+    changes what a scene shows, i.e. the items or actors in the node,
+    calls invalidate() to throw them away.
     """
 
-    def __init__(self, i_name: str, dbinfo: dict):
+    __slots__ = (
+        "internal_name",
+        "friendly_name",
+        "id",
+        "graph",
+        "items",
+        "occupants",
+        "visited_p",
+        "wanted_state",
+        "descriptions",
+        "scenes",
+    )
+
+    def __init__(self, i_name: str, dbinfo: dict, graph: NVWorldGraph):
         """Create a new map node.
 
         Args:
             i_name: the internal name of the node, from the JSON file
             dbinfo: the information from the JSON file regarding this node
+            graph: the graph of the world, to which this node's links
+                are added
         """
-        self.internal_name = i_name
+        self.internal_name = sys.intern(i_name)
         self.friendly_name = dbinfo["friendlyName"]
-        self.items = []
-        self.neighbors = {}
-        self.descriptions = {}
-        self.npcs = []
+        self.graph = graph
+        self.id = graph.add_node(i_name, dbinfo["linkedNodes"])
+        self.scenes = {}
+        self.items = NVItemSet(on_change=self.invalidate)
+        self.occupants = {}
         self.visited_p = False
         self.wanted_state = dbinfo["requiresState"]
+        self.descriptions = (
+            dbinfo["longDescription"],
+            dbinfo["shortDescription"],
+            dbinfo["longDescriptionWithState"],
+            dbinfo["shortDescriptionWithState"],
+        )
+
+    @property
+    def npcs(self) -> list:
+        """The NPCs here, in the order they arrived."""
+        return [actor for actor in self.occupants if actor.is_npc()]
+
+    @property
+    def neighbors(self) -> dict[str, dict[str, str]]:
+        """The node's links, keyed by direction, each giving the "name" of
+        the node it leads to and its "travel_description".  This is built
+        afresh on each access; prefer exits and travel_description."""
+        graph = self.graph
+        return {
+            direction: {
+                "name": graph.names[graph.targets[i]],
+                "travel_description": graph.strings[graph.travel[i]],
+            }
+            for i, direction in zip(
+                range(graph.offsets[self.id], graph.offsets[self.id + 1]), self.exits()
+            )
+        }
 
-        self.descriptions["long"] = dbinfo["longDescription"]
-        self.descriptions["short"] = dbinfo["shortDescription"]
-        self.descriptions["long_stateful"] = dbinfo["longDescriptionWithState"]
-        self.descriptions["short_stateful"] = dbinfo["shortDescriptionWithState"]
+    def exits(self) -> tuple[str, ...]:
+        """Returns the names of the directions leading out of this node."""
+        return self.graph.exit_names[self.id]
 
-        while dbinfo["linkedNodes"]:
-            neighbor = dbinfo["linkedNodes"].pop()
-            self.neighbors[neighbor["direction"]] = {
-                "name": neighbor["name"],
-                "travel_description": neighbor["travelDescription"],
-            }
+    def travel_description(self, direction: str) -> str:
+        """Returns the description of travelling the given way from this
+        node, or None if there is no way out in that direction."""
+        return self.graph.travel_description(self.id, DIRECTIONS_BY_NAME[direction])
 
     def __str__(self) -> str:
         """Returns the node's internal name."""
         return self.internal_name
 
+    def invalidate(self) -> None:
+        """Throw away the node's rendered scenes, which are out of date."""
+        self.scenes.clear()
+
     def render(self, long_p: bool = False, stateful_p: bool = False) -> None:
         """Print an appropriate description of the given node.
 
@@ -66,20 +138,31 @@ class NVWorldNode:
                 otherwise.
             stateful_p: True if the description should be the one triggered by
                 the required state, False otherwise."""
+        start = time.perf_counter() if trace.TRACING else 0.0
         length = "long" if long_p or not self.visited_p else "short"
-        print("")
-        nv_print(self.friendly_name)
-        nv_print(self.describe(length, stateful_p))
-
+        output = nv_output()
+        key = (length, stateful_p, getattr(output, "width", DEFAULT_WIDTH))
+        scene = self.scenes.get(key)
+        if scene is None:
+            scene = self.scenes[key] = self._compose(*key)
+        output.write(scene)
+        if trace.TRACING:
+            trace.record("render", time.perf_counter() - start)
+
+    def _compose(self, length: str, stateful_p: bool, width: int) -> str:
+        """Returns the text of a scene, wrapped to the given width."""
+        paragraphs = [[self.friendly_name, self.describe(length, stateful_p)]]
         if self.npcs:
-            print("")
-            for actor in self.npcs:
-                nv_print(actor.description)
-
+            paragraphs.append([actor.description for actor in self.npcs])
         if self.items:
-            print("")
-            for item in self.items:
-                nv_print(item.look_description)
+            paragraphs.append([item.look_description for item in self.items])
+
+        lines = []
+        for paragraph in paragraphs:
+            lines.append("")
+            for line in paragraph:
+                lines.extend(textwrap.wrap(line, width) or [""])
+        return "\n".join(lines) + "\n"
 
     def describe(self, length: str = "long", stateful_p: bool = False) -> str:
         """Returns a description of the given node.
@@ -104,16 +187,46 @@ class NVWorldNode:
             The selected description of the node as a string.
         """
         if stateful_p is True:
-            return self.descriptions[f"{length}_stateful"]
+            length = f"{length}_stateful"
 
-        return self.descriptions[length]
+        return text(self.graph.strings, self.descriptions[DESCRIPTION_KEYS[length]])
 
     def add_item(self, item: NVItem) -> None:
         """Adds an item to the given node.
 
         Args:
             item: the item to add"""
-        self.items.append(item)
+        self.items.add(item)
+
+
+class NVNodeTable(Mapping):
+    """
+    The nodes of a world, keyed by internal name as in the world JSON and
+    backed by a list in the order of their numbers, so that a node may be
+    looked up either way without keeping a second dict of them.
+    """
+
+    def __init__(self, graph: NVWorldGraph):
+        """Create a new, empty table over the given graph's names."""
+        self.graph = graph
+        self.by_id = []
+
+    def __getitem__(self, name: str) -> NVWorldNode:
+        return self.by_id[self.graph.ids[name]]
+
+    def __contains__(self, name) -> bool:
+        return name in self.graph.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.graph.names)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def add(self, node: NVWorldNode) -> None:
+        """Add a node, which must be numbered next, to the table."""
+        assert node.id == len(self.by_id)
+        self.by_id.append(node)
 
 
 class NVWorld:
@@ -128,40 +241,191 @@ class NVWorld:
         Args:
             pathname: The world info JSON file to load from disk.
         """
-        self.nodes = {}
+        self.graph = NVWorldGraph()
+        self.nodes = NVNodeTable(self.graph)
         self.items = {}
         self.actors = {}
+        self.players = {}
+        self.ownership = NVOwnershipIndex()
+        self.strings = None
+        self.paths = None
+        self.game_instance = game_instance
+        self.crowd = None
+        self.region = None
+        self.tic = 0
+        self.scheduler = NVScheduler()
 
-        with open(pathname, "r") as fh:
-            rawdata = json.load(fh)
-
-        for key, value in rawdata["mapNodes"].items():
-            self.nodes[key] = NVWorldNode(key, value)
-
-        for key, value in rawdata["npcs"].items():
-            movement_rate = value["movementRate"]
-            where = self.nodes[value["originCell"]]
-            i_name = key
-            f_name = value["friendlyName"]
+        deferred_npcs, deferred_items = self._read(pathname)
+        self._resolve(deferred_npcs, deferred_items)
 
-            actor = NVActor(self, where, i_name, f_name, 100, movement_rate)
-            actor.description = value["inSceneDescription"]
-            self.actors[i_name] = actor
-            self.nodes[value["originCell"]].npcs.append(actor)
+    def _read(self, pathname: str) -> tuple[list, list]:
+        """Build the nodes, NPCs, and items of a world JSON file as they are
+        read, and finish the graph.
 
-        for key, value in rawdata["items"].items():
-            i_types = {"lamp": NVLamp, "weapon": NVWeapon, "spellbook": NVSpellbook}
-            klass = i_types.get(value["type"], NVItem)
-            self.items[key] = klass(key, value, self)
+        Each entry is built as soon as it is read, so the raw world is
+        never in memory all at once.  NPCs and items may refer to nodes
+        and owners further on in the file; those wait for a second pass.
 
-        self.game_instance = game_instance
+        Returns:
+            The (key, value) pairs of the NPCs and of the items that must
+            wait, in the order they were read."""
+        deferred_npcs = []
+        deferred_items = []
+        with open(pathname, "r") as fh:
+            for section, key, value in iter_world(fh):
+                if section == "mapNodes":
+                    self.nodes.add(NVWorldNode(key, value, self.graph))
+                elif section == "npcs":
+                    if value["originCell"] in self.nodes:
+                        self._add_npc(key, value)
+                    else:
+                        deferred_npcs.append((key, value))
+                elif section == "items":
+                    if self._resolvable_p(value):
+                        self._add_item(key, value)
+                    else:
+                        deferred_items.append((key, value))
+                elif section == "stringTable" and value:
+                    # A built world keeps its prose in a string table, by number.
+                    table = os.path.join(os.path.dirname(pathname), value)
+                    self.strings = self.graph.strings = NVStringTable(table)
+
+        self.graph.finish()
+        self.paths = NVPathfinder(self.graph)
+        return deferred_npcs, deferred_items
+
+    def _resolve(self, deferred_npcs: list, deferred_items: list) -> None:
+        """Build the NPCs and items that waited for the whole map, and
+        resolve what refers to nodes anywhere on it."""
+        for key, value in deferred_npcs:
+            self._add_npc(key, value)
+        for key, value in deferred_items:
+            self._add_item(key, value)
+
+        # Goals may lie anywhere on the map, so they wait for every node.
+        for actor in self.actors.values():
+            if isinstance(actor.goal, str):
+                actor.goal = self.nodes[actor.goal]
+
+        if self.strings is not None:
+            for item in self.items.values():
+                item.strings = self.strings
+
+    def _add_npc(self, key: str, value: dict) -> None:
+        """Build an NPC from its entry in the world JSON."""
+        movement_rate = value["movementRate"]
+        where = self.nodes[value["originCell"]]
+        i_name = key
+        f_name = value["friendlyName"]
+
+        kind = value.get("type")
+        actor = NVActor(self, where, i_name, f_name, 100, movement_rate, kind)
+        actor.description = value["inSceneDescription"]
+        actor.goal = value.get("goalCell")
+
+    def _add_item(self, key: str, value: dict) -> None:
+        """Build an item from its entry in the world JSON."""
+        klass = ITEM_TYPES.get(value["type"], NVItem)
+        self.items[key] = klass(key, value, self)
+
+    def _resolvable_p(self, value: dict) -> bool:
+        """Returns whether the node and owner an item's entry refers to,
+        if any, have been built yet."""
+        cell = value["originCell"]
+        owner = value["originOwner"]
+        return (cell is None or cell in self.nodes) and (owner is None or owner in self.actors)
 
     def add_actor(self, actor) -> None:
-        """Adds an actor to the world.
+        """Adds an actor to the world, waking it on the next tic if it has
+        anything to do.
 
         Args:
             actor: the Actor object to add"""
         self.actors[actor.internal_name] = actor
+        if self.crowd:
+            self.crowd.dirty = True
+        if not actor.is_npc():
+            self.players[actor.internal_name] = actor
+        if not actor.idle_p():
+            self.wake(actor)
+
+    def wake(self, actor) -> None:
+        """Give an actor a turn on the next world tic.  This must be called
+        after changing anything that gives an idle actor something to do,
+        such as its movement rate, other than by NVActor's own methods.
+
+        Args:
+            actor: the Actor object to wake"""
+        self.scheduler.schedule(actor, self.tic + 1)
+
+    def remove_actor(self, actor) -> None:
+        """Removes an actor from the world, and from wherever it stood.
+        Whatever it carried falls where it stood, or is nowhere if it
+        stood nowhere.
+
+        Args:
+            actor: the Actor object to remove"""
+        for item in list(actor.inventory.values()):
+            actor.inventory.remove(item)
+            if actor.location is not None:
+                item.drop(actor)
+            else:
+                item.owner = None
+                self.ownership.release(item)
+        del self.actors[actor.internal_name]
+        self.players.pop(actor.internal_name, None)
+        self.scheduler.cancel(actor)
+        if self.crowd:
+            self.crowd.dirty = True
+        if self.region:
+            self.region.forget(actor)
+        actor.location = None
+
+    def link(self, node: NVWorldNode, direction: str, dest: NVWorldNode, travel: str) -> None:
+        """Make the given way out of a node lead to another, e.g. when a
+        door is opened.  Routes are found afresh thereafter.
+
+        Args:
+            node: the node the link leads out of
+            direction: the direction of the link
+            dest: the node the link leads to
+            travel: the description of travelling the link
+        """
+        self.graph.set_link(node.id, DIRECTIONS_BY_NAME[direction], dest.id, travel)
+
+    def unlink(self, node: NVWorldNode, direction: str) -> bool:
+        """Remove the given way out of a node, e.g. when a door is shut.
+        Routes are found afresh thereafter.
+
+        Returns:
+            True if there was such a way out, False otherwise."""
+        return self.graph.remove_link(node.id, DIRECTIONS_BY_NAME[direction])
+
+    def route(self, node: NVWorldNode, dest: NVWorldNode) -> Union[list[str], None]:
+        """Returns the directions to take, in order, along a shortest route
+        between two nodes, or None if there is no route."""
+        route = self.paths.route(node.id, dest.id)
+        return None if route is None else [str(direction) for direction in route]
+
+    def vocabulary(self) -> dict[str, str]:
+        """Returns the nouns by which a player may refer to things in the world.
+
+        Items and NPCs may be named either by their internal name or by
+        their friendly name, in any case; items may also be named by their
+        aliases.
+
+        Returns:
+            A dict mapping each noun onto the internal name it denotes."""
+        nouns = {}
+        for entities in (self.actors, self.items):
+            for i_name, entity in entities.items():
+                if i_name == "PLAYER":
+                    continue
+                nouns[i_name.lower()] = i_name
+                nouns[entity.friendly_name.lower()] = i_name
+                for alias in getattr(entity, "aliases", ()):
+                    nouns[alias.lower()] = i_name
+        return nouns
 
     def try_move(self, actor: NVActor, direction: str) -> bool:
         """Attempts to move an actor within the world.
@@ -170,20 +434,110 @@ class NVWorld:
             actor: the actor to attempt to move
             direction: the direction in which to attempt to move that actor
         """
-        loc = actor.location
+        way = DIRECTIONS_BY_NAME.get(direction)
+        if way is None:
+            return False
+
+        graph = self.graph
+        node_id = actor.location.id
+        edge = graph.directions.find(way, graph.offsets[node_id], graph.offsets[node_id + 1])
+        if edge < 0:
+            return False
 
-        if direction in loc.neighbors:
-            destination_node = self.nodes[loc.neighbors[direction]["name"]]
-            actor.location = destination_node
-            return True
+        actor.location = self.nodes.by_id[graph.targets[edge]]
+        return True
 
-        return False
+    def use_batched_movement(self, seed=None) -> None:
+        """Move all NPCs at once during world tics, with NumPy, rather than
+        one at a time through the parser.
+
+        Args:
+            seed: the seed for the random number generator (defaults to
+                seeding from the operating system)
+
+        Raises:
+            ValueError: if the world already simulates only an active region
+
+        See Also:
+            NVCrowd"""
+        from nuventure.crowd import NVCrowd  # pylint: disable=import-outside-toplevel
+
+        if self.region:
+            raise ValueError("batched movement cannot be used with an active region")
+        if self.crowd:
+            self.crowd.close()
+        self.crowd = NVCrowd(self, seed)
+
+    def use_sharded_movement(self, shards: Union[int, None] = None, seed=None) -> None:
+        """Move all NPCs at once during world tics, as with batched movement,
+        but split among worker processes by shards of the map.
+
+        Args:
+            shards: the number of shards, and so of worker processes
+                (defaults to the number of CPUs)
+            seed: the seed for the workers' random number generators
+                (defaults to seeding from the operating system)
+
+        Raises:
+            ValueError: if the world already simulates only an active region
+
+        See Also:
+            NVShardedCrowd"""
+        from nuventure.shard import NVShardedCrowd  # pylint: disable=import-outside-toplevel
+
+        if self.region:
+            raise ValueError("sharded movement cannot be used with an active region")
+        if self.crowd:
+            self.crowd.close()
+        self.crowd = NVShardedCrowd(self, shards, seed)
+
+    def use_active_region(self, radius: int = DEFAULT_RADIUS, seed: int = 0) -> None:
+        """Simulate only the NPCs within a few links of a player during world
+        tics, freezing the rest until a player comes near.
+
+        Args:
+            radius: the number of links from a player within which NPCs
+                are simulated
+            seed: the seed from which frozen NPCs' steps are drawn when
+                they catch up
+
+        Raises:
+            ValueError: if the world already uses batched or sharded movement
+
+        See Also:
+            NVActiveRegion"""
+        if self.crowd:
+            raise ValueError("an active region cannot be used with batched or sharded movement")
+        self.region = NVActiveRegion(self, radius, seed)
 
     def do_world_tic(self):
         """Do a tic within the world.
 
         For each gametic, actors may move the number of nodes specified by
         their movement rate.  Movement direction is randomly chosen per move.
+        Only the actors the scheduler wakes on this tic get a turn; those
+        with more to do afterward are woken again on the next.
         """
-        for actor in self.actors.values():
+        self.tic += 1
+        if self.crowd:
+            self.crowd.do_tic()
+        if self.region:
+            self.region.update()
+
+        for actor in self.scheduler.pop_due(self.tic):
+            # Wandering NPCs are the crowd's to move, and to bury.
+            if self.crowd and actor.is_npc() and actor.goal is None:
+                continue
+            # Far from any player, the living wait to be caught up.
+            if (
+                self.region
+                and actor.is_npc()
+                and not actor.is_dead()
+                and not self.region.active_p(actor)
+            ):
+                self.region.freeze(actor)
+                continue
+            # Dead NPCs remove themselves from the world during their tic.
             actor.do_tic()
+            if self.actors.get(actor.internal_name) is actor and not actor.idle_p():
+                self.wake(actor)
@@ -0,0 +1,293 @@
+"""World generator for Nuventure, a poor man's implementation of ScummVM.
+
+The test world has nine nodes, which is too few to say anything about how
+the engine scales.  This module generates worlds of any size in the same
+format as dirtest.json, so that load time, memory, and the cost of a world
+tic may be measured as functions of the size of the world.
+
+Every generated world is connected, starts at a node named ORIGIN, ends at
+a node named DEST, and links each pair of neighboring nodes both ways using
+opposite directions.  Run this module from the source directory to write a
+world to a file:
+
+    python -m nuventure.worldgen --nodes 100000 --npcs 10000 -o big.json
+    python -m nuventure.worldgen --nodes 5000 --topology tree --seed 7 -o tree.json
+
+https://github.com/tnwae/nuventure
+
+Copyright (c) 2021 by William Ellison.
+<waellison@gmail.com>
+
+Nuventure is licensed under the terms of the MIT License, furnished
+in the LICENSE file at the root directory of this distribution.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+from typing import Union
+
+"""Each direction of travel and the direction leading back the other way."""
+OPPOSITES = {
+    "north": "south",
+    "south": "north",
+    "east": "west",
+    "west": "east",
+    "up": "down",
+    "down": "up",
+}
+
+"""The shapes of map that can be generated.  A grid links each node to the
+nodes beside it; a ring links the nodes in one long loop; a tree branches
+out from ORIGIN without ever looping back; and a random map is a tree with
+extra links added between random pairs of nodes."""
+TOPOLOGIES = ("grid", "ring", "tree", "random")
+
+"""The most links out of a node of a tree, leaving one for the way back."""
+MAX_FANOUT = len(OPPOSITES) - 1
+
+
+def node_names(count: int) -> list[str]:
+    """Returns the internal names of a world's nodes: ORIGIN first, DEST
+    last, and numbered nodes in between."""
+    if count < 2:
+        raise ValueError("a world needs at least two nodes")
+    return ["ORIGIN"] + [f"n{i}" for i in range(1, count - 1)] + ["DEST"]
+
+
+def _link(links: list[dict], here: int, there: int, direction: str) -> bool:
+    """Link two nodes both ways, if neither has used the directions
+    needed yet.
+
+    Args:
+        links: each node's links so far, as direction -> node index
+        here: the index of the node to link from
+        there: the index of the node to link to
+        direction: the direction from `here` to `there`
+
+    Returns:
+        True if the nodes were linked, False otherwise.
+    """
+    back = OPPOSITES[direction]
+    if here == there or direction in links[here] or back in links[there]:
+        return False
+    links[here][direction] = there
+    links[there][back] = here
+    return True
+
+
+def _grid(count: int, **_) -> list[dict]:
+    """Lay the nodes out row by row on a square grid, west to east and
+    north to south."""
+    width = math.ceil(math.sqrt(count))
+    links = [{} for _ in range(count)]
+    for i in range(count):
+        if (i + 1) % width and i + 1 < count:
+            _link(links, i, i + 1, "east")
+        if i + width < count:
+            _link(links, i, i + width, "south")
+    return links
+
+
+def _ring(count: int, **_) -> list[dict]:
+    """Link the nodes in one loop, heading east."""
+    links = [{} for _ in range(count)]
+    for i in range(count):
+        _link(links, i, (i + 1) % count, "east")
+    return links
+
+
+def _tree(count: int, rng: random.Random, fanout: int = 3, **_) -> list[dict]:
+    """Grow a tree breadth first from the first node, giving each node up
+    to `fanout` children in random directions."""
+    fanout = max(1, min(fanout, MAX_FANOUT))
+    links = [{} for _ in range(count)]
+    child = 1
+    for parent in range(count):
+        free = [d for d in OPPOSITES if d not in links[parent]]
+        rng.shuffle(free)
+        for direction in free[: rng.randint(1, fanout)]:
+            if child >= count:
+                return links
+            _link(links, parent, child, direction)
+            child += 1
+        if child >= count:
+            break
+    return links
+
+
+def _random(count: int, rng: random.Random, fanout: int = 3, extra: float = 0.5) -> list[dict]:
+    """Grow a tree, then add about `extra` links per node between random
+    pairs of nodes, wherever both have the directions free."""
+    links = _tree(count, rng, fanout)
+    directions = list(OPPOSITES)
+    for _ in range(int(count * extra)):
+        _link(links, rng.randrange(count), rng.randrange(count), rng.choice(directions))
+    return links
+
+
+_LAYOUTS = {"grid": _grid, "ring": _ring, "tree": _tree, "random": _random}
+
+
+def _node(
+    name: str, index: int, neighbors: dict, names: list[str], items: list[str], npcs: list[str]
+) -> dict:
+    """Returns the JSON for a single node, in which the given items lie
+    and the given NPCs start."""
+    node = {
+        "friendlyName": f"Room {index}" if 0 < index < len(names) - 1 else name.title(),
+        "longDescription": f"You are in room {index} of a generated world.  "
+        f"Passages lead {', '.join(sorted(neighbors))}.",
+        "shortDescription": f"You are in room {index}.",
+        "requiresState": None,
+        "inducesState": None,
+        "longDescriptionWithState": None,
+        "shortDescriptionWithState": None,
+        "linkedNodes": [
+            {
+                "name": names[there],
+                "direction": direction,
+                "travelDescription": f"You head {direction}.",
+            }
+            for direction, there in neighbors.items()
+        ],
+        "itemsPresentOnLoad": items or None,
+    }
+    if npcs:
+        node["npcsPresentOnLoad"] = npcs
+    return node
+
+
+def _item(index: int, cell: str) -> dict:
+    """Returns the JSON for a single item lying in the given node."""
+    return {
+        "friendlyName": f"Trinket {index}",
+        "type": "misc",
+        "inSceneDescription": f"Trinket #{index} lies here.",
+        "longDescription": f"This is trinket #{index}.  It is unremarkable.",
+        "takeDescription": f"You pick up trinket #{index}.",
+        "shortDescription": f"This is trinket #{index}.",
+        "useDescription": None,
+        "useAltDescription": None,
+        "conferStatusOnUse": None,
+        "stateful": False,
+        "defaultState": None,
+        "originCell": cell,
+        "originOwner": None,
+    }
+
+
+def _npc(index: int, cell: str, movement_rate: int) -> dict:
+    """Returns the JSON for a single NPC starting in the given node."""
+    return {
+        "friendlyName": f"Wanderer {index}",
+        "type": "wanderer",
+        "inSceneDescription": f"Wanderer #{index} is here.",
+        "movementRate": movement_rate,
+        "heldItems": [],
+        "conversationLines": [f"I am wanderer #{index}."],
+        "originCell": cell,
+    }
+
+
+def generate_world(
+    nodes: int,
+    npcs: int = 0,
+    items: int = 0,
+    topology: str = "grid",
+    seed: Union[int, None] = None,
+    fanout: int = 3,
+    extra: float = 0.5,
+    movement_rate: int = 1,
+) -> dict:
+    """Generate a world in the format of dirtest.json.
+
+    Args:
+        nodes: the number of nodes, which must be at least two
+        npcs: the number of NPCs, placed in random nodes (defaults to 0)
+        items: the number of items, placed in random nodes (defaults to 0)
+        topology: one of TOPOLOGIES (defaults to "grid")
+        seed: the seed for the random number generator; the same seed
+            and arguments always generate the same world
+        fanout: the most children of each node of a tree or random map
+        extra: the extra links per node of a random map
+        movement_rate: the number of moves each NPC makes per tic
+
+    Returns:
+        A dict with "mapNodes", "items", and "npcs", ready to be written
+        out with json.dump.
+
+    Raises:
+        ValueError: if the topology is unknown or there are too few nodes
+    """
+    if topology not in _LAYOUTS:
+        raise ValueError(f"unknown topology: {topology}")
+
+    rng = random.Random(seed)
+    names = node_names(nodes)
+    links = _LAYOUTS[topology](nodes, rng=rng, fanout=fanout, extra=extra)
+    trinkets = {f"trinket{i}": _item(i, rng.choice(names)) for i in range(items)}
+    wanderers = {
+        f"wanderer{i}": _npc(i, rng.choice(names), movement_rate) for i in range(npcs)
+    }
+
+    # Each node lists what is in it at the start, as in dirtest.json.
+    items_in = {name: [] for name in names}
+    for key, trinket in trinkets.items():
+        items_in[trinket["originCell"]].append(key)
+    npcs_in = {name: [] for name in names}
+    for key, wanderer in wanderers.items():
+        npcs_in[wanderer["originCell"]].append(key)
+
+    return {
+        "mapNodes": {
+            name: _node(name, i, links[i], names, items_in[name], npcs_in[name])
+            for i, name in enumerate(names)
+        },
+        "items": trinkets,
+        "npcs": wanderers,
+    }
+
+
+def main(argv: list[str]) -> int:
+    """Parse the command line and write a generated world."""
+    argp = argparse.ArgumentParser(
+        prog="nuventure.worldgen", description="Generate a world for Nuventure."
+    )
+    argp.add_argument("--nodes", type=int, default=1000, help="the number of nodes")
+    argp.add_argument("--npcs", type=int, default=0, help="the number of NPCs")
+    argp.add_argument("--items", type=int, default=0, help="the number of items")
+    argp.add_argument("--topology", choices=TOPOLOGIES, default="grid", help="the shape of the map")
+    argp.add_argument("--seed", type=int, help="the random seed")
+    argp.add_argument("--fanout", type=int, default=3, help="the most children of a tree node")
+    argp.add_argument("--extra", type=float, default=0.5, help="extra links per random node")
+    argp.add_argument("--movement-rate", type=int, default=1, help="moves per NPC per tic")
+    argp.add_argument("-o", "--output", default="-", help='the file to write ("-" for stdout)')
+    args = argp.parse_args(argv[1:])
+
+    try:
+        world = generate_world(
+            args.nodes,
+            args.npcs,
+            args.items,
+            args.topology,
+            args.seed,
+            args.fanout,
+            args.extra,
+            args.movement_rate,
+        )
+    except ValueError as ex:
+        argp.error(str(ex))
+
+    if args.output == "-":
+        json.dump(world, sys.stdout)
+    else:
+        with open(args.output, "w") as fh:
+            json.dump(world, fh)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,12 @@
+"""Nuventure: replay transcripts of commands without interactive I/O.
+
+William Ellison <waellison@gmail.com>
+https://github.com/tnwae/nuventure
+"""
+
+import sys
+
+from nuventure.replay import main
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -106,7 +106,7 @@ def test_actor_tic_player_died(capsys):
       captured = capsys.readouterr()
       assert captured.out == "You have died."
     
-    assert exit_exc.type == SystemExit
+    assert issubclass(exit_exc.type, SystemExit)
 
 
 def test_actor_tic_npc_died():
@@ -0,0 +1,27 @@
+from nuventure import bench
+
+
+def test_compare_flags_regressions():
+    comparison = bench.compare(
+        {"a_us": 12.0, "b_us": 9.0, "c_us": 1.0}, {"a_us": 10.0, "b_us": 10.0}
+    )
+    assert comparison["a_us"][2] is True
+    assert comparison["b_us"][2] is False
+    assert "c_us" not in comparison
+
+
+def test_quick_suite_measures_every_phase():
+    results = bench.run_suite("data", quick=True, actor_counts=(10,))
+    for name in (
+        "load.world_ms",
+        "parse.first_us",
+        "parse.cached_us",
+        "tic.actors_10_ms",
+        "turn.step_us",
+    ):
+        assert results[name] > 0
+
+
+def test_sharded_tics_only_on_request():
+    assert "10_sharded" not in bench.bench_tic("data", (10,), tics=1)
+    assert bench.bench_tic("data", (10,), tics=1, sharded=True)["10_sharded"] > 0
@@ -0,0 +1,52 @@
+import json
+import os
+import shutil
+import pytest
+from nuventure import cache, game
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in ("dirtest.json", "verbs.json"):
+        shutil.copy(os.path.join("data", name), tmp_path / name)
+    return tmp_path
+
+
+def test_no_cache_is_written_unasked(data_dir):
+    game.NVGame(str(data_dir))
+    assert not (data_dir / "dirtest.nvc").exists()
+
+
+def test_cached_game_plays_the_same(data_dir):
+    cache.compile_world(str(data_dir / "dirtest.json"), str(data_dir / "verbs.json"))
+    assert cache.read_cache(str(data_dir / "dirtest.nvc")) is not None
+
+    plain = game.NVGame("data")
+    cached = game.NVGame(str(data_dir))
+    assert cached.world.game_instance is cached
+    for command in ("look", "take lamp", "light lamp", "down", "west", "help"):
+        assert cached.step(command).output == plain.step(command).output
+
+
+def test_stale_cache_is_rebuilt(data_dir):
+    world_file = data_dir / "dirtest.json"
+    cache.compile_world(str(world_file), str(data_dir / "verbs.json"))
+
+    # Touching a file without changing it leaves the cache good.
+    os.utime(world_file, ns=(0, 0))
+    assert cache.read_cache(str(data_dir / "dirtest.nvc")) is not None
+
+    world = json.loads(world_file.read_text())
+    world["mapNodes"]["ORIGIN"]["friendlyName"] = "Hovel"
+    world_file.write_text(json.dumps(world))
+    assert cache.read_cache(str(data_dir / "dirtest.nvc")) is None
+
+    assert game.NVGame(str(data_dir)).world.nodes["ORIGIN"].friendly_name == "Hovel"
+    loaded, _ = cache.read_cache(str(data_dir / "dirtest.nvc"))
+    assert loaded.nodes["ORIGIN"].friendly_name == "Hovel"
+
+
+def test_corrupt_cache_is_rebuilt(data_dir):
+    (data_dir / "dirtest.nvc").write_bytes(b"NVWCACHE garbage")
+    assert game.NVGame(str(data_dir)).world.nodes["ORIGIN"].friendly_name == "Home"
+    assert cache.read_cache(str(data_dir / "dirtest.nvc")) is not None
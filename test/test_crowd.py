@@ -0,0 +1,69 @@
+from nuventure import actor, game
+
+
+def _two_steps_from(world, name):
+    ends = set()
+    for first in world.nodes[name].neighbors.values():
+        for second in world.nodes[first["name"]].neighbors.values():
+            ends.add(second["name"])
+    return ends
+
+
+def test_adjacency_follows_neighbors():
+    world = game.NVGame("data").world
+    world.use_batched_movement(seed=1)
+    crowd = world.crowd
+    for i, node in enumerate(crowd.nodes):
+        linked = crowd.indices[crowd.indptr[i] : crowd.indptr[i + 1]].tolist()
+        assert [crowd.nodes[j].internal_name for j in linked] == [
+            link["name"] for link in node.neighbors.values()
+        ]
+
+
+def test_batched_moves_follow_movement_rate():
+    the_game = game.NVGame("data")
+    world = the_game.world
+    walkers = [
+        actor.NVActor(world, world.nodes["ORIGIN"], f"walker{i}", "Walker", movement_rate=2)
+        for i in range(50)
+    ]
+    world.use_batched_movement(seed=1)
+    world.do_world_tic()
+
+    reachable = _two_steps_from(world, "ORIGIN")
+    assert {walker.location.internal_name for walker in walkers} <= reachable
+    assert world.actors["william"].location.internal_name == "epsilon"
+    assert the_game.player.location.internal_name == "ORIGIN"
+
+
+def test_dead_npcs_are_removed():
+    for batched in (False, True):
+        the_game = game.NVGame("data")
+        world = the_game.world
+        if batched:
+            world.use_batched_movement(seed=1)
+        world.actors["william"].injure(100)
+        world.do_world_tic()
+        assert "william" not in world.actors
+        assert "PLAYER" in world.actors
+
+
+def test_new_npcs_join_the_crowd():
+    world = game.NVGame("data").world
+    world.use_batched_movement(seed=1)
+    walker = actor.NVActor(world, world.nodes["ORIGIN"], "walker", "Walker")
+    world.do_world_tic()
+    assert walker in world.crowd.npcs
+    assert walker.location.internal_name in {"alpha", "omega", "phi"}
+
+
+def test_roster_follows_a_death_and_a_birth_in_one_tic():
+    world = game.NVGame("data").world
+    world.use_batched_movement(seed=1)
+    world.do_world_tic()
+    world.actors["william"].injure(100)
+    world.remove_actor(world.actors["william"])
+    newcomer = actor.NVActor(world, world.nodes["ORIGIN"], "newcomer", "Newcomer")
+    world.do_world_tic()
+    assert world.crowd.npcs == [newcomer]
+    assert newcomer.location.internal_name in {"alpha", "omega", "phi"}
@@ -7,3 +7,45 @@ def test_create_game():
     assert game_fixture.start_node.internal_name == "ORIGIN"
     assert not game_fixture.player.is_npc()
     assert game_fixture.player in game_fixture.world.actors.values()
+
+
+def test_bad_target_suggests_nouns_in_scope(capsys):
+    game_fixture._suggest_nouns("take", "lmap")
+    assert capsys.readouterr().out == "Did you mean: lamp?\n"
+
+
+def test_step_reports_successful_turn():
+    headless = game.NVGame("./data")
+    result = headless.step("take the lamp")
+    assert (result.verb, result.target, result.error) == ("take", "lamp", None)
+    assert result.output == ["You pick up the lamp and place it in your rucksack."]
+    assert result.tic_ran and not result.quit
+
+
+def test_step_reports_errors():
+    headless = game.NVGame("./data")
+    assert headless.step("drop lamp").error == "badarg"
+    assert headless.step("take").error == "noargs"
+    assert headless.step("take lamp sword").error == "toomanyargs"
+    assert headless.step("frobnicate").error == "unknown"
+    assert headless.step("").error == "empty"
+    assert not headless.step("north").tic_ran
+
+
+def test_step_reports_parse_errors_once():
+    headless = game.NVGame("./data")
+    assert headless.step("take").output == ["There's nothing to take."]
+
+
+def test_step_quit_does_not_exit():
+    headless = game.NVGame("./data")
+    result = headless.step("quit")
+    assert result.quit and result.verb == "quit"
+
+
+def test_turns_are_timed_only_when_asked():
+    the_game = game.NVGame("./data")
+    result = game.NVTurnResult("look")
+    the_game.do_turn("look", result)
+    assert result.timings == {}
+    assert set(the_game.step("look").timings) == {"parse", "invoke", "tic"}
@@ -0,0 +1,60 @@
+import pytest
+from nuventure import grammar, parser
+from nuventure.errors import NVParseError
+
+frames = parser._compile_frames(parser.ALL_VERBS)
+vocabulary = {"lamp": "lamp", "door": "door", "key": "key", "goblin": "goblin",
+              "fire": "fire", "alchemist's journal": "alchemist's journal",
+              "william the merchant": "william"}
+test_fixture = grammar.NVGrammar(frames, vocabulary)
+
+
+def test_tokenize_strips_case_and_punctuation():
+    assert grammar.tokenize("Take the Lamp!") == ["take", "the", "lamp"]
+
+
+def test_third_type_verb():
+    assert test_fixture.parse("extinguish the lamp") == ("extinguish", "lamp", None)
+
+
+def test_first_type_verb_target_comes_first():
+    assert test_fixture.parse("unlock the door with the key") == ("unlock", "door", "key")
+
+
+def test_second_type_verb_implement_comes_first():
+    assert test_fixture.parse("cast fire on the goblin") == ("cast", "goblin", "fire")
+
+
+def test_adjacent_known_nouns_are_split():
+    assert test_fixture.parse("unlock door key") == ("unlock", "door", "key")
+
+
+def test_adjectives_are_dropped_from_known_nouns():
+    assert test_fixture.parse("take the rusty lamp") == ("take", "lamp", None)
+
+
+def test_multiword_nouns_resolve_to_internal_names():
+    assert test_fixture.parse("take alchemist's journal") == ("take", "alchemist's journal", None)
+    assert test_fixture.parse("inspect william the merchant") == ("inspect", "william", None)
+
+
+def test_unknown_nouns_are_taken_as_typed():
+    assert test_fixture.parse("take the shiny banana") == ("take", "shiny banana", None)
+
+
+def test_missing_argument_is_a_parse_error():
+    with pytest.raises(NVParseError) as ex:
+        test_fixture.parse("take")
+    assert ex.value.what == "take"
+    assert ex.value.et_key == "noargs"
+
+
+def test_too_many_arguments_is_a_parse_error():
+    with pytest.raises(NVParseError) as ex:
+        test_fixture.parse("take the lamp with the key")
+    assert ex.value.et_key == "toomanyargs"
+
+
+def test_verb_without_frames_is_not_implemented():
+    with pytest.raises(NotImplementedError):
+        test_fixture.parse("frobnicate the lamp")
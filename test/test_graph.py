@@ -0,0 +1,76 @@
+import pytest
+from nuventure import game
+from nuventure.graph import NVDirection, NVWorldGraph
+
+game_fixture = game.NVGame("data")
+
+
+def _link(name, direction, travel="You go."):
+    return {"name": name, "direction": direction, "travelDescription": travel}
+
+
+def test_directions():
+    assert str(NVDirection.UP) == "up"
+    assert NVDirection.EAST.opposite is NVDirection.WEST
+    assert NVDirection.DOWN.opposite is NVDirection.UP
+
+
+def test_edge_table():
+    graph = NVWorldGraph()
+    assert graph.add_node("a", [_link("b", "east"), _link("c", "down", "You fall.")]) == 0
+    assert graph.add_node("b", [_link("a", "west")]) == 1
+    assert graph.add_node("c", []) == 2
+    graph.finish()
+
+    assert graph.exits(0) == ("east", "down")
+    assert graph.exits(2) == ()
+    assert graph.neighbor(0, NVDirection.DOWN) == 2
+    assert graph.neighbor(0, NVDirection.UP) == -1
+    assert graph.travel_description(0, NVDirection.DOWN) == "You fall."
+    # "You go." is stored once for both links using it.
+    assert graph.strings == ["You go.", "You fall."]
+
+
+def test_bad_links():
+    graph = NVWorldGraph()
+    with pytest.raises(ValueError):
+        graph.add_node("a", [_link("b", "sideways")])
+
+    graph = NVWorldGraph()
+    graph.add_node("a", [_link("nowhere", "north")])
+    with pytest.raises(ValueError):
+        graph.finish()
+
+
+def test_world_nodes_by_name_and_number():
+    world = game_fixture.world
+    origin = world.nodes["ORIGIN"]
+    assert world.nodes.by_id[origin.id] is origin
+    assert "DEST" in world.nodes and "nowhere" not in world.nodes
+    assert world.nodes.get("nowhere") is None
+    assert list(world.nodes)[0] == "ORIGIN"
+    assert origin.neighbors["up"]["name"] == "phi"
+    assert sorted(origin.exits()) == ["down", "up", "west"]
+
+
+def test_links_change_after_finish():
+    graph = NVWorldGraph()
+    graph.add_node("a", [_link("b", "east")])
+    graph.add_node("b", [_link("a", "west")])
+    graph.add_node("c", [])
+    with pytest.raises(ValueError):
+        graph.set_link(0, NVDirection.DOWN, 2, "You fall.")
+    graph.finish()
+
+    graph.set_link(0, NVDirection.DOWN, 2, "You fall.")
+    assert graph.exits(0) == ("east", "down") and graph.neighbor(0, NVDirection.DOWN) == 2
+    assert graph.neighbor(1, NVDirection.WEST) == 0
+    graph.set_link(0, NVDirection.EAST, 2, "You go.")
+    assert graph.neighbor(0, NVDirection.EAST) == 2 and graph.version == 2
+
+    assert graph.remove_link(0, NVDirection.EAST)
+    assert not graph.remove_link(0, NVDirection.EAST)
+    assert graph.exits(0) == ("down",) and graph.neighbor(1, NVDirection.WEST) == 0
+    assert graph.version == 3
+    with pytest.raises(ValueError):
+        graph.set_link(0, NVDirection.UP, 3, "You float.")
@@ -0,0 +1,70 @@
+import pytest
+from nuventure.game import NVGame
+from nuventure.item import NVItem, NVItemSet
+
+game_fixture = NVGame("data")
+
+
+def _item(name, friendly_name, aliases=None, take=None):
+    return NVItem(
+        name,
+        {
+            "friendlyName": friendly_name,
+            "aliases": aliases,
+            "inSceneDescription": f"A {friendly_name} is here.",
+            "longDescription": f"It's a {friendly_name}.",
+            "takeDescription": take,
+            "useDescription": None,
+            "useAltDescription": None,
+            "originCell": None,
+            "originOwner": None,
+        },
+        game_fixture.world,
+    )
+
+
+def test_item_set_membership():
+    coin, gem = _item("coin", "Gold coin"), _item("gem", "Ruby", ["red gem"])
+    items = NVItemSet([coin, gem])
+    assert len(items) == 2 and list(items) == [coin, gem]
+    assert coin in items and "gem" in items and "ruby" not in items
+
+    items.remove(coin)
+    assert coin not in items and list(items.keys()) == ["gem"]
+    with pytest.raises(ValueError):
+        items.remove(coin)
+    items.discard(coin)
+
+
+def test_item_set_finds_by_any_name():
+    gem = _item("gem", "Ruby", ["Red Gem"])
+    other = _item("gem2", "Ruby")
+    items = NVItemSet([gem])
+    assert items.resolve("RUBY") is gem
+    assert items.resolve("red gem") is gem
+    assert items.resolve("sapphire") is None
+
+    items.add(other)
+    assert items.find("ruby") == [gem, other]
+    assert items.resolve("ruby") is None
+    del items["gem"]
+    assert items.resolve("ruby") is other and items.resolve("red gem") is None
+
+
+def test_take_description_may_be_the_first_string():
+    item = _item("coin", "Gold coin", take=0)
+    item.strings = ["You pocket the coin."]
+    assert item.take_description == "You pocket the coin."
+    assert _item("gem", "Ruby", take="").take_description is None
+
+
+def test_scene_items_are_indexed():
+    the_game = NVGame("data")
+    origin = the_game.world.nodes["ORIGIN"]
+    lamp = the_game.world.items["lamp"]
+    assert origin.items.get("lamp") is lamp
+
+    the_game.step("take lamp")
+    assert "lamp" not in origin.items and the_game.player.inventory["lamp"] is lamp
+    the_game.step("drop lamp")
+    assert "lamp" in origin.items and "lamp" not in the_game.player.inventory
@@ -0,0 +1,74 @@
+from nuventure import game
+
+
+def _fresh_game():
+    return game.NVGame("./data")
+
+
+def test_items_start_where_the_world_puts_them():
+    the_world = _fresh_game().world
+    ownership = the_world.ownership
+    assert len(ownership) == len(the_world.items)
+    assert ownership.holder("lamp") is the_world.nodes["ORIGIN"]
+    assert ownership.holder("axe") is the_world.actors["william"]
+    assert ownership.location("axe") is the_world.nodes["epsilon"]
+    assert ownership.holder("frobozz") is None and ownership.location("frobozz") is None
+
+
+def test_items_held_by_merchants():
+    the_world = _fresh_game().world
+    held = the_world.ownership.held_by_kind("merchant")
+    assert sorted(item.internal_name for item in held) == ["alchemist's journal", "axe"]
+    assert the_world.ownership.held_by_kind("dragon") == []
+
+
+def test_take_and_drop_keep_the_index():
+    the_game = _fresh_game()
+    ownership = the_game.world.ownership
+    lamp = the_game.world.items["lamp"]
+
+    the_game.step("take lamp")
+    assert ownership.holder("lamp") is the_game.player
+    assert ownership.held_by_kind("player") == [lamp]
+
+    the_game.step("north")
+    the_game.step("drop lamp")
+    assert ownership.holder("lamp") is the_game.player.location
+    assert ownership.held_by_kind("player") == []
+
+
+def test_untakeable_items_stay_put():
+    the_game = _fresh_game()
+    stele = the_game.world.items["stele"]
+    dest = stele.location
+    assert the_game.player.add_item(stele) is False
+    assert "stele" not in the_game.player.inventory
+    assert the_game.world.ownership.holder("stele") is dest
+
+
+def test_items_in_a_region():
+    the_world = _fresh_game().world
+    nodes = the_world.nodes
+    ownership = the_world.ownership
+    region = [nodes["ORIGIN"], nodes["phi"], nodes["epsilon"]]
+    assert sorted(item.internal_name for item in ownership.items_in(region)) == ["lamp", "sword"]
+
+    carried = ownership.items_in(region, carried_p=True)
+    assert sorted(item.internal_name for item in carried) == [
+        "alchemist's journal",
+        "axe",
+        "lamp",
+        "sword",
+    ]
+
+
+def test_the_dead_drop_what_they_held():
+    the_world = _fresh_game().world
+    william = the_world.actors["william"]
+    where = william.location
+    william.injure(100)
+    the_world.remove_actor(william)
+    axe = the_world.items["axe"]
+    assert the_world.ownership.holder("axe") is where
+    assert axe in where.items and axe.owner is None
+    assert axe not in the_world.ownership.held_by_kind("merchant")
@@ -1,5 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from nuventure import game, parser, actor
+from nuventure import game, parser, actor, suggest
 
 game_fixture = game.NVGame("data")
 test_fixture = game_fixture.parser
@@ -54,3 +56,107 @@ def test_parser_cmd_not_invocable_by_npc():
     with pytest.raises(RuntimeError) as ex:
         test_fixture.read_command(an_npc)
         assert ex.value == "Non-player characters should not invoke interactive commands"
+
+
+def test_hard_parse_uses_grammar():
+    verb = test_fixture.do_hard_parse("take the rusty lamp")
+    assert verb.name == "take"
+    assert verb.target == "lamp"
+    assert verb.bound_item is None
+
+
+def test_hard_parse_bad_arity(capsys):
+    assert test_fixture.do_hard_parse("take") is None
+    assert capsys.readouterr().out == "There's nothing to take.\n"
+
+
+def test_parse_cache_hits_on_normalized_repeat():
+    cached = parser.NVParser("data/verbs.json", game_fixture.world.vocabulary())
+    first = cached.do_parse("take lamp")
+    second = cached.do_parse("  TAKE   lamp ")
+    assert (cached.cache_misses, cached.cache_hits) == (1, 1)
+    assert first is not second
+    assert first is not cached.verbs["take"]
+    assert (second.name, second.target) == ("take", "lamp")
+
+
+def test_parse_cache_replays_errors(capsys):
+    cached = parser.NVParser("data/verbs.json", cache_size=4)
+    for _ in range(2):
+        with pytest.raises(parser.NVParseError):
+            cached.do_parse("lgith lamp")
+    assert cached.cache_hits == 1
+    assert capsys.readouterr().out.count("did you mean") == 2
+
+
+def test_parse_cache_evicts_least_recently_used():
+    cached = parser.NVParser("data/verbs.json", cache_size=2)
+    cached.do_parse("north")
+    cached.do_parse("south")
+    cached.do_parse("north")
+    cached.do_parse("east")
+    assert list(cached.cache) == ["north", "east"]
+
+
+def test_parse_cache_invalidated_by_vocabulary_change():
+    cached = parser.NVParser("data/verbs.json")
+    assert cached.do_parse("take the rusty lamp").target == "rusty lamp"
+    cached.set_vocabulary({"lamp": "lamp"})
+    assert not cached.cache
+    assert cached.do_parse("take the rusty lamp").target == "lamp"
+
+
+def test_verbs_are_immutable():
+    with pytest.raises(AttributeError):
+        test_fixture.verbs["take"].target = "lamp"
+
+
+def test_bind_creates_independent_invocations():
+    take = test_fixture.verbs["take"]
+    first = take.bind("lamp", invoker=game_fixture.player)
+    second = take.bind("sword")
+    assert (first.target, second.target) == ("lamp", "sword")
+    assert first.invoker is game_fixture.player and second.invoker is None
+    assert first.verb is second.verb is take
+
+
+def test_parse_from_many_threads():
+    shared = parser.NVParser("data/verbs.json", game_fixture.world.vocabulary(), cache_size=2)
+    commands = ["take lamp", "drop sword", "inspect stele", "north"] * 250
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(shared.do_parse, commands))
+    assert [(r.name, r.target) for r in results[:4]] == [
+        ("take", "lamp"), ("drop", "sword"), ("inspect", "stele"), ("north", "north")
+    ]
+    assert all(r.target == c.split()[-1] for r, c in zip(results, commands))
+
+
+def test_parse_tells_what_became_of_the_command(capsys):
+    player = game_fixture.player
+    verb, kind = test_fixture.parse(player, "take lamp")
+    assert (verb.name, verb.invoker, kind) == ("take", player, "verb")
+    assert test_fixture.parse(player, "take") == (None, "noargs")
+    assert test_fixture.parse(player, "   ") == (None, "empty")
+    assert test_fixture.parse(player, "help take") == (None, "help")
+    assert not hasattr(test_fixture, "last_outcome")
+    capsys.readouterr()
+
+
+def test_arity_errors_say_which_way_they_are_wrong(capsys):
+    assert test_fixture.do_parse("inventory lamp") is None
+    assert capsys.readouterr().out == 'Just say "inventory" to look through your pack.\n'
+    assert test_fixture.do_parse("take lamp sword") is None
+    assert capsys.readouterr().out == "You can only take one thing at a time.\n"
+    assert test_fixture.do_parse("take") is None
+    assert capsys.readouterr().out == "There's nothing to take.\n"
+
+
+def test_dwim_without_shared_bigrams(capsys):
+    assert len(parser._dwim("zzz")) == 3
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == 'I don\'t understand "zzz"; did you mean:'
+    assert len(lines) == 4
+
+    many = suggest.NVSuggestionIndex(f"item{i}" for i in range(500))
+    assert parser._dwim("zzz", many) == []
+    assert capsys.readouterr().out == 'I don\'t understand "zzz".\n'
@@ -0,0 +1,113 @@
+import random
+
+from nuventure import actor, game, worldgen
+from nuventure.graph import NVDirection, NVWorldGraph
+from nuventure.paths import NVPathfinder
+
+
+def _graph(nodes, seed):
+    graph = NVWorldGraph()
+    for name, node in worldgen.generate_world(nodes, topology="random", seed=seed)[
+        "mapNodes"
+    ].items():
+        graph.add_node(name, node["linkedNodes"])
+    graph.finish()
+    # Leave some links one way only, and some nodes stranded.
+    rng = random.Random(seed)
+    for node_id in range(len(graph)):
+        for direction in graph.exits(node_id):
+            if rng.random() < 0.2:
+                graph.remove_link(node_id, NVDirection[direction.upper()])
+    return graph
+
+
+def _follow(graph, source, route):
+    for direction in route:
+        source = graph.neighbor(source, direction)
+        assert source >= 0
+    return source
+
+
+def test_dirtest_routes():
+    world = game.NVGame("data").world
+    nodes = world.nodes
+    assert world.route(nodes["ORIGIN"], nodes["ORIGIN"]) == []
+    assert world.route(nodes["phi"], nodes["omega"]) == ["down", "down"]
+    assert world.paths.distance(nodes["phi"].id, nodes["alpha"].id) == 2
+
+
+def test_search_agrees_with_fields():
+    graph = _graph(120, seed=5)
+    fields = NVPathfinder(graph)
+    fields.precompute()
+    assert len(fields.fields) == len(graph)
+    search = NVPathfinder(graph, all_pairs_limit=0, landmarks=4)
+
+    for source in range(0, len(graph), 7):
+        dist = fields.distances_from(source)
+        for dest in range(len(graph)):
+            assert fields.distance(source, dest) == dist[dest]
+            assert search.distance(source, dest) == dist[dest]
+            route = search.route(source, dest)
+            if route is not None:
+                assert _follow(graph, source, route) == dest
+
+
+def test_routes_follow_link_changes():
+    world = game.NVGame("data").world
+    nodes = world.nodes
+    assert world.route(nodes["ORIGIN"], nodes["omega"]) == ["down"]
+    assert world.unlink(nodes["ORIGIN"], "down")
+    assert "down" not in nodes["ORIGIN"].exits()
+    assert world.route(nodes["ORIGIN"], nodes["omega"]) is None
+
+    world.link(nodes["phi"], "north", nodes["omega"], "You squeeze through a hatch.")
+    assert world.route(nodes["ORIGIN"], nodes["omega"]) == ["up", "north"]
+    assert nodes["phi"].travel_description("north") == "You squeeze through a hatch."
+
+
+def test_npcs_head_for_their_goals():
+    the_game = game.NVGame("data")
+    world = the_game.world
+    nodes = world.nodes
+    courier = actor.NVActor(world, nodes["phi"], "courier", "Courier", 100, 1)
+    courier.description = "A courier hurries past."
+    courier.goal = nodes["alpha"]
+
+    world.do_world_tic()
+    assert courier.location is nodes["ORIGIN"]
+    world.do_world_tic()
+    world.do_world_tic()
+    assert courier.location is nodes["alpha"]
+
+
+def test_crowd_leaves_goals_to_their_npcs():
+    world = game.NVGame("data").world
+    nodes = world.nodes
+    courier = actor.NVActor(world, nodes["phi"], "courier", "Courier", 100, 1)
+    courier.goal = nodes["alpha"]
+    world.use_batched_movement(seed=1)
+    assert courier not in world.crowd.npcs
+
+    world.unlink(nodes["ORIGIN"], "west")
+    world.crowd.do_tic()
+    assert world.crowd.degree[nodes["ORIGIN"].id] == len(nodes["ORIGIN"].exits())
+
+
+def test_goals_set_while_batched_are_reached():
+    the_game = game.NVGame("data")
+    world = the_game.world
+    nodes = world.nodes
+    ghost = actor.NVActor(world, nodes["beta"], "ghost", "Ghost", 100, 1)
+    world.use_batched_movement(seed=1)
+    world.do_world_tic()
+    ghost.goal = nodes["ORIGIN"]
+    for _ in range(len(nodes)):
+        world.do_world_tic()
+    assert ghost.location is nodes["ORIGIN"]
+    assert ghost not in world.crowd.npcs
+
+    ghost.goal = None
+    world.do_world_tic()
+    assert ghost in world.crowd.npcs
+    assert ghost.location is not nodes["ORIGIN"]
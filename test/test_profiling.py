@@ -0,0 +1,46 @@
+import io
+import time
+
+from nuventure.game import NVGame
+from nuventure.profiling import NVProfiler
+from nuventure.replay import replay
+
+
+def _spin(seconds):
+    start = time.process_time()
+    while time.process_time() - start < seconds:
+        pass
+
+
+def _spin_between_turns(seconds):
+    _spin(seconds)
+
+
+def test_profiled_replay_reports_hot_functions(tmp_path):
+    report = io.StringIO()
+    profiler = NVProfiler(str(tmp_path / "replay.folded"), top=5, report=report)
+    result = replay(NVGame("data"), ["look", "up", "down", "look"], profiler=profiler)
+    profiler.close()
+
+    assert result["turns"] == 4 and profiler.turns == 4
+    hot = profiler.hot_functions()
+    assert 0 < len(hot) <= 5
+    assert hot[0]["self"] >= hot[-1]["self"]
+    assert report.getvalue().startswith("profiled 4 turn(s)")
+    assert (tmp_path / "replay.folded").exists()
+
+
+def test_stacks_are_sampled_only_within_turns():
+    profiler = NVProfiler(report=io.StringIO())
+    if not profiler.sampling_p:
+        return
+    with profiler.turn():
+        _spin(0.1)
+    _spin_between_turns(0.1)
+    profiler.close()
+
+    lines = profiler.collapsed()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert all("test_profiling.py:_spin" in line for line in lines)
+    assert not any("_spin_between_turns" in line for line in lines)
@@ -0,0 +1,31 @@
+import io
+from nuventure import game, replay
+
+transcript_fixture = """# a short trip upstairs
+take lamp
+up
+frobnicate
+quit
+look
+"""
+
+
+def test_read_transcript_skips_comments():
+    commands = list(replay.read_transcript(io.StringIO(transcript_fixture)))
+    assert commands == ["take lamp", "up", "frobnicate", "quit", "look"]
+
+
+def test_replay_stops_when_game_ends():
+    commands = replay.read_transcript(io.StringIO(transcript_fixture))
+    report = replay.replay(game.NVGame("data"), commands)
+    assert (report["turns"], report["errors"], report["quit"]) == (4, 1, True)
+    assert report["phases"]["parse"] > 0 and report["phases"]["tic"] > 0
+
+
+def test_replay_many_in_processes(tmp_path):
+    transcript = tmp_path / "trip.txt"
+    transcript.write_text(transcript_fixture)
+    reports = replay.replay_many("data", [str(transcript)] * 2, jobs=2)
+    total = replay.summarize(reports, 1.0)
+    assert [r["turns"] for r in reports] == [4, 4]
+    assert total["turns"] == 8 and total["turns_per_second"] == 8.0
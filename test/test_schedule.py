@@ -0,0 +1,63 @@
+from nuventure import actor, game
+from nuventure.schedule import NVScheduler
+
+
+def test_calendar_order_and_cancel():
+    calendar = NVScheduler()
+    calendar.schedule("a", 3)
+    calendar.schedule("b", 1)
+    calendar.schedule("c", 3)
+    calendar.schedule("a", 5)
+    assert calendar.wakeups["a"] == 3
+    calendar.schedule("c", 2)
+    assert len(calendar) == 3 and calendar.next_tic() == 1
+
+    calendar.cancel("b")
+    calendar.cancel("b")
+    assert "b" not in calendar and calendar.next_tic() == 2
+    assert calendar.pop_due(1) == []
+    assert calendar.pop_due(3) == ["c", "a"]
+    assert len(calendar) == 0 and calendar.next_tic() is None
+
+
+def test_idle_actors_are_not_woken(monkeypatch):
+    the_game = game.NVGame("data")
+    world = the_game.world
+    origin = world.nodes["ORIGIN"]
+    merchants = [
+        actor.NVActor(world, origin, f"merchant{i}", "Merchant", 100, 0) for i in range(100)
+    ]
+    walker = actor.NVActor(world, origin, "walker", "Walker", 100, 1)
+    assert walker in world.scheduler
+    assert not any(merchant in world.scheduler for merchant in merchants)
+
+    ticked = []
+    monkeypatch.setattr(actor.NVActor, "do_tic", lambda self: ticked.append(self))
+    world.do_world_tic()
+    world.do_world_tic()
+    assert ticked == [walker, walker]
+
+
+def test_the_dead_wake_to_be_removed():
+    world = game.NVGame("data").world
+    william = world.actors["william"]
+    assert william not in world.scheduler
+
+    william.injure(100)
+    assert william in world.scheduler
+    world.do_world_tic()
+    assert "william" not in world.actors and william not in world.scheduler
+
+
+def test_npcs_rest_at_their_goals():
+    world = game.NVGame("data").world
+    courier = actor.NVActor(world, world.nodes["phi"], "courier", "Courier", 100, 1)
+    courier.goal = world.nodes["ORIGIN"]
+    world.do_world_tic()
+    assert courier.location is world.nodes["ORIGIN"]
+    assert courier not in world.scheduler
+
+    courier.goal = world.nodes["alpha"]
+    assert courier in world.scheduler
+    world.do_world_tic()
+    assert courier.location is world.nodes["alpha"]
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from nuventure import game, server
+
+
+async def _read_turn(reader):
+    return (await reader.readuntil(server.PROMPT.encode())).decode()
+
+
+async def _play_two_sessions():
+    host = server.NVServer("data")
+    listener = await host.start()
+    port = listener.sockets[0].getsockname()[1]
+
+    reader_a, writer_a = await asyncio.open_connection("127.0.0.1", port)
+    reader_b, writer_b = await asyncio.open_connection("127.0.0.1", port)
+    intro = await _read_turn(reader_a)
+    await _read_turn(reader_b)
+
+    writer_a.write(b"up\n")
+    moved = await _read_turn(reader_a)
+    writer_b.write(b"look\n")
+    looked = await _read_turn(reader_b)
+    sessions = len(host.sessions)
+
+    writer_a.write(b"quit\n")
+    leftover = await reader_a.read()
+
+    writer_b.close()
+    await host.close()
+    return intro, moved, looked, sessions, leftover
+
+
+def test_sessions_have_separate_worlds():
+    intro, moved, looked, sessions, leftover = asyncio.run(_play_two_sessions())
+    assert intro.startswith("\nHome\n")
+    assert "Attic" in moved
+    assert "Home" in looked and "Attic" not in looked
+    assert sessions == 2
+    assert leftover == b""
+
+
+async def _connect_once(host):
+    listener = await host.start()
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await _read_turn(reader)
+    writer.close()
+    await host.close()
+
+
+def test_games_load_off_the_event_loop():
+    threads = []
+
+    def factory():
+        threads.append(threading.current_thread())
+        return game.NVGame("data")
+
+    asyncio.run(_connect_once(server.NVServer("data", game_factory=factory)))
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from nuventure import actor, game, shard
+
+
+def _walkers(world, count=40, rate=1):
+    nodes = list(world.nodes.values())
+    return [
+        actor.NVActor(world, nodes[i % len(nodes)], f"walker{i}", "Walker", 100, rate)
+        for i in range(count)
+    ]
+
+
+def test_partition_is_balanced():
+    graph = game.NVGame("data").world.graph
+    owner = shard.partition(graph, 3)
+    assert len(owner) == len(graph)
+    counts = np.bincount(owner, minlength=3)
+    assert counts.max() - counts.min() <= 1
+
+
+def test_sharded_moves_follow_links():
+    world = game.NVGame("data").world
+    walkers = _walkers(world)
+    world.use_sharded_movement(shards=3, seed=1)
+    try:
+        graph = world.graph
+        for _ in range(20):
+            before = [walker.location.id for walker in walkers]
+            world.do_world_tic()
+            # Each walker takes exactly one step, whichever shard has it.
+            for node, walker in zip(before, walkers):
+                linked = graph.targets[graph.offsets[node] : graph.offsets[node + 1]]
+                if len(linked):
+                    assert walker.location.id in linked
+            assert [walker.location.id for walker in walkers] == [
+                world.crowd.locations[world.crowd.npcs.index(walker)] for walker in walkers
+            ]
+        assert world.crowd.handoffs > 0
+    finally:
+        world.crowd.close()
+
+
+def test_sharded_moves_are_seeded():
+    ends = []
+    for _ in range(2):
+        world = game.NVGame("data").world
+        walkers = _walkers(world, rate=2)
+        world.use_sharded_movement(shards=2, seed=5)
+        for _ in range(10):
+            world.do_world_tic()
+        world.crowd.close()
+        ends.append([walker.location.internal_name for walker in walkers])
+    assert ends[0] == ends[1]
+
+
+def test_sharded_dead_npcs_are_removed():
+    world = game.NVGame("data").world
+    walkers = _walkers(world, count=10)
+    world.use_sharded_movement(shards=2, seed=1)
+    try:
+        walkers[3].injure(100)
+        world.do_world_tic()
+        assert "walker3" not in world.actors
+        assert walkers[3].location is None
+        world.do_world_tic()
+        assert walkers[3] not in world.crowd.npcs
+        assert len(world.crowd.npcs) == len(world.crowd.locations)
+    finally:
+        world.crowd.close()
+
+
+def test_close_stops_workers():
+    world = game.NVGame("data").world
+    world.use_sharded_movement(shards=2, seed=1)
+    workers = world.crowd.workers
+    world.use_batched_movement(seed=1)
+    assert not any(worker.is_alive() for worker in workers)
+    with pytest.raises(ValueError):
+        world.use_active_region()
@@ -0,0 +1,54 @@
+import io
+
+from nuventure import nv_print
+from nuventure.game import NVGame
+from nuventure.sink import NVBufferSink, NVStreamSink, nv_capture
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_stream_sink_writes_once_per_flush():
+    stream = CountingStream()
+    sink = NVStreamSink(stream)
+    for line in ("one", "two", "three"):
+        print(line, file=sink)
+    assert stream.writes == 0
+
+    sink.flush()
+    sink.flush()
+    assert stream.writes == 1 and stream.getvalue() == "one\ntwo\nthree\n"
+
+
+def test_buffer_sink_keeps_everything():
+    sink = NVBufferSink()
+    sink.write("flushed\n")
+    sink.flush()
+    sink.write("pending\n")
+    assert sink.lines() == ["flushed", "pending"]
+    sink.clear()
+    assert sink.getvalue() == ""
+
+
+def test_capture_wraps_to_its_width():
+    with nv_capture(width=10) as output:
+        nv_print("the quick brown fox jumps")
+    assert output.lines() == ["the quick", "brown fox", "jumps"]
+
+    with nv_capture() as output:
+        nv_print("the quick brown fox jumps", width=20)
+    assert output.lines() == ["the quick brown fox", "jumps"]
+
+
+def test_game_width_is_per_session():
+    narrow = NVGame("data", width=20).step("look").output
+    wide = NVGame("data").step("look").output
+    assert max(len(line) for line in narrow) <= 20
+    assert len(narrow) > len(wide)
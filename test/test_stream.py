@@ -0,0 +1,48 @@
+import io
+import json
+import pytest
+from nuventure import stream, world
+
+
+def test_streamed_entries_match_json_load():
+    with open("data/dirtest.json") as fh:
+        expected = json.load(fh)
+    with open("data/dirtest.json") as fh:
+        entries = list(stream.iter_world(fh, chunk_size=7))
+
+    rebuilt = {}
+    for section, key, value in entries:
+        rebuilt.setdefault(section, {})[key] = value
+    assert rebuilt == expected
+
+
+def test_other_members_are_yielded_whole():
+    text = '{"stringTable": "x.strings", "version": 12345, "mapNodes": {}, "npcs": {"a": {}}}'
+    entries = list(stream.iter_world(io.StringIO(text), chunk_size=3))
+    assert entries == [
+        ("stringTable", None, "x.strings"),
+        ("version", None, 12345),
+        ("npcs", "a", {}),
+    ]
+
+
+def test_malformed_world():
+    with pytest.raises(json.JSONDecodeError):
+        list(stream.iter_world(io.StringIO('{"mapNodes": {"a": {}, }'), chunk_size=4))
+
+
+def test_forward_references(tmp_path):
+    with open("data/dirtest.json") as fh:
+        data = json.load(fh)
+    # Put the NPCs and items first, so that every node and owner they
+    # refer to comes later in the file.
+    data["items"]["axe"]["originOwner"] = "william"
+    data["items"]["axe"]["originCell"] = None
+    reordered = {"items": data["items"], "npcs": data["npcs"], "mapNodes": data["mapNodes"]}
+    path = tmp_path / "world.json"
+    path.write_text(json.dumps(reordered))
+
+    loaded = world.NVWorld(None, str(path))
+    assert loaded.actors["william"].location is loaded.nodes["epsilon"]
+    assert loaded.items["lamp"] in loaded.nodes["ORIGIN"].items
+    assert loaded.actors["william"].inventory["axe"] is loaded.items["axe"]
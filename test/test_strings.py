@@ -0,0 +1,52 @@
+import pytest
+from nuventure import game, strings
+
+
+def test_string_table_round_trip(tmp_path):
+    path = str(tmp_path / "test.strings")
+    strings.write_string_table(path, ["", "hello", "héllo wörld"])
+    table = strings.NVStringTable(path)
+    assert len(table) == 3
+    assert [table[i] for i in range(3)] == ["", "hello", "héllo wörld"]
+    table.close()
+
+
+def test_not_a_string_table(tmp_path):
+    path = tmp_path / "bogus.strings"
+    path.write_bytes(b"definitely not a string table")
+    with pytest.raises(ValueError):
+        strings.NVStringTable(str(path))
+
+
+def test_built_world_reads_the_same(tmp_path):
+    dest = str(tmp_path / "dirtest.json")
+    assert strings.build_world("data/dirtest.json", dest) > 0
+    assert (tmp_path / "dirtest.strings").exists()
+
+    plain = game.NVGame("data")
+    built = game.NVGame("data", dest)
+    assert isinstance(built.world.strings, strings.NVStringTable)
+    for name in plain.world.nodes:
+        for stateful_p in (False, True):
+            assert built.world.nodes[name].describe("long", stateful_p) == plain.world.nodes[
+                name
+            ].describe("long", stateful_p)
+    assert built.world.items["lamp"].use_description == plain.world.items["lamp"].use_description
+    assert built.world.actors["william"].description == plain.world.actors["william"].description
+
+    for command in ("look", "take lamp", "west", "south"):
+        assert built.step(command).output == plain.step(command).output
+
+
+def test_built_world_can_be_relinked(tmp_path):
+    dest = str(tmp_path / "dirtest.json")
+    strings.build_world("data/dirtest.json", dest)
+    built = game.NVGame("data", dest)
+    world = built.world
+    table_size = len(world.strings)
+
+    world.link(world.nodes["ORIGIN"], "up", world.nodes["DEST"], "You climb a new ladder.")
+    assert world.nodes["ORIGIN"].travel_description("up") == "You climb a new ladder."
+    assert len(world.strings) == table_size + 1
+    assert world.route(world.nodes["ORIGIN"], world.nodes["DEST"]) == ["up"]
+    assert "You climb a new ladder." in built.step("up").output
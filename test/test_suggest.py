@@ -0,0 +1,33 @@
+from nuventure import suggest
+
+test_fixture = suggest.NVSuggestionIndex(
+    {"lamp": "lamp", "oil lamp": "lamp", "sword": "sword", "stele": "stele",
+     "william the merchant": "william", "william": "william"}
+)
+
+
+def test_suggests_closest_term_first():
+    assert test_fixture.suggest("lmap")[0] == "lamp"
+
+
+def test_one_term_per_name():
+    assert test_fixture.suggest("lamp", limit=5).count("oil lamp") == 0
+
+
+def test_suggestions_limited_to_scope():
+    assert "lamp" not in test_fixture.suggest("lmap", scope={"sword", "stele"})
+
+
+def test_cutoff_drops_poor_matches():
+    assert test_fixture.suggest("xyz", cutoff=60) == []
+
+
+def test_large_index_suggests_from_many_names():
+    index = suggest.NVSuggestionIndex(f"item{i}" for i in range(5000))
+    index.add_terms(["lantern"])
+    assert index.suggest("lantren")[0] == "lantern"
+    assert len(index) == 5001
+
+
+def test_small_index_scores_every_term_without_shared_bigrams():
+    assert len(test_fixture.suggest("zzz")) == 3
@@ -0,0 +1,36 @@
+from nuventure import trace
+from nuventure.game import NVGame
+
+
+def test_histogram_percentiles():
+    hist = trace.NVHistogram()
+    assert hist.percentile(0.5) is None and hist.mean() is None
+    for micros in (1, 3, 3, 100):
+        hist.add(micros / 1e6)
+    assert hist.count == 4 and hist.minimum == 1e-6 and hist.maximum == 1e-4
+    assert hist.percentile(0.25) == 2e-6
+    assert hist.percentile(0.5) == 4e-6
+    assert hist.percentile(1.0) == 1e-4
+    assert hist.summary()["p99"] == 1e-4
+
+
+def test_turns_are_recorded_only_while_tracing():
+    the_game = NVGame("data")
+    trace.reset()
+    the_game.step("look")
+    assert trace.summary() == {}
+
+    trace.enable()
+    try:
+        the_game.step("look")
+        the_game.step("up")
+    finally:
+        trace.disable()
+    the_game.step("look")
+
+    assert trace.histogram("parse").count == 2
+    assert trace.histogram("tic").count == 2
+    assert trace.histogram("render").count == 2
+    assert set(trace.summary()) == {"parse", "invoke", "tic", "render"}
+    trace.reset()
+    assert trace.histogram("parse") is None
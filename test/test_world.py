@@ -1,3 +1,74 @@
-from nuventure import game, world
+from nuventure import actor, game, world
 
 game_fixture = game.NVGame("./data")
+
+
+def _fresh_world():
+    return game.NVGame("./data").world
+
+
+def test_occupants_follow_moves():
+    the_world = _fresh_world()
+    william = the_world.actors["william"]
+    epsilon = the_world.nodes["epsilon"]
+    assert william in epsilon.occupants and epsilon.npcs == [william]
+
+    way = epsilon.exits()[0]
+    assert the_world.try_move(william, way)
+    assert william not in epsilon.occupants and epsilon.npcs == []
+    assert william.location.npcs == [william]
+
+
+def test_occupants_follow_spawns_and_deaths():
+    the_world = _fresh_world()
+    origin = the_world.nodes["ORIGIN"]
+    ghost = actor.NVActor(the_world, origin, "ghost", "Ghost")
+    ghost.description = "A ghost hovers here."
+    assert origin.npcs == [ghost]
+
+    ghost.injure(100)
+    the_world.do_world_tic()
+    assert "ghost" not in the_world.actors
+    assert origin.npcs == [] and ghost.location is None
+
+
+def test_render_shows_who_is_here():
+    the_game = game.NVGame("./data")
+    ghost = actor.NVActor(the_game.world, the_game.world.nodes["phi"], "ghost", "Ghost", 100, 0)
+    ghost.description = "A ghost hovers here."
+    assert "A ghost hovers here." not in the_game.step("look").output
+    the_game.world.try_move(ghost, "down")
+    assert "A ghost hovers here." in the_game.step("look").output
+
+
+def test_scenes_are_cached_until_the_node_changes():
+    the_game = game.NVGame("./data")
+    origin = the_game.world.nodes["ORIGIN"]
+    first = the_game.step("look").output
+    assert list(origin.scenes) == [("long", False, 72)]
+    assert the_game.step("look").output == first
+
+    the_game.step("take lamp")
+    assert not origin.scenes
+    assert "There is a rusty oil lamp sitting here." not in the_game.step("look").output
+
+    ghost = actor.NVActor(the_game.world, origin, "ghost", "Ghost", 100, 0)
+    ghost.description = "A ghost hovers here."
+    assert "A ghost hovers here." in the_game.step("look").output
+
+
+def test_scenes_are_cached_per_width():
+    the_game = game.NVGame("./data", width=30)
+    narrow = the_game.step("look").output
+    the_game.width = 72
+    wide = the_game.step("look").output
+    assert len(narrow) > len(wide)
+    assert len(the_game.world.nodes["ORIGIN"].scenes) == 2
+
+
+def test_lit_lamp_shows_stateful_scene():
+    the_game = game.NVGame("./data")
+    for command in ("take lamp", "light lamp", "down"):
+        the_game.step(command)
+    looked = " ".join(the_game.step("look").output)
+    assert "Shadows dance around the basement" in looked
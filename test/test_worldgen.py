@@ -0,0 +1,66 @@
+import json
+import pytest
+from nuventure import game, worldgen
+
+
+def _reachable(world, start="ORIGIN"):
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        node = world["mapNodes"][frontier.pop()]
+        for link in node["linkedNodes"]:
+            if link["name"] not in seen:
+                seen.add(link["name"])
+                frontier.append(link["name"])
+    return seen
+
+
+@pytest.mark.parametrize("topology", worldgen.TOPOLOGIES)
+def test_worlds_are_connected_both_ways(topology):
+    world = worldgen.generate_world(500, topology=topology, seed=1)
+    assert _reachable(world) == set(world["mapNodes"])
+    for name, node in world["mapNodes"].items():
+        for link in node["linkedNodes"]:
+            back = worldgen.OPPOSITES[link["direction"]]
+            assert {"name": name, "direction": back} in [
+                {"name": l["name"], "direction": l["direction"]}
+                for l in world["mapNodes"][link["name"]]["linkedNodes"]
+            ]
+
+
+def test_same_seed_same_world():
+    args = (200, 20, 20, "random")
+    assert worldgen.generate_world(*args, seed=3) == worldgen.generate_world(*args, seed=3)
+    assert worldgen.generate_world(*args, seed=3) != worldgen.generate_world(*args, seed=4)
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        worldgen.generate_world(1)
+    with pytest.raises(ValueError):
+        worldgen.generate_world(10, topology="torus")
+
+
+def test_generated_world_plays(tmp_path):
+    world_file = tmp_path / "world.json"
+    world_file.write_text(json.dumps(worldgen.generate_world(100, 10, 10, seed=1)))
+    the_game = game.NVGame("data", str(world_file))
+    assert len(the_game.world.nodes) == 100
+    assert len(the_game.world.actors) == 11
+    assert "DEST" in the_game.world.nodes
+    assert the_game.step("east").tic_ran
+
+
+def test_generated_worlds_match_the_schema():
+    with open("data/dirtest.json") as fh:
+        dirtest = json.load(fh)
+    world = worldgen.generate_world(50, 5, 20, seed=2)
+    # Every key that every entry of dirtest.json has, generated entries have.
+    for section, extra in (("mapNodes", "itemsPresentOnLoad"), ("items", "conferStatusOnUse")):
+        common = set.intersection(*(set(entry) for entry in dirtest[section].values()))
+        for entry in world[section].values():
+            assert common | {extra} <= set(entry)
+    for key, item in world["items"].items():
+        assert key in world["mapNodes"][item["originCell"]]["itemsPresentOnLoad"]
+    for key, npc in world["npcs"].items():
+        assert key in world["mapNodes"][npc["originCell"]]["npcsPresentOnLoad"]